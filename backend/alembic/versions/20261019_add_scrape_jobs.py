@@ -0,0 +1,38 @@
+"""Add scrape_jobs table for asynchronous scrape + AI analysis.
+
+Revision ID: 20261019_add_scrape_jobs
+Revises: 20260228_add_external_post_fields
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_add_scrape_jobs"
+down_revision = "20260228_add_external_post_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scrape_jobs",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("url", sa.String(2000), nullable=False),
+        sa.Column("content_type", sa.String(30), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("result", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("error_status", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_scrape_jobs_url", "scrape_jobs", ["url"])
+    op.create_index("ix_scrape_jobs_status", "scrape_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scrape_jobs_status", "scrape_jobs")
+    op.drop_index("ix_scrape_jobs_url", "scrape_jobs")
+    op.drop_table("scrape_jobs")
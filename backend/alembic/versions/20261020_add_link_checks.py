@@ -0,0 +1,42 @@
+"""Add link_checks table for the stored-URL health checker.
+
+Revision ID: 20261020_add_link_checks
+Revises: 20261019_add_scrape_jobs
+Create Date: 2026-10-20
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261020_add_link_checks"
+down_revision = "20261019_add_scrape_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "link_checks",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("url", sa.String(2000), nullable=False),
+        sa.Column("kind", sa.String(10), nullable=False, server_default="link"),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("http_status", sa.Integer(), nullable=True),
+        sa.Column("final_url", sa.String(2000), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("etag", sa.String(255), nullable=True),
+        sa.Column("last_modified", sa.String(64), nullable=True),
+        sa.Column("response_ms", sa.Integer(), nullable=True),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sources", sa.Text(), nullable=True),
+        sa.Column("checked_at", sa.DateTime(), nullable=True),
+        sa.Column("first_failed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_link_checks_url", "link_checks", ["url"], unique=True)
+    op.create_index("ix_link_checks_status", "link_checks", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_link_checks_status", "link_checks")
+    op.drop_index("ix_link_checks_url", "link_checks")
+    op.drop_table("link_checks")
@@ -0,0 +1,40 @@
+"""Add blog_feeds table for external feed sync; index blog_posts.external_url.
+
+Revision ID: 20261021_add_blog_feeds
+Revises: 20261020_add_link_checks
+Create Date: 2026-10-21
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261021_add_blog_feeds"
+down_revision = "20261020_add_link_checks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blog_feeds",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("url", sa.String(2000), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("post_status", sa.String(20), nullable=False, server_default="published"),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("etag", sa.String(255), nullable=True),
+        sa.Column("last_modified", sa.String(64), nullable=True),
+        sa.Column("last_entry_at", sa.DateTime(), nullable=True),
+        sa.Column("last_polled_at", sa.DateTime(), nullable=True),
+        sa.Column("last_status", sa.Integer(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index("ix_blog_feeds_url", "blog_feeds", ["url"], unique=True)
+    op.create_index("ix_blog_posts_external_url", "blog_posts", ["external_url"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_blog_posts_external_url", "blog_posts")
+    op.drop_index("ix_blog_feeds_url", "blog_feeds")
+    op.drop_table("blog_feeds")
@@ -0,0 +1,26 @@
+"""Add responsive variants and placeholder to media_assets; index media_assets.url.
+
+Revision ID: 20261022_add_media_variants
+Revises: 20261021_add_blog_feeds
+Create Date: 2026-10-22
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261022_add_media_variants"
+down_revision = "20261021_add_blog_feeds"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("media_assets", sa.Column("variants", sa.Text(), nullable=True))
+    op.add_column("media_assets", sa.Column("placeholder", sa.Text(), nullable=True))
+    op.create_index("ix_media_assets_url", "media_assets", ["url"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_media_assets_url", "media_assets")
+    op.drop_column("media_assets", "placeholder")
+    op.drop_column("media_assets", "variants")
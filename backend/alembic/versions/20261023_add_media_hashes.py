@@ -0,0 +1,28 @@
+"""Add content and perceptual hashes to media_assets for duplicate detection.
+
+Revision ID: 20261023_add_media_hashes
+Revises: 20261022_add_media_variants
+Create Date: 2026-10-23
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261023_add_media_hashes"
+down_revision = "20261022_add_media_variants"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("media_assets", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.add_column("media_assets", sa.Column("perceptual_hash", sa.String(16), nullable=True))
+    op.create_index("ix_media_assets_content_hash", "media_assets", ["content_hash"])
+    op.create_index("ix_media_assets_perceptual_hash", "media_assets", ["perceptual_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_media_assets_perceptual_hash", "media_assets")
+    op.drop_index("ix_media_assets_content_hash", "media_assets")
+    op.drop_column("media_assets", "perceptual_hash")
+    op.drop_column("media_assets", "content_hash")
@@ -0,0 +1,79 @@
+"""Normalize media tags into media_tags / media_asset_tags; index media search.
+
+Backfills the tag tables from the existing comma-separated media_assets.tags.
+On PostgreSQL, adds pg_trgm GIN indexes on lower(title), lower(alt_text)
+and lower(url) for the library's substring search (skipped, with the search
+still working unindexed, when the extension cannot be created).
+
+Revision ID: 20261024_add_media_tags
+Revises: 20261023_add_media_hashes
+Create Date: 2026-10-24
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261024_add_media_tags"
+down_revision = "20261023_add_media_hashes"
+branch_labels = None
+depends_on = None
+
+_TRGM_COLUMNS = ("title", "alt_text", "url")
+
+
+def _backfill(bind) -> None:
+    rows = bind.execute(sa.text("SELECT id, tags FROM media_assets WHERE tags IS NOT NULL AND tags != ''")).all()
+    links: list[tuple[int, str]] = []
+    for asset_id, raw in rows:
+        names = dict.fromkeys(part.strip().lower()[:40] for part in raw.split(","))
+        links.extend((asset_id, name) for name in names if name)
+    if not links:
+        return
+
+    media_tags = sa.table("media_tags", sa.column("id", sa.Integer()), sa.column("name", sa.String()))
+    bind.execute(media_tags.insert(), [{"name": name} for name in sorted({name for _, name in links})])
+    tag_ids = dict((name, tag_id) for tag_id, name in bind.execute(sa.text("SELECT id, name FROM media_tags")))
+    media_asset_tags = sa.table("media_asset_tags", sa.column("asset_id", sa.Integer()), sa.column("tag_id", sa.Integer()))
+    bind.execute(media_asset_tags.insert(), [{"asset_id": a, "tag_id": tag_ids[name]} for a, name in links])
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_tags",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("name", sa.String(40), nullable=False),
+    )
+    op.create_index("ix_media_tags_name", "media_tags", ["name"], unique=True)
+    op.create_table(
+        "media_asset_tags",
+        sa.Column("asset_id", sa.Integer(), sa.ForeignKey("media_assets.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("tag_id", sa.Integer(), sa.ForeignKey("media_tags.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_media_asset_tags_tag_id", "media_asset_tags", ["tag_id"])
+    op.create_index("ix_media_assets_created_at", "media_assets", ["created_at"])
+
+    bind = op.get_bind()
+    _backfill(bind)
+
+    if bind.dialect.name == "postgresql":
+        try:
+            with bind.begin_nested():
+                bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except sa.exc.DBAPIError:
+            return  # no privilege to create it; search still works, just unindexed
+        for column in _TRGM_COLUMNS:
+            op.execute(
+                f"CREATE INDEX ix_media_assets_{column}_trgm ON media_assets "
+                f"USING gin (lower({column}) gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for column in _TRGM_COLUMNS:
+            op.execute(f"DROP INDEX IF EXISTS ix_media_assets_{column}_trgm")
+    op.drop_index("ix_media_assets_created_at", "media_assets")
+    op.drop_index("ix_media_asset_tags_tag_id", "media_asset_tags")
+    op.drop_table("media_asset_tags")
+    op.drop_index("ix_media_tags_name", "media_tags")
+    op.drop_table("media_tags")
@@ -0,0 +1,36 @@
+"""Add media_usages reverse index (content row -> referenced URL).
+
+Filled by the application: an empty table is rebuilt on the next startup
+(services/media_usage.py), and POST /admin/media/usages/rebuild re-derives it.
+
+Revision ID: 20261025_add_media_usages
+Revises: 20261024_add_media_tags
+Create Date: 2026-10-25
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261025_add_media_usages"
+down_revision = "20261024_add_media_tags"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_usages",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("url", sa.String(2000), nullable=False),
+        sa.Column("source_table", sa.String(64), nullable=False),
+        sa.Column("source_id", sa.Integer(), nullable=False),
+        sa.Column("source_column", sa.String(64), nullable=False),
+    )
+    op.create_index("ix_media_usages_url", "media_usages", ["url"])
+    op.create_index("ix_media_usages_source", "media_usages", ["source_table", "source_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_media_usages_source", "media_usages")
+    op.drop_index("ix_media_usages_url", "media_usages")
+    op.drop_table("media_usages")
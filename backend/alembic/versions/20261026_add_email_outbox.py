@@ -0,0 +1,36 @@
+"""Add email_outbox: emails queued in the triggering transaction, sent in the background.
+
+Revision ID: 20261026_add_email_outbox
+Revises: 20261025_add_media_usages
+Create Date: 2026-10-26
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261026_add_email_outbox"
+down_revision = "20261025_add_media_usages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True, index=True),
+        sa.Column("to_email", sa.String(320), nullable=False),
+        sa.Column("subject", sa.String(300), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_email_outbox_due", "email_outbox", ["status", "next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_due", "email_outbox")
+    op.drop_table("email_outbox")
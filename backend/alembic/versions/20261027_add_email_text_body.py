@@ -0,0 +1,22 @@
+"""Add the plain-text alternative to email_outbox.
+
+Revision ID: 20261027_add_email_text_body
+Revises: 20261026_add_email_outbox
+Create Date: 2026-10-27
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261027_add_email_text_body"
+down_revision = "20261026_add_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("email_outbox", sa.Column("text_body", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("email_outbox", "text_body")
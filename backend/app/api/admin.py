@@ -1,16 +1,23 @@
 import bleach
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from jose import JWTError, jwt
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError as SAIntegrityError
 from typing import List, cast
-from datetime import datetime
+from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import json
 import math
 import re
 import logging
+import tempfile
 from ..services.pdf_import_service import extract_text_from_pdf_bytes, parse_linkedin_resume_text
 from ..database import (
     get_db,
+    SessionLocal,
     Project,
     Experience,
     Education,
@@ -29,7 +36,9 @@ from ..database import (
     Service,
     BlogPost,
     )
+from ..models.models import MediaTag
 from ..auth import get_current_admin_user
+from ..config import settings
 from ..schemas import (
     ProjectCreate, ProjectUpdate, ProjectResponse,
     ExperienceCreate, ExperienceResponse, ExperienceUpdate,
@@ -40,8 +49,10 @@ from ..schemas import (
     SiteSettingsResponse, SiteSettingsUpdate,
     SeoSettingsResponse, SeoSettingsUpdate,
     MediaAssetCreate, MediaAssetResponse, MediaAssetUpdate,
+    MediaDirectUploadRequest, MediaDirectUploadTicket, MediaDirectUploadComplete,
     MediaBulkDeleteRequest, MediaBulkDeleteResponse,
-    MediaAssetListResponse,
+    MediaReconcileRequest, MediaReconcileReport,
+    MediaAssetListResponse, MediaDuplicateReport, MediaTagCount, MediaUsageResponse,
     ProjectImageCreate, ProjectImageResponse, ProjectImageUpdate,
     AwardCreate, AwardResponse, AwardUpdate,
     CertificateCreate, CertificateResponse, CertificateUpdate,
@@ -49,7 +60,21 @@ from ..schemas import (
     BlogPostCreate, BlogPostResponse, BlogPostUpdate,
     )
 from ..utils import sanitize_text, sanitize_html
-from ..services.cloudinary_service import upload_image, delete_image
+from ..utils.sse import sse_event, sse_response
+from ..utils.uploads import looks_like_image, read_capped_upload
+from ..services.media_hashes import near_duplicate_groups
+from ..services.cloudinary_service import (
+    DIRECT_UPLOAD_FORMATS,
+    delete_image,
+    get_resource,
+    signed_upload_params,
+    verify_upload_response,
+)
+from ..services.media_reconcile import reconcile_inventory
+from ..services.media_storage import get_storage
+from ..services.media_usage import rebuild_usage_index, usages_for_assets
+from ..services.media_tags import normalize_tags, rebuild_tag_index, sync_asset_tags, tag_facets
+from ..services.image_variants import apply_variants, delete_variants, generate_variants
 
 logger = logging.getLogger(__name__)
 
@@ -1107,18 +1132,20 @@ async def list_media_assets(
     query = db.query(MediaAsset)
 
     if q:
-        like = f"%{q.lower()}%"
+        # lower(col) LIKE matches the trigram indexes on PostgreSQL (see migration 20261024).
+        escaped = q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        like = f"%{escaped}%"
         query = query.filter(
             or_(
-                func.lower(MediaAsset.title).ilike(like),
-                func.lower(MediaAsset.alt_text).ilike(like),
-                func.lower(MediaAsset.url).ilike(like),
+                func.lower(MediaAsset.title).like(like, escape="\\"),
+                func.lower(MediaAsset.alt_text).like(like, escape="\\"),
+                func.lower(MediaAsset.url).like(like, escape="\\"),
             )
         )
 
-    if tag:
-        tag_like = f"%{tag.lower()}%"
-        query = query.filter(func.lower(MediaAsset.tags).ilike(tag_like))
+    # Exact tag match through the normalized index; "a,b" requires both.
+    for name in normalize_tags(tag):
+        query = query.filter(MediaAsset.tag_items.any(MediaTag.name == name))
 
     total = query.count()
     items = (
@@ -1133,24 +1160,161 @@ async def list_media_assets(
         "total": total,
         "page": page,
         "page_size": page_size,
+        "facets": tag_facets(db, query.with_entities(MediaAsset.id).subquery()),
     }
 
 
+@router.get("/media/tags", response_model=List[MediaTagCount])
+async def list_media_tags(
+    prefix: str | None = Query(default=None, max_length=40),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Tags in use, most used first; `prefix` narrows them for autocomplete."""
+    return tag_facets(db, prefix=prefix, limit=limit)
+
+
+@router.post("/media/tags/rebuild")
+async def rebuild_media_tags(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Re-derive the tag index from every asset's `tags` string."""
+    return {"assets": rebuild_tag_index(db)}
+
+
 @router.post("/media", response_model=MediaAssetResponse)
 async def create_media_asset(
     payload: MediaAssetCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
-    asset = MediaAsset(**payload.model_dump())
+    asset = MediaAsset(**payload.model_dump(mode="json"))
+    sync_asset_tags(db, asset)
     db.add(asset)
     db.commit()
     db.refresh(asset)
     return asset
 
 
-@router.post("/media/upload", response_model=MediaAssetResponse)
+def _media_asset_from_upload(
+    upload_result: dict,
+    *,
+    title: str | None,
+    alt_text: str | None,
+    folder: str | None,
+    tags: str | None,
+) -> MediaAsset:
+    return MediaAsset(
+        title=title,
+        alt_text=alt_text,
+        url=upload_result.get("secure_url") or upload_result.get("url"),
+        public_id=upload_result.get("public_id"),
+        provider=upload_result.get("provider", "cloudinary"),
+        folder=upload_result.get("folder") or folder,
+        tags=tags,
+        asset_type=upload_result.get("resource_type", "image"),
+        width=upload_result.get("width"),
+        height=upload_result.get("height"),
+        size_bytes=upload_result.get("bytes"),
+    )
+
+
+def _sanitize_folder(value: str | None) -> str | None:
+    if value is None:
+        return None
+    cleaned = value.strip().strip("/")
+    if not cleaned:
+        return None
+    if len(cleaned) > 120:
+        raise HTTPException(status_code=400, detail="Folder is too long.")
+    allowed = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789/_- ")
+    if any(ch not in allowed for ch in cleaned):
+        raise HTTPException(status_code=400, detail="Folder contains invalid characters.")
+    return cleaned
+
+
+def _sanitize_tags(value: str | None) -> list[str] | None:
+    raw = (value or "").strip()
+    if not raw:
+        return None
+    parts = [p.strip() for p in raw.split(",") if p.strip()]
+    if len(parts) > 25:
+        raise HTTPException(status_code=400, detail="Too many tags (max 25).")
+    for tag in parts:
+        if len(tag) > 40:
+            raise HTTPException(status_code=400, detail="A tag is too long (max 40).")
+    return parts
+
+
+async def _read_image_upload(file: UploadFile, copy_to=None) -> str:
+    """Validate the upload chunk by chunk and return its SHA-256 (hex); optionally copy it to `copy_to`."""
+    digest = hashlib.sha256()
+    await read_capped_upload(
+        file,
+        max_bytes=settings.MEDIA_UPLOAD_MAX_BYTES,
+        check_head=looks_like_image,
+        too_large_detail=f"Image must be {settings.MEDIA_UPLOAD_MAX_BYTES // (1024 * 1024)}MB or smaller.",
+        invalid_detail="Invalid image file.",
+        hasher=digest,
+        copy_to=copy_to,
+    )
+    return digest.hexdigest()
+
+
+def _variant_source():
+    """Named temp file the variant workers read the upload from (filled by _read_image_upload)."""
+    return tempfile.NamedTemporaryFile(prefix="media-upload-")
+
+
+def _find_duplicate_asset(db: Session, content_hash: str) -> MediaAsset | None:
+    return (
+        db.query(MediaAsset)
+        .filter(MediaAsset.content_hash == content_hash)
+        .order_by(MediaAsset.id)
+        .first()
+    )
+
+
+async def _upload_with_variants(
+    file: UploadFile, source_path: str, *, folder: str | None, tags: list[str] | None
+) -> tuple[dict, dict | None]:
+    """
+    Store the (already validated) original with MEDIA_STORAGE_PROVIDER while
+    the responsive variants are encoded in the process pool from the copy at
+    `source_path`, so the upload stream has a single reader and no in-memory
+    copy of the body is made.  Variant failures only cost the variants; an
+    upload failure removes any written variants.
+    """
+    storage = get_storage()
+    if storage is None:
+        raise ValueError(f"Unknown MEDIA_STORAGE_PROVIDER {settings.MEDIA_STORAGE_PROVIDER!r}")
+    upload_result, derived = await asyncio.gather(
+        storage.save(file.file, filename=file.filename or "upload", folder=folder, tags=tags),
+        generate_variants(source_path),
+        return_exceptions=True,
+    )
+    if isinstance(derived, BaseException):
+        derived = None
+    if isinstance(upload_result, BaseException):
+        if derived:
+            await run_in_threadpool(delete_variants, json.dumps(derived["variants"]))
+        raise upload_result
+    return {**upload_result, "provider": storage.name}, derived
+
+
+@router.post(
+    "/media/upload",
+    response_model=MediaAssetResponse,
+    description=(
+        "Uploads one image. If an asset with the same bytes (SHA-256) is already "
+        "in the library it is returned instead and nothing is uploaded; the "
+        "response then carries `X-Media-Duplicate: true`."
+    ),
+)
 async def upload_media_asset(
+    response: Response,
     file: UploadFile = File(...),
     title: str | None = Form(None),
     alt_text: str | None = Form(None),
@@ -1162,86 +1326,355 @@ async def upload_media_asset(
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image uploads are supported.")
 
-    file_bytes = await file.read()
-    max_size_bytes = 5 * 1024 * 1024
-    if len(file_bytes) > max_size_bytes:
-        raise HTTPException(status_code=400, detail="Image must be 5MB or smaller.")
-
-    def _sanitize_folder(value: str | None) -> str | None:
-        if value is None:
-            return None
-        cleaned = value.strip().strip("/")
-        if not cleaned:
-            return None
-        if len(cleaned) > 120:
-            raise HTTPException(status_code=400, detail="Folder is too long.")
-        allowed = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789/_- ")
-        if any(ch not in allowed for ch in cleaned):
-            raise HTTPException(status_code=400, detail="Folder contains invalid characters.")
-        return cleaned
-
-    def _sanitize_tags(value: str | None) -> list[str] | None:
-        raw = (value or "").strip()
-        if not raw:
-            return None
-        parts = [p.strip() for p in raw.split(",") if p.strip()]
-        if len(parts) > 25:
-            raise HTTPException(status_code=400, detail="Too many tags (max 25).")
-        for tag in parts:
-            if len(tag) > 40:
-                raise HTTPException(status_code=400, detail="A tag is too long (max 40).")
-        return parts
-
-    def _looks_like_image(data: bytes) -> bool:
-        # Quick magic-byte check to reduce content-type spoofing.
-        if len(data) < 12:
-            return False
-        if data.startswith(b"\xFF\xD8\xFF"):
-            return True  # JPEG
-        if data.startswith(b"\x89PNG\r\n\x1a\n"):
-            return True  # PNG
-        if data[:6] in (b"GIF87a", b"GIF89a"):
-            return True  # GIF
-        if data.startswith(b"RIFF") and data[8:12] == b"WEBP":
-            return True  # WEBP
-        return False
-
     sanitized_folder = _sanitize_folder(folder)
     tag_list = _sanitize_tags(tags)
+    with _variant_source() as source:
+        content_hash = await _read_image_upload(file, copy_to=source)
+
+        existing = _find_duplicate_asset(db, content_hash)
+        if existing:
+            response.headers["X-Media-Duplicate"] = "true"
+            return existing
+
+        try:
+            upload_result, derived = await _upload_with_variants(
+                file, source.name, folder=sanitized_folder, tags=tag_list
+            )
+        except Exception as exc:  # noqa: BLE001 - wrap provider errors
+            logger.exception("Media upload failed")
+            raise HTTPException(status_code=502, detail="Image upload failed.") from exc
+
+    asset = _media_asset_from_upload(
+        upload_result, title=title, alt_text=alt_text, folder=folder, tags=tags
+    )
+    asset.content_hash = content_hash
+    apply_variants(asset, derived)
+    sync_asset_tags(db, asset)
+    db.add(asset)
+    db.commit()
+    db.refresh(asset)
+    return asset
 
-    if not _looks_like_image(file_bytes):
-        raise HTTPException(status_code=400, detail="Invalid image file.")
 
+@router.post("/media/upload/direct", response_model=MediaDirectUploadTicket)
+async def sign_direct_media_upload(
+    payload: MediaDirectUploadRequest,
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Signed parameters for uploading one image from the browser straight to
+    Cloudinary, so the bytes never pass through this API.  Folder and tags
+    follow the same rules as /media/upload and are fixed by the signature;
+    the returned `token` carries them (and title / alt text) to
+    /media/upload/direct/complete, which creates the MediaAsset.
+    """
+    sanitized_folder = _sanitize_folder(payload.folder)
+    tag_list = _sanitize_tags(payload.tags)
     try:
-        upload_result = await upload_image(
-            file_bytes=file_bytes,
-            filename=file.filename or "upload",
-            folder=sanitized_folder,
-            tags=tag_list,
-        )
-    except Exception as exc:  # noqa: BLE001 - wrap provider errors
-        logger.exception("Cloudinary upload failed")
-        raise HTTPException(status_code=502, detail="Image upload failed.") from exc
+        ticket = signed_upload_params(folder=sanitized_folder, tags=tag_list)
+    except ValueError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    expires_at = datetime.utcnow() + timedelta(seconds=settings.MEDIA_DIRECT_UPLOAD_TTL_SECONDS)
+    token = jwt.encode(
+        {
+            "type": "media_upload",
+            "folder": ticket["fields"]["folder"],
+            "tags": payload.tags,
+            "title": payload.title,
+            "alt_text": payload.alt_text,
+            "exp": expires_at,
+        },
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    return {
+        **ticket,
+        "token": token,
+        "expires_at": expires_at,
+        "max_bytes": settings.MEDIA_UPLOAD_MAX_BYTES,
+    }
 
-    asset = MediaAsset(
-        title=title,
-        alt_text=alt_text,
-        url=upload_result.get("secure_url") or upload_result.get("url"),
-        public_id=upload_result.get("public_id"),
-        provider="cloudinary",
-        folder=upload_result.get("folder") or folder,
-        tags=tags,
-        asset_type=upload_result.get("resource_type", "image"),
-        width=upload_result.get("width"),
-        height=upload_result.get("height"),
-        size_bytes=upload_result.get("bytes"),
+
+@router.post("/media/upload/direct/complete", response_model=MediaAssetResponse)
+async def complete_direct_media_upload(
+    payload: MediaDirectUploadComplete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Record a direct upload.  The upload response signature is verified, the
+    metadata is re-read from the Admin API rather than trusted from the
+    client, and uploads outside the signed folder, over
+    MEDIA_UPLOAD_MAX_BYTES or in another format are deleted and rejected.
+    Repeating the call for the same public_id returns the existing asset.
+    """
+    try:
+        claims = jwt.decode(payload.token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as exc:
+        raise HTTPException(status_code=400, detail="Upload token is invalid or expired.") from exc
+    if claims.get("type") != "media_upload":
+        raise HTTPException(status_code=400, detail="Upload token is invalid or expired.")
+    try:
+        verified = verify_upload_response(payload.public_id, payload.version, payload.signature)
+    except ValueError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    if not verified:
+        raise HTTPException(status_code=400, detail="Upload signature does not match.")
+
+    existing = (
+        db.query(MediaAsset)
+        .filter(MediaAsset.provider == "cloudinary", MediaAsset.public_id == payload.public_id)
+        .first()
     )
+    if existing:
+        return existing
+
+    try:
+        resource = await get_resource(payload.public_id)
+    except Exception as exc:  # noqa: BLE001 - wrap provider errors
+        logger.exception("Cloudinary resource lookup failed for %s", payload.public_id)
+        raise HTTPException(status_code=502, detail="Could not verify the upload.") from exc
+
+    problem = None
+    if not payload.public_id.startswith(f"{claims['folder']}/"):
+        problem = "Upload is not in the signed folder."
+    elif (resource.get("bytes") or 0) > settings.MEDIA_UPLOAD_MAX_BYTES:
+        problem = f"Image must be {settings.MEDIA_UPLOAD_MAX_BYTES // (1024 * 1024)}MB or smaller."
+    elif resource.get("format") not in DIRECT_UPLOAD_FORMATS:
+        problem = "Only image uploads are supported."
+    if problem:
+        try:
+            await delete_image(payload.public_id)
+        except Exception:  # noqa: BLE001
+            logger.exception("Cleanup of rejected direct upload %s failed", payload.public_id)
+        raise HTTPException(status_code=400, detail=problem)
+
+    asset = _media_asset_from_upload(
+        {**resource, "folder": resource.get("folder") or claims["folder"]},
+        title=claims.get("title"),
+        alt_text=claims.get("alt_text"),
+        folder=claims["folder"],
+        tags=claims.get("tags"),
+    )
+    sync_asset_tags(db, asset)
     db.add(asset)
     db.commit()
     db.refresh(asset)
     return asset
 
 
+@router.post(
+    "/media/upload/bulk",
+    summary="Upload several images at once (Server-Sent Events)",
+    description=(
+        "Uploads up to MEDIA_BULK_UPLOAD_MAX_FILES images to MEDIA_STORAGE_PROVIDER, "
+        "MEDIA_UPLOAD_CONCURRENCY at a time, with shared `tags` / `folder`. "
+        "Each file produces an `uploaded` or `failed` event (with its `index` "
+        "in the request) as soon as it finishes; the MediaAsset rows for all "
+        "successful uploads are then inserted in one transaction and returned "
+        "in a final `done` event. Files whose bytes are already in the library, "
+        "or earlier in the same request, are not uploaded again: they produce a "
+        "`duplicate` event and appear in `done.duplicates` as index -> asset id."
+    ),
+)
+async def bulk_upload_media_assets(
+    files: List[UploadFile] = File(...),
+    tags: str | None = Form(None),
+    folder: str | None = Form(None),
+    current_user: User = Depends(get_current_admin_user),
+):
+    if len(files) > settings.MEDIA_BULK_UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (max {settings.MEDIA_BULK_UPLOAD_MAX_FILES}).",
+        )
+    sanitized_folder = _sanitize_folder(folder)
+    tag_list = _sanitize_tags(tags)
+    semaphore = asyncio.Semaphore(max(1, settings.MEDIA_UPLOAD_CONCURRENCY))
+    # content hash -> index of the first file in this request with those bytes
+    claimed: dict[str, int] = {}
+
+    def _existing_asset_id(content_hash: str) -> int | None:
+        db = SessionLocal()
+        try:
+            existing = _find_duplicate_asset(db, content_hash)
+            return cast(int, existing.id) if existing else None
+        finally:
+            db.close()
+
+    async def _upload_one(index: int, file: UploadFile) -> tuple[int, tuple | dict | None, str | None]:
+        async with semaphore:
+            try:
+                if not file.content_type or not file.content_type.startswith("image/"):
+                    raise HTTPException(status_code=400, detail="Only image uploads are supported.")
+                with _variant_source() as source:
+                    content_hash = await _read_image_upload(file, copy_to=source)
+                    if content_hash in claimed:
+                        return index, {"duplicate_of_index": claimed[content_hash]}, None
+                    claimed[content_hash] = index
+                    existing_id = await run_in_threadpool(_existing_asset_id, content_hash)
+                    if existing_id is not None:
+                        return index, {"asset_id": existing_id}, None
+                    upload_result, derived = await _upload_with_variants(
+                        file, source.name, folder=sanitized_folder, tags=tag_list
+                    )
+            except HTTPException as exc:
+                return index, None, str(exc.detail)
+            except Exception:  # noqa: BLE001 - report provider errors per file
+                logger.exception("Media upload failed for %s", file.filename)
+                return index, None, "Image upload failed."
+            return index, (upload_result, derived, content_hash), None
+
+    async def _events():
+        uploaded: dict[int, tuple[dict, dict | None, str]] = {}
+        duplicates: dict[int, dict] = {}
+        failed: list[int] = []
+        tasks = [asyncio.create_task(_upload_one(i, f)) for i, f in enumerate(files)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, result, error = await next_done
+                filename = files[index].filename
+                if result is None:
+                    failed.append(index)
+                    yield sse_event("failed", {"index": index, "filename": filename, "detail": error})
+                elif isinstance(result, dict):
+                    duplicates[index] = result
+                    yield sse_event("duplicate", {"index": index, "filename": filename, **result})
+                else:
+                    uploaded[index] = result
+                    upload_result = result[0]
+                    yield sse_event("uploaded", {
+                        "index": index,
+                        "filename": filename,
+                        "url": upload_result.get("secure_url") or upload_result.get("url"),
+                        "public_id": upload_result.get("public_id"),
+                    })
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        db = SessionLocal()
+        try:
+            assets = []
+            assets_by_index: dict[int, MediaAsset] = {}
+            for i in sorted(uploaded):
+                upload_result, derived, content_hash = uploaded[i]
+                asset = _media_asset_from_upload(
+                    upload_result, title=None, alt_text=None, folder=folder, tags=tags
+                )
+                asset.content_hash = content_hash
+                apply_variants(asset, derived)
+                assets.append(asset)
+                assets_by_index[i] = asset
+            sync_asset_tags(db, assets)
+            db.add_all(assets)
+            db.commit()
+            saved = [MediaAssetResponse.model_validate(asset).model_dump(mode="json") for asset in assets]
+        except Exception:  # noqa: BLE001
+            db.rollback()
+            logger.exception("Saving bulk-uploaded media assets failed")
+            for upload_result, derived, _ in uploaded.values():
+                if derived:
+                    await run_in_threadpool(delete_variants, json.dumps(derived["variants"]))
+                if upload_result.get("deduplicated"):
+                    continue  # the stored file predates this request
+                try:
+                    await get_storage(upload_result["provider"]).delete(upload_result["public_id"])
+                except Exception:  # noqa: BLE001
+                    logger.exception("Cleanup of uploaded asset %s failed", upload_result.get("public_id"))
+            yield sse_event("error", {"detail": "Failed to save uploaded assets."})
+            return
+        finally:
+            db.close()
+
+        duplicate_ids: dict[int, int] = {}
+        for index, duplicate in sorted(duplicates.items()):
+            target = duplicates.get(duplicate.get("duplicate_of_index"), duplicate)
+            if "asset_id" in target:
+                duplicate_ids[index] = target["asset_id"]
+            elif duplicate["duplicate_of_index"] in assets_by_index:
+                duplicate_ids[index] = cast(int, assets_by_index[duplicate["duplicate_of_index"]].id)
+            else:
+                failed.append(index)  # the file it duplicated failed to upload
+
+        yield sse_event("done", {
+            "assets": saved,
+            "duplicates": duplicate_ids,
+            "failed_indexes": sorted(failed),
+        })
+
+    return sse_response(_events())
+
+
+@router.get("/media/duplicates", response_model=MediaDuplicateReport)
+async def media_duplicate_report(
+    max_distance: int = Query(6, ge=0, le=16, description="Max differing bits between perceptual hashes"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Exact duplicates (same SHA-256) and near duplicates (perceptual hashes
+    within `max_distance` bits, e.g. resized or re-exported copies).  Assets
+    uploaded before hashing was added have no hashes and are only counted.
+    """
+    rows = db.query(MediaAsset.id, MediaAsset.content_hash, MediaAsset.perceptual_hash).all()
+    by_content: dict[str, list[int]] = {}
+    for asset_id, content_hash, _ in rows:
+        if content_hash:
+            by_content.setdefault(content_hash, []).append(asset_id)
+    exact_groups = [(sorted(ids), 0) for ids in by_content.values() if len(ids) > 1]
+    exact_ids = {i for ids, _ in exact_groups for i in ids[1:]}
+    similar_groups = near_duplicate_groups(
+        # One representative per exact-duplicate set, so those are not reported twice.
+        [(asset_id, phash) for asset_id, _, phash in rows if phash and asset_id not in exact_ids],
+        max_distance,
+    )
+
+    wanted = {i for ids, _ in exact_groups + similar_groups for i in ids}
+    assets = {
+        cast(int, a.id): a for a in db.query(MediaAsset).filter(MediaAsset.id.in_(wanted)).all()
+    } if wanted else {}
+
+    def _groups(groups: list[tuple[list[int], int]]) -> list[dict]:
+        return [{"distance": distance, "assets": [assets[i] for i in ids]} for ids, distance in groups]
+
+    return {
+        "exact": _groups(exact_groups),
+        "similar": _groups(similar_groups),
+        "max_distance": max_distance,
+        "unhashed": sum(1 for _, content_hash, phash in rows if not content_hash and not phash),
+    }
+
+
+@router.post("/media/reconcile", response_model=MediaReconcileReport)
+async def reconcile_media_inventory(
+    payload: MediaReconcileRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Diff the Cloudinary inventory under `prefix` against the media library:
+    `orphans` are remote resources no asset points at, `missing` are assets
+    whose resource is gone.  A dry run unless `orphans` ("delete" or
+    "import") or `remove_missing` asks for fixes; orphans and rows whose URL
+    content still references are kept (`in_use_orphans`, `in_use_ids`).
+    """
+    try:
+        return await reconcile_inventory(
+            db,
+            prefix=payload.prefix,
+            orphans=payload.orphans,
+            remove_missing=payload.remove_missing,
+            grace_minutes=payload.grace_minutes,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except Exception as exc:  # noqa: BLE001 - wrap provider errors
+        logger.exception("Media inventory reconciliation failed")
+        raise HTTPException(status_code=502, detail="Could not list the Cloudinary inventory.") from exc
+
+
 @router.put("/media/{asset_id}", response_model=MediaAssetResponse)
 async def update_media_asset(
     asset_id: int,
@@ -1253,17 +1686,57 @@ async def update_media_asset(
     if not asset:
         raise HTTPException(status_code=404, detail="Media asset not found")
 
-    for field, value in payload.model_dump(exclude_unset=True).items():
+    updates = payload.model_dump(mode="json", exclude_unset=True)
+    for field, value in updates.items():
         setattr(asset, field, value)
+    if "tags" in updates:
+        sync_asset_tags(db, asset)
 
     db.commit()
     db.refresh(asset)
     return asset
 
 
+def _shared_public_ids(db: Session, assets: list[MediaAsset]) -> set[tuple[str, str]]:
+    """(provider, public_id) pairs of `assets` that other rows still use (deduplicated local files)."""
+    keys = {(cast(str, a.provider), cast(str, a.public_id)) for a in assets if a.public_id}
+    if not keys:
+        return set()
+    rows = (
+        db.query(MediaAsset.provider, MediaAsset.public_id)
+        .filter(MediaAsset.public_id.in_([public_id for _, public_id in keys]))
+        .filter(MediaAsset.id.notin_([a.id for a in assets]))
+        .all()
+    )
+    return keys & {(provider, public_id) for provider, public_id in rows}
+
+
+@router.get("/media/{asset_id}/usages", response_model=List[MediaUsageResponse])
+async def list_media_asset_usages(
+    asset_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Content rows that reference the asset (or one of its variants)."""
+    asset = db.query(MediaAsset).filter(MediaAsset.id == asset_id).first()
+    if not asset:
+        raise HTTPException(status_code=404, detail="Media asset not found")
+    return usages_for_assets(db, [asset]).get(asset_id, [])
+
+
+@router.post("/media/usages/rebuild")
+async def rebuild_media_usages(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Re-derive the usage index from every content table."""
+    return {"usages": await run_in_threadpool(rebuild_usage_index, db)}
+
+
 @router.delete("/media/{asset_id}")
 async def delete_media_asset(
     asset_id: int,
+    force: bool = Query(default=False, description="Delete even if content still references the asset"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
@@ -1271,17 +1744,29 @@ async def delete_media_asset(
     if not asset:
         raise HTTPException(status_code=404, detail="Media asset not found")
 
-    provider = cast(str | None, asset.provider)
+    if not force:
+        usages = usages_for_assets(db, [asset]).get(asset_id)
+        if usages:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "Media asset is still in use.", "usages": usages},
+            )
+
+    storage = get_storage(cast(str | None, asset.provider) or "external")
     public_id = cast(str | None, asset.public_id)
-    if provider == "cloudinary" and public_id:
+    if storage is not None and public_id and not _shared_public_ids(db, [asset]):
         try:
-            await delete_image(public_id)
+            deleted = await storage.delete(public_id)
         except Exception as exc:  # noqa: BLE001
-            logger.exception("Cloudinary delete failed")
+            logger.exception("Remote media delete failed")
             raise HTTPException(status_code=502, detail="Failed to delete remote asset.") from exc
+        if not deleted:
+            raise HTTPException(status_code=502, detail="Failed to delete remote asset.")
 
+    variants = cast(str | None, asset.variants)
     db.delete(asset)
     db.commit()
+    await run_in_threadpool(delete_variants, variants)
     return {"message": "Media asset deleted successfully"}
 
 
@@ -1291,30 +1776,57 @@ async def bulk_delete_media_assets(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
 ):
+    # A repeated id is handled (and reported) once.
+    ids = list(dict.fromkeys(payload.ids))
     deleted_ids: list[int] = []
     failed_ids: list[int] = []
 
-    assets = db.query(MediaAsset).filter(MediaAsset.id.in_(payload.ids)).all()
+    assets = db.query(MediaAsset).filter(MediaAsset.id.in_(ids)).all()
     assets_by_id = {cast(int, asset.id): asset for asset in assets}
+    # Assets still referenced by content are skipped (reported in in_use_ids) unless forced.
+    in_use = set() if payload.force else set(usages_for_assets(db, assets))
+    assets = [asset for asset in assets if asset.id not in in_use]
+    shared = _shared_public_ids(db, assets)
+
+    # One delete_many call per provider (Cloudinary batches 100 ids per request).
+    remote_ids: dict[str, list[str]] = {}
+    for asset in assets:
+        provider = cast(str | None, asset.provider) or "external"
+        public_id = cast(str | None, asset.public_id)
+        if get_storage(provider) is not None and public_id and (provider, public_id) not in shared:
+            remote_ids.setdefault(provider, []).append(public_id)
+    requested = {(provider, public_id) for provider, ids in remote_ids.items() for public_id in ids}
+    remote_deleted: dict[tuple[str, str], bool] = {}
+    for provider, public_ids in remote_ids.items():
+        try:
+            outcome = await get_storage(provider).delete_many(public_ids)
+        except Exception:  # noqa: BLE001 - e.g. Cloudinary not configured
+            logger.exception("Bulk media delete failed for provider %s", provider)
+            continue
+        remote_deleted.update({(provider, public_id): ok for public_id, ok in outcome.items()})
 
-    for asset_id in payload.ids:
+    for asset_id in ids:
         asset = assets_by_id.get(asset_id)
-        if not asset:
+        if not asset or asset_id in in_use:
             failed_ids.append(asset_id)
             continue
 
-        provider = cast(str | None, asset.provider)
+        provider = cast(str | None, asset.provider) or "external"
         public_id = cast(str | None, asset.public_id)
-        if provider == "cloudinary" and public_id:
-            try:
-                await delete_image(public_id)
-            except Exception:  # noqa: BLE001
-                logger.exception("Cloudinary delete failed for asset %s", asset_id)
-                failed_ids.append(asset_id)
-                continue
+        if (provider, public_id) in requested and not remote_deleted.get((provider, public_id)):
+            failed_ids.append(asset_id)
+            continue
 
         db.delete(asset)
         deleted_ids.append(asset_id)
 
+    if failed_ids:
+        logger.warning("Bulk media delete: %d of %d assets not deleted", len(failed_ids), len(ids))
     db.commit()
-    return {"deleted_ids": deleted_ids, "failed_ids": failed_ids}
+    for asset_id in deleted_ids:
+        await run_in_threadpool(delete_variants, cast(str | None, assets_by_id[asset_id].variants))
+    return {
+        "deleted_ids": deleted_ids,
+        "failed_ids": failed_ids,
+        "in_use_ids": [asset_id for asset_id in ids if asset_id in in_use],
+    }
@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Any, List
+
+from ..database import get_db
+from ..models.models import BlogFeed, User
+from ..schemas import BlogFeedCreate, BlogFeedUpdate, BlogFeedResponse
+from ..auth import get_current_admin_user
+from ..services import feed_sync
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[BlogFeedResponse])
+def read_blog_feeds(
+    db: Session = Depends(get_db),
+    _current_user: User = Depends(get_current_admin_user),
+):
+    """List external blog feeds and their last poll state (admin only)"""
+    return db.query(BlogFeed).order_by(BlogFeed.id).all()
+
+
+@router.post("/", response_model=BlogFeedResponse, status_code=status.HTTP_201_CREATED)
+def create_blog_feed(
+    feed: BlogFeedCreate,
+    db: Session = Depends(get_db),
+    _current_user: User = Depends(get_current_admin_user),
+):
+    """Register an RSS/Atom feed whose entries become external blog posts (admin only)"""
+    db_feed = BlogFeed(**feed.model_dump())
+    db.add(db_feed)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="This feed is already registered")
+    db.refresh(db_feed)
+    return db_feed
+
+
+@router.put("/{feed_id}", response_model=BlogFeedResponse)
+def update_blog_feed(
+    feed_id: int,
+    feed: BlogFeedUpdate,
+    db: Session = Depends(get_db),
+    _current_user: User = Depends(get_current_admin_user),
+):
+    """Update a feed's source label, new-post status or active flag (admin only)"""
+    db_feed = db.query(BlogFeed).filter(BlogFeed.id == feed_id).first()
+    if not db_feed:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    for field, value in feed.model_dump(exclude_unset=True).items():
+        setattr(db_feed, field, value)
+    db.commit()
+    db.refresh(db_feed)
+    return db_feed
+
+
+@router.delete("/{feed_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_blog_feed(
+    feed_id: int,
+    db: Session = Depends(get_db),
+    _current_user: User = Depends(get_current_admin_user),
+):
+    """Stop syncing a feed; posts already imported from it are kept (admin only)"""
+    db_feed = db.query(BlogFeed).filter(BlogFeed.id == feed_id).first()
+    if not db_feed:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    db.delete(db_feed)
+    db.commit()
+    return None
+
+
+@router.post("/sync")
+async def sync_all_blog_feeds(
+    _current_user: User = Depends(get_current_admin_user),
+) -> List[dict[str, Any]]:
+    """Poll every active feed now and return per-feed results (admin only)"""
+    return await feed_sync.sync_feeds()
+
+
+@router.post("/{feed_id}/sync")
+async def sync_blog_feed(
+    feed_id: int,
+    db: Session = Depends(get_db),
+    _current_user: User = Depends(get_current_admin_user),
+) -> dict[str, Any]:
+    """Poll one feed now, even if it is inactive (admin only)"""
+    if not db.query(BlogFeed.id).filter(BlogFeed.id == feed_id).first():
+        raise HTTPException(status_code=404, detail="Feed not found")
+    results = await feed_sync.sync_feeds([feed_id])
+    if not results:
+        # Deleted while it was being fetched.
+        raise HTTPException(status_code=404, detail="Feed not found")
+    return results[0]
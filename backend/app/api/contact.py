@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from .. import schemas
 from ..database import get_db, ContactMessage
-from ..services.email_service import send_contact_email
+from ..config import settings
+from ..services.email_outbox import enqueue_email
+from ..services.email_service import contact_email
 from ..utils import sanitize_text
 
 router = APIRouter()
@@ -17,7 +19,9 @@ async def create_contact_message(message: schemas.ContactForm, db: Session = Dep
     }
     db_message = ContactMessage(**sanitized_data)
     db.add(db_message)
+    if settings.TO_EMAIL:
+        email = contact_email(sanitized_data['name'], sanitized_data['email'], sanitized_data['message'])
+        enqueue_email(db, settings.TO_EMAIL, *email)
     db.commit()
     db.refresh(db_message)
-    await send_contact_email(sanitized_data['name'], sanitized_data['email'], sanitized_data['message'])
     return db_message
@@ -0,0 +1,132 @@
+"""
+api/link_health.py
+------------------
+Admin-only endpoints:
+  GET  /admin/link-health                counts by status / kind, failing URLs, last sweep
+  GET  /admin/link-health/checks         every checked URL, filterable by status / kind
+  POST /admin/link-health/sweep          start a sweep in the background (returns 202)
+
+Reports the results of the periodic link / image health sweep
+(services/link_checker.py) so broken publication links and missing images
+can be fixed before visitors hit them.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, field_validator
+from sqlalchemy.orm import Session
+
+from ..auth import get_current_admin_user
+from ..database import User, get_db
+from ..models.models import LinkCheck
+from ..services import link_checker
+
+router = APIRouter()
+
+LinkStatus = Literal["ok", "redirected", "blocked", "broken", "unreachable"]
+LinkKind = Literal["link", "image"]
+
+
+# ---------------------------------------------------------------------------
+# Response models
+# ---------------------------------------------------------------------------
+
+class LinkSource(BaseModel):
+    table: str
+    column: str
+    id: int
+
+
+class LinkCheckResponse(BaseModel):
+    url: str
+    kind: LinkKind
+    status: LinkStatus
+    http_status: int | None = None
+    final_url: str | None = None
+    error: str | None = None
+    response_ms: int | None = None
+    consecutive_failures: int = 0
+    sources: list[LinkSource] = []
+    checked_at: datetime | None = None
+    first_failed_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
+
+    @field_validator("sources", mode="before")
+    @classmethod
+    def _parse_sources(cls, v: Any) -> Any:
+        if isinstance(v, str):
+            return json.loads(v or "[]")
+        return v or []
+
+
+class LinkHealthSummary(BaseModel):
+    total: int
+    by_status: dict[str, int]
+    by_kind: dict[str, dict[str, int]]
+    failing: list[LinkCheckResponse]
+    sweep_running: bool
+    last_sweep: dict[str, Any] | None = None
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+@router.get(
+    "/link-health",
+    response_model=LinkHealthSummary,
+    summary="Link and image health summary",
+    description=(
+        "Counts of checked URLs by status and kind, plus the failing "
+        "(`broken` / `unreachable`) URLs that have been failing longest, with "
+        "the rows that reference them. `blocked` means the host refused the "
+        "automated check (401/403/429), not that the link is dead."
+    ),
+)
+def get_link_health(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    _current_user: User = Depends(get_current_admin_user),
+) -> LinkHealthSummary:
+    return LinkHealthSummary(**link_checker.summary(db, broken_limit=limit))
+
+
+@router.get(
+    "/link-health/checks",
+    response_model=list[LinkCheckResponse],
+    summary="List checked URLs",
+)
+def list_link_checks(
+    status_filter: LinkStatus | None = Query(None, alias="status"),
+    kind: LinkKind | None = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    _current_user: User = Depends(get_current_admin_user),
+) -> list[LinkCheck]:
+    query = db.query(LinkCheck)
+    if status_filter:
+        query = query.filter(LinkCheck.status == status_filter)
+    if kind:
+        query = query.filter(LinkCheck.kind == kind)
+    return query.order_by(LinkCheck.url).offset(skip).limit(limit).all()
+
+
+@router.post(
+    "/link-health/sweep",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Run a link / image health sweep now",
+    description="Starts a sweep in the background; poll `GET /admin/link-health` for the result.",
+)
+async def trigger_link_sweep(
+    _current_user: User = Depends(get_current_admin_user),
+) -> dict[str, bool]:
+    if not link_checker.trigger_sweep():
+        raise HTTPException(status_code=409, detail="A sweep is already running")
+    return {"started": True}
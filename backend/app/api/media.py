@@ -0,0 +1,64 @@
+"""
+api/media.py
+------------
+Public endpoint:
+  GET /media/responsive?url=...&url=...   srcset + blur-up placeholder per image
+
+The portfolio frontend stores plain image URLs on projects, stories, logos
+and so on.  It passes the ones it is about to render here and gets back the
+responsive variants generated at upload time (services/image_variants.py),
+so it can emit <picture>/<source srcset> with an inline LQIP instead of
+downloading every full-size original.  URLs that are not in the media
+library (or have no variants yet) are simply missing from the response.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..database import MediaAsset, get_db
+from ..schemas import MediaAssetResponse
+
+router = APIRouter()
+
+MAX_URLS = 50
+
+
+class ResponsiveImage(BaseModel):
+    url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None
+    srcset: Dict[str, str] = {}
+
+
+@router.get("/responsive", response_model=List[ResponsiveImage])
+def responsive_images(
+    response: Response,
+    url: List[str] = Query(..., description="Image URLs as stored on the content"),
+    db: Session = Depends(get_db),
+):
+    urls = list(dict.fromkeys(url))
+    if len(urls) > MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"Too many URLs (max {MAX_URLS}).")
+
+    assets = db.query(MediaAsset).filter(MediaAsset.url.in_(urls)).all()
+    by_url = {}
+    for asset in assets:
+        item = MediaAssetResponse.model_validate(asset)
+        if item.srcset or item.placeholder:
+            by_url.setdefault(asset.url, ResponsiveImage(
+                url=asset.url,
+                width=item.width,
+                height=item.height,
+                placeholder=item.placeholder,
+                srcset=item.srcset,
+            ))
+
+    # Variants never change for a given URL; let browsers and CDNs keep them a while.
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return [by_url[u] for u in urls if u in by_url]
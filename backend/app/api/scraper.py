@@ -1,23 +1,49 @@
 """
 api/scraper.py
 --------------
-Admin-only endpoint: POST /admin/scrape
+Admin-only endpoints:
+  POST /admin/scrape                     synchronous scrape + analysis
+  POST /admin/scrape/batch               scrape + analyze several URLs (batched LLM calls)
+  POST /admin/scrape/stream              same, streaming fields over Server-Sent Events
+  POST /admin/scrape/jobs                submit a background job (returns 202)
+  GET  /admin/scrape/jobs/{id}           poll a job
+  GET  /admin/scrape/jobs/{id}/events    Server-Sent Events stream of job state
+  GET  /admin/scrape/hosts               per-host rate limit / circuit breaker state
+  DELETE /admin/scrape/hosts/{host}      reset a host's breaker
+  GET  /admin/scrape/metrics             parse-pool, job-queue and LLM client stats
+
 Accepts a URL + content_type, scrapes the page, and returns Z.AI-analyzed
 structured data ready to pre-fill admin forms.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator, Literal
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import AnyHttpUrl, BaseModel, field_validator
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import AnyHttpUrl, BaseModel, Field, field_validator
 
 from ..auth import get_current_admin_user
 from ..database import User
-from ..services.scraper_service import ContentType, analyze_with_ai, scrape_url
+from ..services import scrape_jobs
+from ..services.host_limiter import HostRateLimited, host_limiter
+from ..services.llm_client import get_llm_client
+from ..services.scraper_service import (
+    ContentType,
+    analyze_many_with_ai,
+    analyze_with_ai,
+    analyze_with_ai_stream,
+    describe_fetch_error,
+    parse_pool,
+    scrape_url,
+)
+from ..utils.sse import sse_event, sse_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,6 +53,13 @@ router = APIRouter()
 # Request / Response models
 # ---------------------------------------------------------------------------
 
+def _check_url(v: str) -> str:
+    v = v.strip()
+    if not v.startswith(("http://", "https://")):
+        raise ValueError("URL must start with http:// or https://")
+    return v
+
+
 class ScrapeRequest(BaseModel):
     url: str
     content_type: ContentType
@@ -34,10 +67,21 @@ class ScrapeRequest(BaseModel):
     @field_validator("url")
     @classmethod
     def _validate_url(cls, v: str) -> str:
-        v = v.strip()
-        if not v.startswith(("http://", "https://")):
-            raise ValueError("URL must start with http:// or https://")
-        return v
+        return _check_url(v)
+
+
+# Upper bound on URLs per bulk request.
+MAX_BATCH_URLS = 20
+
+
+class BatchScrapeRequest(BaseModel):
+    urls: list[str] = Field(min_length=1, max_length=MAX_BATCH_URLS)
+    content_type: ContentType
+
+    @field_validator("urls")
+    @classmethod
+    def _validate_urls(cls, v: list[str]) -> list[str]:
+        return [_check_url(url) for url in v]
 
 
 class ScrapeResponse(BaseModel):
@@ -50,10 +94,44 @@ class ScrapeResponse(BaseModel):
     data: dict[str, Any]
 
 
+class BatchScrapeItem(BaseModel):
+    url: str
+    data: dict[str, Any] | None = None
+    error: str | None = None
+    error_status: int | None = None
+
+
+class BatchScrapeResponse(BaseModel):
+    content_type: ContentType
+    results: list[BatchScrapeItem]
+
+
+class ScrapeJobResponse(BaseModel):
+    id: str
+    url: str
+    content_type: ContentType
+    status: Literal["queued", "running", "succeeded", "failed"]
+    data: dict[str, Any] | None = None
+    error: str | None = None
+    error_status: int | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
 # ---------------------------------------------------------------------------
 # Endpoint
 # ---------------------------------------------------------------------------
 
+# Fetch failures that are the target site's fault and not worth a traceback.
+_EXPECTED_FETCH_ERRORS = (
+    httpx.TimeoutException,
+    httpx.HTTPStatusError,
+    httpx.ConnectError,
+    httpx.UnsupportedProtocol,
+    HostRateLimited,
+)
+
 @router.post(
     "/scrape",
     response_model=ScrapeResponse,
@@ -74,41 +152,11 @@ async def scrape_and_analyze(
     # 1. Fetch + parse the page
     try:
         scraped = await scrape_url(url)
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-            detail=f"The target URL timed out: {url}",
-        )
-    except httpx.HTTPStatusError as exc:
-        code = exc.response.status_code
-        if code == 403:
-            detail = f"The target site blocked the request (HTTP 403 Forbidden): {url}"
-        elif code == 401:
-            detail = f"The target site requires authentication (HTTP 401): {url}"
-        elif code in (500, 502, 503, 504):
-            detail = (
-                f"The target site is currently unavailable (HTTP {code}): {url}. "
-                f"This is a problem on their server, not ours. Try again later."
-            )
-        else:
-            detail = f"The target site returned HTTP {code}: {url}"
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=detail)
-    except httpx.ConnectError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Could not connect to the target site ({url}): {exc}",
-        )
-    except httpx.UnsupportedProtocol as exc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported protocol for URL {url}: {exc}",
-        )
     except Exception as exc:
-        logger.error("Scraping failed for %s: %s", url, exc, exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Failed to fetch the URL: {exc}",
-        )
+        code, detail = describe_fetch_error(exc, url)
+        if not isinstance(exc, _EXPECTED_FETCH_ERRORS):
+            logger.error("Scraping failed for %s: %s", url, exc, exc_info=True)
+        raise HTTPException(status_code=code, detail=detail)
 
     # 2. AI-powered analysis
     try:
@@ -125,3 +173,239 @@ async def scrape_and_analyze(
         url=url,
         data=structured,
     )
+
+
+@router.post(
+    "/scrape/batch",
+    response_model=BatchScrapeResponse,
+    summary="Scrape & analyze several URLs with batched Z.AI calls",
+    description=(
+        f"Fetches up to {MAX_BATCH_URLS} URLs concurrently, then analyzes the "
+        "pages in batches of `ZAI_BATCH_SIZE` documents per completion instead "
+        "of one completion each. Results come back in request order; a URL "
+        "that could not be fetched carries `error` / `error_status` instead "
+        "of `data`."
+    ),
+)
+async def scrape_and_analyze_batch(
+    body: BatchScrapeRequest,
+    _current_user: User = Depends(get_current_admin_user),
+) -> BatchScrapeResponse:
+    fetched = await asyncio.gather(*(scrape_url(url) for url in body.urls), return_exceptions=True)
+
+    results: list[BatchScrapeItem] = []
+    scraped_pages: list[dict[str, Any]] = []
+    for url, outcome in zip(body.urls, fetched):
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
+            code, detail = describe_fetch_error(outcome, url)
+            if not isinstance(outcome, _EXPECTED_FETCH_ERRORS):
+                logger.error("Scraping failed for %s: %s", url, outcome, exc_info=outcome)
+            results.append(BatchScrapeItem(url=url, error=detail, error_status=code))
+        else:
+            results.append(BatchScrapeItem(url=url))
+            scraped_pages.append(outcome)
+
+    analysed = iter(await analyze_many_with_ai(scraped_pages, body.content_type))
+    for item in results:
+        if item.error is None:
+            item.data = next(analysed)
+
+    return BatchScrapeResponse(content_type=body.content_type, results=results)
+
+
+@router.post(
+    "/scrape/stream",
+    summary="Scrape & analyze a URL, streaming fields as they are ready (Server-Sent Events)",
+    description=(
+        "Same input as `POST /admin/scrape`, but the response is an event "
+        "stream: `fallback` carries the instant non-AI extraction, each "
+        "`field` event carries one Z.AI field (`name`, `value`) as soon as "
+        "the model has finished generating it, and `done` carries the final "
+        "merged `data`. A fetch failure produces a single `error` event with "
+        "`status` and `detail`."
+    ),
+)
+async def scrape_and_analyze_stream(
+    body: ScrapeRequest,
+    request: Request,
+    _current_user: User = Depends(get_current_admin_user),
+) -> StreamingResponse:
+    url = body.url
+    content_type = body.content_type
+
+    async def _events() -> AsyncIterator[str]:
+        try:
+            scraped = await scrape_url(url)
+        except Exception as exc:
+            code, detail = describe_fetch_error(exc, url)
+            if not isinstance(exc, _EXPECTED_FETCH_ERRORS):
+                logger.error("Scraping failed for %s: %s", url, exc, exc_info=True)
+            yield sse_event("error", {"status": code, "detail": detail})
+            return
+
+        analysis = analyze_with_ai_stream(scraped, content_type)
+        try:
+            async for event, payload in analysis:
+                yield sse_event(event, {"content_type": content_type, "url": url, **payload})
+                if event != "done" and await request.is_disconnected():
+                    return
+        finally:
+            await analysis.aclose()
+
+    return sse_response(_events())
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+# Seconds between SSE keep-alive comments while a job is idle.
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+@router.post(
+    "/scrape/jobs",
+    response_model=ScrapeJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a background scrape & analysis job",
+    description=(
+        "Queues the scrape + Z.AI analysis and returns a job immediately. "
+        "Poll `GET /admin/scrape/jobs/{id}` or subscribe to "
+        "`GET /admin/scrape/jobs/{id}/events`. Re-submitting a URL that is "
+        "already queued or running returns the existing job."
+    ),
+)
+async def submit_scrape_job(
+    body: ScrapeRequest,
+    response: Response,
+    _current_user: User = Depends(get_current_admin_user),
+) -> ScrapeJobResponse:
+    job, created = await scrape_jobs.submit_job(body.url, body.content_type)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return ScrapeJobResponse(**job)
+
+
+@router.get(
+    "/scrape/jobs/{job_id}",
+    response_model=ScrapeJobResponse,
+    summary="Get the state of a background scrape job",
+)
+async def get_scrape_job(
+    job_id: str,
+    _current_user: User = Depends(get_current_admin_user),
+) -> ScrapeJobResponse:
+    job = await run_in_threadpool(scrape_jobs.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scrape job not found")
+    return ScrapeJobResponse(**job)
+
+
+@router.get(
+    "/scrape/jobs/{job_id}/events",
+    summary="Stream background scrape job updates (Server-Sent Events)",
+    description=(
+        "Emits a `status` event with the full job on every state change and "
+        "closes the stream once the job has succeeded or failed."
+    ),
+)
+async def stream_scrape_job(
+    job_id: str,
+    request: Request,
+    _current_user: User = Depends(get_current_admin_user),
+) -> StreamingResponse:
+    if not await run_in_threadpool(scrape_jobs.get_job, job_id):
+        raise HTTPException(status_code=404, detail="Scrape job not found")
+
+    async def _events() -> AsyncIterator[str]:
+        last_status: str | None = None
+        while True:
+            job = await run_in_threadpool(scrape_jobs.get_job, job_id)
+            if job is None:
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield sse_event("status", ScrapeJobResponse(**job).model_dump(mode="json"))
+            if job["status"] in scrape_jobs.TERMINAL_STATUSES:
+                return
+            if await request.is_disconnected():
+                return
+            if not await scrape_jobs.wait_for_update(job_id, timeout=SSE_KEEPALIVE_SECONDS):
+                yield ": keep-alive\n\n"
+
+    return sse_response(_events())
+
+
+# ---------------------------------------------------------------------------
+# Per-host limiter
+# ---------------------------------------------------------------------------
+
+class ScrapeHostState(BaseModel):
+    host: str
+    state: Literal["closed", "open", "half_open"]
+    consecutive_failures: int
+    last_error: str | None = None
+    retry_at: datetime | None = None
+    tokens: float
+    requests: int
+    failures: int
+    short_circuited: int
+    throttled_seconds: float
+
+
+@router.get(
+    "/scrape/hosts",
+    response_model=list[ScrapeHostState],
+    summary="Per-host politeness limiter and circuit breaker state",
+    description=(
+        "Lists every host scraped since startup, open circuits first. While a "
+        "host is `open`, scrapes of it skip the network and return the "
+        "fallback extraction; `retry_at` is when the next probe is allowed."
+    ),
+)
+async def list_scrape_hosts(
+    _current_user: User = Depends(get_current_admin_user),
+) -> list[ScrapeHostState]:
+    return [ScrapeHostState(**row) for row in host_limiter.snapshot()]
+
+
+@router.delete(
+    "/scrape/hosts/{host}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Reset a host's circuit breaker and rate limit",
+)
+async def reset_scrape_host(
+    host: str,
+    _current_user: User = Depends(get_current_admin_user),
+) -> Response:
+    if not host_limiter.reset(host.lower()):
+        raise HTTPException(status_code=404, detail="Host not tracked")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+@router.get(
+    "/scrape/metrics",
+    summary="Scraper worker-pool saturation metrics",
+    description=(
+        "`parse_pool` reports the HTML parsing thread pool (running / queued "
+        "calls, callers waiting for a slot, timeouts); `jobs` reports the "
+        "background scrape-job queue; `llm` reports the shared Z.AI client "
+        "(in-flight calls, retries, rate limits, token usage), or null when "
+        "ZAI_API_KEY is not configured."
+    ),
+)
+async def get_scrape_metrics(
+    _current_user: User = Depends(get_current_admin_user),
+) -> dict[str, Any]:
+    llm_client = get_llm_client()
+    return {
+        "parse_pool": parse_pool.stats(),
+        "jobs": scrape_jobs.stats(),
+        "llm": llm_client.stats() if llm_client else None,
+    }
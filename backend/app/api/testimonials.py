@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -6,7 +6,9 @@ from ..database import get_db, Testimonial
 from ..schemas import TestimonialCreate, TestimonialSubmit, TestimonialUpdate, TestimonialResponse
 from ..auth import get_current_admin_user
 from ..utils import sanitize_text
-from ..services.email_service import send_testimonial_thank_you, send_testimonial_notification
+from ..config import settings
+from ..services.email_outbox import enqueue_email
+from ..services.email_service import testimonial_notification_email, testimonial_thank_you_email
 
 router = APIRouter()
 
@@ -48,7 +50,6 @@ def get_featured_testimonials(db: Session = Depends(get_db)):
 @router.post("/submit", response_model=dict)
 async def submit_testimonial(
     testimonial: TestimonialSubmit,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
@@ -72,11 +73,13 @@ async def submit_testimonial(
         display_order=0,
     )
     db.add(db_testimonial)
+    enqueue_email(db, testimonial.submitter_email, *testimonial_thank_you_email(testimonial.name))
+    if settings.TO_EMAIL:
+        enqueue_email(
+            db, settings.TO_EMAIL,
+            *testimonial_notification_email(testimonial.name, testimonial.role, testimonial.company),
+        )
     db.commit()
-    db.refresh(db_testimonial)
-
-    background_tasks.add_task(send_testimonial_thank_you, testimonial.name, testimonial.submitter_email)
-    background_tasks.add_task(send_testimonial_notification, testimonial.name, testimonial.role, testimonial.company)
 
     return {"message": "Thank you! Your testimonial has been received and is pending review."}
 
@@ -51,12 +51,54 @@ class Settings(BaseSettings):
     SMTP_PORT: int = Field(default=587)
     SMTP_USER: str = Field(default="")
     SMTP_PASSWORD: str = Field(default="")
+    # Implicit TLS on connect; with False, STARTTLS is still used when the server offers it
+    SMTP_USE_TLS: bool = Field(default=True)
+    SMTP_TIMEOUT: int = Field(default=30)
+    # Email outbox sender: seconds between polls for due retries (0 disables sending; mail stays queued)
+    EMAIL_OUTBOX_POLL_SECONDS: int = Field(default=30)
+    # Messages sent per batch over one SMTP connection
+    EMAIL_OUTBOX_BATCH_SIZE: int = Field(default=50)
+    # Retries back off exponentially from BACKOFF up to BACKOFF_MAX seconds; then the message is failed
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = Field(default=8)
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = Field(default=30)
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS: int = Field(default=3600)
+    # Idle seconds before the sender closes its SMTP connection
+    EMAIL_SMTP_KEEPALIVE_SECONDS: int = Field(default=60)
+    # Compiled email template bytecode (empty: Jinja's per-user temp directory)
+    EMAIL_TEMPLATE_CACHE_DIR: str = Field(default="")
 
     # Cloudinary Configuration
     CLOUDINARY_CLOUD_NAME: str = Field(default="")
     CLOUDINARY_API_KEY: str = Field(default="")
     CLOUDINARY_API_SECRET: str = Field(default="")
     CLOUDINARY_FOLDER: str = Field(default="portfolio")
+    # Largest image accepted by the media upload endpoints
+    MEDIA_UPLOAD_MAX_BYTES: int = Field(default=5 * 1024 * 1024)
+    # Bulk upload: files per request, and parallel Cloudinary uploads per request
+    MEDIA_BULK_UPLOAD_MAX_FILES: int = Field(default=20)
+    MEDIA_UPLOAD_CONCURRENCY: int = Field(default=4)
+    # Direct browser -> Cloudinary uploads: seconds the completion token stays valid
+    MEDIA_DIRECT_UPLOAD_TTL_SECONDS: int = Field(default=900)
+    # Backend for new uploads: "cloudinary" or "local" (content-addressed files under MEDIA_ROOT)
+    MEDIA_STORAGE_PROVIDER: str = Field(default="cloudinary")
+    # Local media (stored objects, responsive variants): written under MEDIA_ROOT, served at MEDIA_PUBLIC_URL
+    MEDIA_ROOT: str = Field(default="./media")
+    MEDIA_PUBLIC_URL: str = Field(default="http://localhost:8000/media")
+    MEDIA_VARIANT_WIDTHS: List[int] = Field(default=[320, 640, 960, 1280, 1920])
+    MEDIA_VARIANT_FORMATS: List[str] = Field(default=["webp", "avif"])
+    MEDIA_VARIANT_QUALITY: int = Field(default=75)
+    # Encoder processes, queued uploads beyond them, and seconds per image
+    MEDIA_VARIANT_WORKERS: int = Field(default=2)
+    MEDIA_VARIANT_QUEUE: int = Field(default=16)
+    MEDIA_VARIANT_TIMEOUT: int = Field(default=60)
+    # Store a perceptual hash per upload for the near-duplicate report
+    MEDIA_PERCEPTUAL_HASH: bool = Field(default=True)
+    # Inventory reconciliation ignores assets younger than this (uploads still being recorded)
+    MEDIA_RECONCILE_GRACE_MINUTES: int = Field(default=60)
+
+    # Rewrite Cloudinary image URLs in public GET responses to sized f_auto/q_auto
+    # URLs with srcsets even when the client does not opt in (?images=responsive)
+    RESPONSIVE_IMAGES_DEFAULT: bool = Field(default=False)
 
     # Site Configuration
     SITE_URL: str = Field(default="http://localhost:3000")
@@ -71,6 +113,60 @@ class Settings(BaseSettings):
     ZAI_MODEL: str = Field(default="glm-4.7-flash")
     # Set ZAI_SCRAPER_TIMEOUT to control per-request AI timeout (seconds)
     ZAI_SCRAPER_TIMEOUT: int = Field(default=60)
+    # Concurrent completions allowed through the shared client, and how many
+    # times a 429 / 5xx / connection error is retried within that timeout.
+    ZAI_MAX_CONCURRENCY: int = Field(default=4)
+    ZAI_MAX_RETRIES: int = Field(default=3)
+    # Send only the most salient sentences of the page body (extractive
+    # summary, budget per content type, title / description terms kept)
+    # instead of the first ~5000 chars, for single-page analysis.  Opt-in
+    # (see benchmarks/bench_prompt_size.py for the token savings and recall).
+    ZAI_COMPACT_CONTENT: bool = Field(default=False)
+    # Documents packed into one completion by bulk analysis (1 disables batching)
+    ZAI_BATCH_SIZE: int = Field(default=5)
+    # Compact each document of a bulk-analysis batch the same way; on by
+    # default, since a batch prompt carries ZAI_BATCH_SIZE page bodies.
+    ZAI_BATCH_COMPACT_CONTENT: bool = Field(default=True)
+    # response_format sent with analysis completions: "json_object" (JSON
+    # mode), "json_schema" (batch answers constrained to one object per
+    # document with the prompt's typed fields) or "" for providers that
+    # support neither.
+    ZAI_RESPONSE_FORMAT: str = Field(default="json_object")
+    # Hard cap on bytes read from a scraped page, and how much of <body> to
+    # read once </head> has arrived before the scraper stops downloading.
+    SCRAPER_MAX_BYTES: int = Field(default=2_000_000)
+    SCRAPER_BODY_BYTES: int = Field(default=300_000)
+    # Thread pool for HTML parsing / extraction (kept off the event loop)
+    SCRAPER_PARSE_WORKERS: int = Field(default=2)
+    SCRAPER_PARSE_QUEUE: int = Field(default=8)
+    SCRAPER_PARSE_TIMEOUT: int = Field(default=10)
+    # Per-host politeness: sustained requests/second, burst, and the longest a
+    # request may queue for its host before being rejected (seconds).
+    SCRAPER_HOST_RATE: float = Field(default=0.5)
+    SCRAPER_HOST_BURST: int = Field(default=3)
+    SCRAPER_HOST_MAX_WAIT: int = Field(default=10)
+    # Consecutive failures that open a host's circuit, and how long it stays
+    # open before a probe request is allowed (seconds).
+    SCRAPER_BREAKER_THRESHOLD: int = Field(default=3)
+    SCRAPER_BREAKER_COOLDOWN: int = Field(default=300)
+    # Twitter/X oEmbed endpoint (overridable so the offline suite can serve it locally)
+    SCRAPER_TWITTER_OEMBED_URL: str = Field(default="https://publish.twitter.com/oembed")
+    # Number of in-process workers executing background scrape jobs
+    SCRAPE_JOB_WORKERS: int = Field(default=2)
+
+    # Stored link / image health checks (0 hours disables the periodic sweep)
+    LINK_CHECK_INTERVAL_HOURS: float = Field(default=24)
+    # Probes in flight across all hosts, and per host
+    LINK_CHECK_CONCURRENCY: int = Field(default=10)
+    LINK_CHECK_PER_HOST: int = Field(default=2)
+    # Per-request timeout in seconds
+    LINK_CHECK_TIMEOUT: int = Field(default=10)
+
+    # External blog feed sync (0 minutes disables the periodic poll)
+    FEED_SYNC_INTERVAL_MINUTES: int = Field(default=60)
+    FEED_SYNC_TIMEOUT: int = Field(default=15)
+    # Feeds larger than this are rejected instead of parsed
+    FEED_SYNC_MAX_BYTES: int = Field(default=5_000_000)
 
     # Basic rate limiting (in-memory; suitable for single-process dev)
     RATE_LIMIT_WINDOW_SECONDS: int = Field(default=60)
@@ -89,6 +185,14 @@ class Settings(BaseSettings):
             raise ValueError("ENVIRONMENT must be one of: development, staging, production")
         return normalized
 
+    @field_validator("ZAI_RESPONSE_FORMAT")
+    @classmethod
+    def _validate_response_format(cls, value: str) -> str:
+        normalized = (value or "").strip().lower()
+        if normalized not in {"", "json_object", "json_schema"}:
+            raise ValueError("ZAI_RESPONSE_FORMAT must be one of: json_object, json_schema, or empty")
+        return normalized
+
     @field_validator("SECRET_KEY")
     @classmethod
     def _validate_secret_key(cls, value: str, info):
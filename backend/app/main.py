@@ -11,9 +11,14 @@ from starlette.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from .config import settings
 from .init_db import init_db
+from .services import email_outbox, email_templates, feed_sync, link_checker, media_usage, scrape_jobs
+from .services.llm_client import close_llm_client
+from .services.worker_pool import shutdown_pools
+from .utils.static_files import ImmutableStaticFiles
+from .utils.responsive_images import ResponsiveImagesMiddleware
 import uvicorn
 
-from .api import auth, projects, admin, experience, education, skills, contact, awards, certificates, services, blog, profile, testimonials, comments, seo, scraper, press_mentions, clients, stories, analytics
+from .api import auth, projects, admin, experience, education, skills, contact, awards, certificates, services, blog, blog_feeds, profile, testimonials, comments, seo, scraper, link_health, media, press_mentions, clients, stories, analytics
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -62,7 +67,23 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 async def lifespan(_app: FastAPI):
     # Initialize DB schema on startup. Placeholder seeding runs only in development.
     init_db(seed_data=settings.is_development)
+    media_usage.ensure_usage_index()
+    email_templates.preload()
+    await scrape_jobs.start_workers()
+    await link_checker.start_scheduler()
+    await feed_sync.start_scheduler()
+    await email_outbox.start_sender()
     yield
+    await email_outbox.stop_sender()
+    await feed_sync.stop_scheduler()
+    await link_checker.stop_scheduler()
+    await scrape_jobs.stop_workers()
+    shutdown_pools()
+    await close_llm_client()
+
+os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+# Keep the media usage index current on every content write.
+media_usage.install()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -105,6 +126,8 @@ RateKey = Tuple[str, str]  # (ip, bucket)
 rate_buckets: Dict[RateKey, Deque[float]] = {}
 
 app.add_middleware(SecurityHeadersMiddleware)
+# Opt-in sized Cloudinary URLs + srcsets in public JSON responses
+app.add_middleware(ResponsiveImagesMiddleware)
 
 @app.middleware("http")
 async def rate_limit_middleware(request, call_next):
@@ -169,11 +192,13 @@ app.include_router(awards.router, prefix=f"{settings.API_V1_STR}/awards", tags=[
 app.include_router(certificates.router, prefix=f"{settings.API_V1_STR}/certificates", tags=["certificates"])
 app.include_router(services.router, prefix=f"{settings.API_V1_STR}/services", tags=["services"])
 app.include_router(blog.router, prefix=f"{settings.API_V1_STR}/blog", tags=["blog"])
+app.include_router(blog_feeds.router, prefix=f"{settings.API_V1_STR}/admin/blog-feeds", tags=["blog-feeds"])
 app.include_router(contact.router, prefix=f"{settings.API_V1_STR}/contact", tags=["contact"])
 app.include_router(testimonials.router, prefix=f"{settings.API_V1_STR}/testimonials", tags=["testimonials"])
 app.include_router(comments.router, prefix=f"{settings.API_V1_STR}/comments", tags=["comments"])
 app.include_router(seo.router, prefix=f"{settings.API_V1_STR}/seo", tags=["seo"])
 app.include_router(scraper.router, prefix=f"{settings.API_V1_STR}/admin", tags=["scraper"])
+app.include_router(link_health.router, prefix=f"{settings.API_V1_STR}/admin", tags=["link-health"])
 # Admin-prefixed routes (write operations, require auth)
 app.include_router(press_mentions.router, prefix=f"{settings.API_V1_STR}/admin/press-mentions", tags=["press-mentions"])
 app.include_router(clients.router, prefix=f"{settings.API_V1_STR}/admin/clients", tags=["clients"])
@@ -183,6 +208,10 @@ app.include_router(press_mentions.router, prefix=f"{settings.API_V1_STR}/press-m
 app.include_router(clients.router, prefix=f"{settings.API_V1_STR}/clients", tags=["clients"])
 app.include_router(stories.router, prefix=f"{settings.API_V1_STR}/stories", tags=["stories"])
 app.include_router(analytics.router, prefix=f"{settings.API_V1_STR}/analytics", tags=["analytics"])
+app.include_router(media.router, prefix=f"{settings.API_V1_STR}/media", tags=["media"])
+
+# Local media (stored objects, responsive variants); MEDIA_PUBLIC_URL points here.
+app.mount("/media", ImmutableStaticFiles(directory=settings.MEDIA_ROOT), name="media")
 
 
 @app.get("/docs", include_in_schema=False)
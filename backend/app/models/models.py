@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Table, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -212,7 +212,7 @@ class BlogPost(Base):
     published_at = Column(DateTime, nullable=True)
     scheduled_at = Column(DateTime, nullable=True)  # For scheduled publishing
     is_external = Column(Boolean, default=False, nullable=False)
-    external_url = Column(String, nullable=True)  # URL of the original article on another platform
+    external_url = Column(String, nullable=True, index=True)  # URL of the original article on another platform
     external_source = Column(String, nullable=True)  # e.g. "Medium", "LinkedIn", "X (Twitter)"
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -270,13 +270,22 @@ class SeoSettings(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
+# Association table for media asset tags (normalized from MediaAsset.tags)
+media_asset_tags = Table(
+    "media_asset_tags",
+    Base.metadata,
+    Column("asset_id", Integer, ForeignKey("media_assets.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("media_tags.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+
 class MediaAsset(Base):
     __tablename__ = "media_assets"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=True)
     alt_text = Column(String, nullable=True)
-    url = Column(String, nullable=False)
+    url = Column(String, nullable=False, index=True)
     public_id = Column(String, nullable=True)
     provider = Column(String, default="cloudinary")
     folder = Column(String, nullable=True)
@@ -285,7 +294,35 @@ class MediaAsset(Base):
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
     size_bytes = Column(Integer, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    variants = Column(Text, nullable=True)  # JSON array of {url, width, height, format, bytes}
+    placeholder = Column(Text, nullable=True)  # tiny WebP data URI for blur-up
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the uploaded bytes
+    perceptual_hash = Column(String(16), nullable=True, index=True)  # 64-bit dHash, hex
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+
+    tag_items = relationship("MediaTag", secondary=media_asset_tags, back_populates="assets")
+
+
+class MediaUsage(Base):
+    """Reverse index: which content row/column references which URL (services/media_usage.py)."""
+    __tablename__ = "media_usages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(2000), nullable=False, index=True)
+    source_table = Column(String(64), nullable=False)
+    source_id = Column(Integer, nullable=False)
+    source_column = Column(String(64), nullable=False)
+
+    __table_args__ = (Index("ix_media_usages_source", "source_table", "source_id"),)
+
+
+class MediaTag(Base):
+    __tablename__ = "media_tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(40), nullable=False, unique=True, index=True)  # lower-cased, trimmed
+
+    assets = relationship("MediaAsset", secondary=media_asset_tags, back_populates="tag_items")
 
 
 class ProjectImage(Base):
@@ -393,3 +430,76 @@ class PageVisit(Base):
     lon = Column(Integer, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     last_seen = Column(DateTime, server_default=func.now())
+
+
+class ScrapeJob(Base):
+    """Background scrape + AI analysis job submitted from the admin import flow."""
+    __tablename__ = "scrape_jobs"
+
+    id = Column(String(32), primary_key=True)
+    url = Column(String(2000), nullable=False, index=True)
+    content_type = Column(String(30), nullable=False)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued | running | succeeded | failed
+    result = Column(Text, nullable=True)  # JSON-encoded structured data
+    error = Column(Text, nullable=True)
+    error_status = Column(Integer, nullable=True)  # HTTP status the sync endpoint would have returned
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class LinkCheck(Base):
+    """Latest health-check result for one external URL stored somewhere in the content tables."""
+    __tablename__ = "link_checks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(2000), nullable=False, unique=True, index=True)
+    kind = Column(String(10), nullable=False, default="link")  # link | image
+    status = Column(String(20), nullable=False, index=True)  # ok | redirected | blocked | broken | unreachable
+    http_status = Column(Integer, nullable=True)
+    final_url = Column(String(2000), nullable=True)
+    error = Column(Text, nullable=True)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    response_ms = Column(Integer, nullable=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    sources = Column(Text, nullable=True)  # JSON list of {"table", "column", "id"} references
+    checked_at = Column(DateTime, nullable=True)
+    first_failed_at = Column(DateTime, nullable=True)
+
+
+class BlogFeed(Base):
+    """External RSS/Atom feed whose entries are synced in as external blog posts."""
+    __tablename__ = "blog_feeds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(2000), nullable=False, unique=True, index=True)
+    source = Column(String, nullable=False)  # stored as BlogPost.external_source, e.g. "Medium"
+    post_status = Column(String(20), nullable=False, default="published")  # status given to new posts
+    is_active = Column(Boolean, nullable=False, default=True)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    last_entry_at = Column(DateTime, nullable=True)  # newest entry date seen; older entries are skipped
+    last_polled_at = Column(DateTime, nullable=True)
+    last_status = Column(Integer, nullable=True)  # HTTP status of the last poll
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class EmailOutbox(Base):
+    """Outgoing email, written in the same transaction as the row that triggers it (services/email_outbox.py)."""
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(320), nullable=False)
+    subject = Column(String(300), nullable=False)
+    body = Column(Text, nullable=False)  # HTML
+    text_body = Column(Text, nullable=True)  # plain-text alternative
+    status = Column(String(20), nullable=False, default="pending")  # pending | sending | sent | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_email_outbox_due", "status", "next_attempt_at"),)
@@ -1,8 +1,11 @@
-from pydantic import BaseModel, EmailStr, HttpUrl, field_validator, Field
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, HttpUrl, field_validator, model_validator, Field
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+import json
 import re
 
+from .utils.srcset import build_srcset
+
 # Base schemas
 class ProjectBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
@@ -354,6 +357,57 @@ class BlogPostListResponse(BaseModel):
     latest: List[BlogPostResponse] = []
     featured: List[BlogPostResponse] = []
 
+
+class BlogFeedBase(BaseModel):
+    url: str
+    source: str
+    post_status: str = "published"
+    is_active: bool = True
+
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v: str) -> str:
+        v = v.strip()
+        if not v.startswith(("http://", "https://")):
+            raise ValueError("Feed URL must start with http:// or https://")
+        return v
+
+    @field_validator("post_status")
+    @classmethod
+    def validate_post_status(cls, v: str) -> str:
+        if v not in {"published", "draft"}:
+            raise ValueError("post_status must be 'published' or 'draft'")
+        return v
+
+
+class BlogFeedCreate(BlogFeedBase):
+    pass
+
+
+class BlogFeedUpdate(BaseModel):
+    source: Optional[str] = None
+    post_status: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    @field_validator("post_status")
+    @classmethod
+    def validate_post_status(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and v not in {"published", "draft"}:
+            raise ValueError("post_status must be 'published' or 'draft'")
+        return v
+
+
+class BlogFeedResponse(BlogFeedBase):
+    id: int
+    last_entry_at: Optional[datetime] = None
+    last_polled_at: Optional[datetime] = None
+    last_status: Optional[int] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 # Auth schemas
 class UserLogin(BaseModel):
     username: str
@@ -490,21 +544,147 @@ class MediaAssetUpdate(BaseModel):
     size_bytes: Optional[int] = None
 
 
+class MediaVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+    bytes: Optional[int] = None
+
+
 class MediaAssetResponse(MediaAssetBase):
     id: int
     created_at: datetime
+    variants: List[MediaVariant] = []
+    placeholder: Optional[str] = None
+    content_hash: Optional[str] = None
+    perceptual_hash: Optional[str] = None
+    # format -> "url 320w, url 640w, ..." ready for <source srcset>
+    srcset: Dict[str, str] = {}
+
+    @field_validator("variants", mode="before")
+    @classmethod
+    def parse_variants(cls, v: object) -> object:
+        """Variants are stored as a JSON string on the model."""
+        if v is None or v == "":
+            return []
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
+    @model_validator(mode="after")
+    def fill_srcset(self) -> "MediaAssetResponse":
+        if self.variants and not self.srcset:
+            self.srcset = build_srcset(
+                [variant.model_dump() for variant in self.variants], str(self.url), self.width
+            )
+        return self
 
     class Config:
         from_attributes = True
 
 
+class MediaDirectUploadRequest(BaseModel):
+    folder: Optional[str] = None
+    tags: Optional[str] = None  # comma-separated, as for /media/upload
+    title: Optional[str] = None
+    alt_text: Optional[str] = None
+
+
+class MediaDirectUploadTicket(BaseModel):
+    # POST the file as "file" plus every entry of `fields` (multipart) to upload_url
+    upload_url: str
+    fields: Dict[str, Any]
+    # Send back to /media/upload/direct/complete with Cloudinary's response
+    token: str
+    expires_at: datetime
+    max_bytes: int
+
+
+class MediaDirectUploadComplete(BaseModel):
+    token: str
+    public_id: str
+    version: int
+    signature: str
+
+
+class MediaDuplicateGroup(BaseModel):
+    # Widest perceptual-hash distance within the group (0 for exact duplicates)
+    distance: int
+    assets: List[MediaAssetResponse]
+
+
+class MediaDuplicateReport(BaseModel):
+    exact: List[MediaDuplicateGroup]
+    similar: List[MediaDuplicateGroup]
+    max_distance: int
+    unhashed: int
+
+
+class MediaReconcileRequest(BaseModel):
+    # Cloudinary public_id prefix; None means CLOUDINARY_FOLDER, "" the whole cloud
+    prefix: Optional[str] = None
+    # "delete" removes orphans from Cloudinary, "import" records them as assets
+    orphans: Optional[str] = None
+    # Delete rows whose Cloudinary resource is gone (unless content references them)
+    remove_missing: bool = False
+    grace_minutes: Optional[int] = Field(default=None, ge=0)
+
+    @field_validator("orphans")
+    @classmethod
+    def validate_orphans(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and v not in ("delete", "import"):
+            raise ValueError("orphans must be 'delete' or 'import'")
+        return v
+
+
+class MediaMissingAsset(BaseModel):
+    public_id: str
+    asset_ids: List[int]
+
+
+class MediaReconcileReport(BaseModel):
+    prefix: str
+    remote_count: int
+    local_count: int
+    # Remote public_ids no row points at
+    orphans: List[str]
+    # Rows whose public_id no longer exists remotely
+    missing: List[MediaMissingAsset]
+    # Differences skipped because they are younger than the grace period
+    recent: int
+    deleted_orphans: List[str] = []
+    imported_ids: List[int] = []
+    removed_ids: List[int] = []
+    # Missing rows kept because content still references them
+    in_use_ids: List[int] = []
+    # Orphans not deleted because content still references their URL
+    in_use_orphans: List[str] = []
+
+
 class MediaBulkDeleteRequest(BaseModel):
     ids: List[int]
+    # Delete assets even when content still references them
+    force: bool = False
 
 
 class MediaBulkDeleteResponse(BaseModel):
     deleted_ids: List[int]
     failed_ids: List[int]
+    # Subset of failed_ids skipped because content still references them
+    in_use_ids: List[int] = []
+
+
+class MediaUsageResponse(BaseModel):
+    table: str
+    id: int
+    column: str
+    url: str
+
+
+class MediaTagCount(BaseModel):
+    tag: str
+    count: int
 
 
 class MediaAssetListResponse(BaseModel):
@@ -512,6 +692,8 @@ class MediaAssetListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    # Tag counts over all matching assets (not just this page)
+    facets: List[MediaTagCount] = []
 
 
 # Project images
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import logging
+import time
+from typing import Any, BinaryIO, Dict, Optional
 
 import cloudinary
+import cloudinary.api
 import cloudinary.uploader
+import cloudinary.utils
 from fastapi.concurrency import run_in_threadpool
 
 from ..core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# The Admin API's delete_resources accepts at most this many public_ids per call.
+DELETE_BATCH_SIZE = 100
+# The Admin API's resources listing returns at most this many per page.
+LIST_PAGE_SIZE = 500
+# Outcomes of delete_resources that leave the asset gone.
+_DELETED_STATES = {"deleted", "not_found"}
+# Formats a browser may upload directly; the same set looks_like_image() accepts.
+DIRECT_UPLOAD_FORMATS = ("jpg", "png", "gif", "webp")
+
 
 cloudinary.config(
     cloud_name=settings.CLOUDINARY_CLOUD_NAME,
@@ -24,7 +40,7 @@ def _ensure_cloudinary_configured() -> None:
 
 async def upload_image(
     *,
-    file_bytes: bytes,
+    file: bytes | BinaryIO,
     filename: str,
     folder: Optional[str] = None,
     tags: Optional[list[str]] = None,
@@ -34,7 +50,7 @@ async def upload_image(
 
     def _upload() -> Dict[str, Any]:
         return cloudinary.uploader.upload(
-            file_bytes,
+            file,
             folder=upload_folder,
             public_id=None,
             resource_type="image",
@@ -57,3 +73,104 @@ async def delete_image(public_id: str) -> Dict[str, Any]:
         return cloudinary.uploader.destroy(public_id, resource_type="image")
 
     return await run_in_threadpool(_destroy)
+
+
+async def delete_images(public_ids: list[str], *, max_concurrency: int = 3) -> Dict[str, bool]:
+    """
+    Delete many images with the Admin API's delete_resources, DELETE_BATCH_SIZE
+    public_ids per call and at most `max_concurrency` calls in flight.
+
+    Returns {public_id: deleted}; "not_found" counts as deleted (like destroy),
+    and every id of a batch whose call failed is reported as not deleted.
+    """
+    _ensure_cloudinary_configured()
+    unique_ids = list(dict.fromkeys(public_ids))
+    batches = [unique_ids[i:i + DELETE_BATCH_SIZE] for i in range(0, len(unique_ids), DELETE_BATCH_SIZE)]
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _delete_batch(batch: list[str]) -> Dict[str, bool]:
+        def _delete() -> Dict[str, Any]:
+            return cloudinary.api.delete_resources(batch, resource_type="image", type="upload")
+
+        async with semaphore:
+            try:
+                result = await run_in_threadpool(_delete)
+            except Exception:  # noqa: BLE001 - the whole batch is reported as failed
+                logger.exception("Cloudinary delete_resources failed for %d assets", len(batch))
+                return {public_id: False for public_id in batch}
+        states = result.get("deleted") or {}
+        return {public_id: states.get(public_id) in _DELETED_STATES for public_id in batch}
+
+    outcome: Dict[str, bool] = {}
+    for batch_result in await asyncio.gather(*(_delete_batch(batch) for batch in batches)):
+        outcome.update(batch_result)
+    return outcome
+
+
+def signed_upload_params(*, folder: Optional[str], tags: Optional[list[str]]) -> Dict[str, Any]:
+    """
+    Parameters for a browser to POST a file straight to Cloudinary's upload
+    API.  Everything in `fields` is covered by the signature, so the client
+    cannot change the folder, tags or allowed formats; Cloudinary rejects the
+    signature after an hour (our own completion token expires sooner).
+    """
+    _ensure_cloudinary_configured()
+    params: Dict[str, Any] = {
+        "timestamp": int(time.time()),
+        "folder": folder or settings.CLOUDINARY_FOLDER,
+        "allowed_formats": ",".join(DIRECT_UPLOAD_FORMATS),
+    }
+    if tags:
+        params["tags"] = ",".join(tags)
+    params["signature"] = cloudinary.utils.api_sign_request(params, settings.CLOUDINARY_API_SECRET)
+    params["api_key"] = settings.CLOUDINARY_API_KEY
+    return {
+        "upload_url": cloudinary.utils.cloudinary_api_url("upload", resource_type="image"),
+        "fields": params,
+    }
+
+
+def verify_upload_response(public_id: str, version: int | str, signature: str) -> bool:
+    """Check the `signature` Cloudinary returns with an upload response."""
+    _ensure_cloudinary_configured()
+    return cloudinary.utils.verify_api_response_signature(public_id, version, signature)
+
+
+async def get_resource(public_id: str) -> Dict[str, Any]:
+    """Authoritative metadata (bytes, format, size, ...) of an uploaded image."""
+    _ensure_cloudinary_configured()
+
+    def _fetch() -> Dict[str, Any]:
+        return cloudinary.api.resource(public_id, resource_type="image", type="upload")
+
+    return await run_in_threadpool(_fetch)
+
+
+async def list_resources(
+    *, prefix: Optional[str] = None, tags: bool = False, page_size: int = LIST_PAGE_SIZE
+) -> list[Dict[str, Any]]:
+    """
+    Every uploaded image (optionally under `prefix`), following next_cursor
+    with the largest page the Admin API allows, so a library of N assets
+    costs ceil(N / 500) calls against the hourly Admin API quota.
+    """
+    _ensure_cloudinary_configured()
+    options: Dict[str, Any] = {
+        "resource_type": "image",
+        "type": "upload",
+        "max_results": min(page_size, LIST_PAGE_SIZE),
+        "tags": tags,
+    }
+    if prefix:
+        options["prefix"] = prefix
+    resources: list[Dict[str, Any]] = []
+    cursor: Optional[str] = None
+    while True:
+        def _page() -> Dict[str, Any]:
+            return cloudinary.api.resources(**options, **({"next_cursor": cursor} if cursor else {}))
+
+        page = await run_in_threadpool(_page)
+        resources.extend(page.get("resources") or [])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            return resources
@@ -0,0 +1,315 @@
+"""
+email_outbox.py
+---------------
+Durable outgoing email.
+
+Request handlers never talk to SMTP.  `enqueue_email()` adds an
+`email_outbox` row to the caller's session, so the message is committed —
+or rolled back — together with the contact message / testimonial that
+triggered it, and the visitor's response does not wait on an SMTP handshake.
+
+One in-process sender task (started from the app lifespan) delivers the
+queue:
+
+  - it is woken right after a commit that queued mail, and otherwise polls
+    every EMAIL_OUTBOX_POLL_SECONDS for retries that have come due;
+  - due rows are claimed EMAIL_OUTBOX_BATCH_SIZE at a time and sent over one
+    authenticated SMTP connection, which is kept open between batches and
+    closed after EMAIL_SMTP_KEEPALIVE_SECONDS idle (a dropped connection is
+    re-opened once per message);
+  - a failed send is retried with exponential backoff
+    (EMAIL_OUTBOX_BACKOFF_SECONDS doubling up to ..._BACKOFF_MAX_SECONDS)
+    until EMAIL_OUTBOX_MAX_ATTEMPTS, and permanent refusals (5xx) fail at
+    once.
+
+Rows left "sending" by a crash are re-queued on startup, so delivery is
+at-least-once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import aiosmtplib
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.models import EmailOutbox
+from .email_service import build_message, smtp_client
+
+logger = logging.getLogger(__name__)
+
+_sender: asyncio.Task | None = None
+_wake_event: asyncio.Event | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_smtp: aiosmtplib.SMTP | None = None
+_smtp_used_at = 0.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ---------------------------------------------------------------------------
+# Producer side
+# ---------------------------------------------------------------------------
+
+def wake() -> None:
+    """Nudge the sender (safe from any thread; a no-op when it is not running)."""
+    if _loop is not None and _wake_event is not None:
+        _loop.call_soon_threadsafe(_wake_event.set)
+
+
+def _wake_after_commit(_session: Session) -> None:
+    wake()
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, body: str, text_body: str | None = None) -> EmailOutbox:
+    """Queue a message in `db`'s transaction; it is sent once the caller commits."""
+    row = EmailOutbox(
+        to_email=to_email,
+        subject=subject[:300],
+        body=body,
+        text_body=text_body,
+        status="pending",
+        next_attempt_at=_utcnow(),
+    )
+    db.add(row)
+    if not event.contains(db, "after_commit", _wake_after_commit):
+        event.listen(db, "after_commit", _wake_after_commit)
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Sender
+# ---------------------------------------------------------------------------
+
+def backoff_seconds(attempts: int) -> int:
+    """Delay before retry number `attempts` (1-based)."""
+    return min(
+        settings.EMAIL_OUTBOX_BACKOFF_MAX_SECONDS,
+        settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0),
+    )
+
+
+def _permanent(exc: BaseException) -> bool:
+    """Refusals a retry cannot fix (bad recipient, rejected content)."""
+    if isinstance(exc, (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPRecipientRefused)):
+        return True
+    return (
+        isinstance(exc, aiosmtplib.SMTPResponseException)
+        and exc.code >= 500
+        and not isinstance(exc, aiosmtplib.SMTPAuthenticationError)
+    )
+
+
+def _claim_batch(limit: int) -> list[dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(EmailOutbox)
+            .filter(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= _utcnow())
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .all()
+        )
+        for row in rows:
+            setattr(row, "status", "sending")
+        db.commit()
+        return [
+            {
+                "id": row.id,
+                "to_email": row.to_email,
+                "subject": row.subject,
+                "body": row.body,
+                "text_body": row.text_body,
+                "attempts": row.attempts,
+            }
+            for row in rows
+        ]
+    finally:
+        db.close()
+
+
+def _record(batch: list[dict[str, Any]], outcomes: dict[int, BaseException | None]) -> None:
+    """Write one batch's results in a single transaction."""
+    now = _utcnow()
+    db = SessionLocal()
+    try:
+        rows = {row.id: row for row in db.query(EmailOutbox).filter(EmailOutbox.id.in_([item["id"] for item in batch]))}
+        for item in batch:
+            row = rows.get(item["id"])
+            if row is None:
+                continue
+            error = outcomes.get(item["id"])
+            attempts = item["attempts"] + 1
+            setattr(row, "attempts", attempts)
+            if error is None:
+                setattr(row, "status", "sent")
+                setattr(row, "sent_at", now)
+                setattr(row, "last_error", None)
+                continue
+            setattr(row, "last_error", f"{type(error).__name__}: {error}"[:2000])
+            if _permanent(error) or attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                setattr(row, "status", "failed")
+                logger.warning("Email %s to %s failed after %d attempt(s): %s", row.id, row.to_email, attempts, error)
+            else:
+                setattr(row, "status", "pending")
+                setattr(row, "next_attempt_at", now + timedelta(seconds=backoff_seconds(attempts)))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _connection() -> aiosmtplib.SMTP:
+    global _smtp
+    if _smtp is None or not _smtp.is_connected:
+        client = smtp_client()
+        await client.connect()
+        _smtp = client
+    return _smtp
+
+
+async def _disconnect() -> None:
+    global _smtp
+    client, _smtp = _smtp, None
+    if client is not None and client.is_connected:
+        try:
+            await client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            client.close()
+
+
+async def _reset(smtp: aiosmtplib.SMTP) -> None:
+    """Clear a half-finished transaction so the connection can carry the next message."""
+    try:
+        await smtp.rset()
+    except (aiosmtplib.SMTPException, OSError):
+        await _disconnect()
+
+
+async def _deliver(batch: list[dict[str, Any]]) -> dict[int, BaseException | None]:
+    global _smtp_used_at
+    outcomes: dict[int, BaseException | None] = {}
+    for index, item in enumerate(batch):
+        message = build_message(item["to_email"], item["subject"], item["body"], item["text_body"])
+        for retry in (False, True):
+            try:
+                smtp = await _connection()
+            except (aiosmtplib.SMTPException, OSError) as exc:
+                # Server unreachable or login refused: the rest of the batch would fail the same way.
+                await _disconnect()
+                outcomes.update({rest["id"]: exc for rest in batch[index:]})
+                return outcomes
+            try:
+                await smtp.send_message(message)
+                outcomes[item["id"]] = None
+            except aiosmtplib.SMTPServerDisconnected as exc:
+                # Server closed the pooled connection (idle timeout, per-session limit): reconnect once.
+                await _disconnect()
+                if not retry:
+                    continue
+                outcomes[item["id"]] = exc
+            except (aiosmtplib.SMTPException, OSError) as exc:
+                outcomes[item["id"]] = exc
+                if isinstance(exc, (aiosmtplib.SMTPTimeoutError, OSError)):
+                    await _disconnect()
+                else:
+                    await _reset(smtp)
+            break
+        _smtp_used_at = time.monotonic()
+    return outcomes
+
+
+def _seconds_until_due() -> float:
+    db = SessionLocal()
+    try:
+        next_due = db.query(func.min(EmailOutbox.next_attempt_at)).filter(EmailOutbox.status == "pending").scalar()
+    finally:
+        db.close()
+    if next_due is None:
+        return float(settings.EMAIL_OUTBOX_POLL_SECONDS)
+    return min(max((next_due - _utcnow()).total_seconds(), 0.0), float(settings.EMAIL_OUTBOX_POLL_SECONDS))
+
+
+async def process_due() -> int:
+    """Send one batch of due messages. Returns how many were claimed."""
+    # Session work runs in the threadpool so a slow database never blocks the event loop.
+    batch = await run_in_threadpool(_claim_batch, settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if batch:
+        outcomes = await _deliver(batch)
+        await run_in_threadpool(_record, batch, outcomes)
+    return len(batch)
+
+
+async def _run(wake_event: asyncio.Event) -> None:
+    while True:
+        timeout = float(settings.EMAIL_OUTBOX_POLL_SECONDS)
+        try:
+            if await process_due():
+                continue
+            timeout = await run_in_threadpool(_seconds_until_due)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Email outbox sender failed")
+        if _smtp is not None:
+            idle_left = settings.EMAIL_SMTP_KEEPALIVE_SECONDS - (time.monotonic() - _smtp_used_at)
+            if idle_left <= 0:
+                await _disconnect()
+            else:
+                timeout = min(timeout, idle_left)
+        try:
+            await asyncio.wait_for(wake_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        wake_event.clear()
+
+
+def _recover_sending() -> int:
+    """Re-queue rows a previous process claimed but never recorded."""
+    db = SessionLocal()
+    try:
+        count = (
+            db.query(EmailOutbox)
+            .filter(EmailOutbox.status == "sending")
+            .update({EmailOutbox.status: "pending"}, synchronize_session=False)
+        )
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+async def start_sender() -> None:
+    global _sender, _wake_event, _loop
+    if _sender is not None or settings.EMAIL_OUTBOX_POLL_SECONDS <= 0:
+        return
+    try:
+        recovered = await run_in_threadpool(_recover_sending)
+        if recovered:
+            logger.info("Re-queued %d email(s) interrupted by a restart", recovered)
+    except Exception:
+        logger.exception("Could not recover in-flight outbox emails")
+    _loop = asyncio.get_running_loop()
+    _wake_event = asyncio.Event()
+    _wake_event.set()  # drain whatever is already due
+    _sender = asyncio.create_task(_run(_wake_event))
+
+
+async def stop_sender() -> None:
+    global _sender, _wake_event, _loop
+    if _sender is not None:
+        _sender.cancel()
+        await asyncio.gather(_sender, return_exceptions=True)
+        _sender = None
+    _wake_event = None
+    _loop = None
+    await _disconnect()
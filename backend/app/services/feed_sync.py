@@ -0,0 +1,440 @@
+"""
+feed_sync.py
+------------
+Keeps external blog posts in step with the author's RSS/Atom feeds (Medium,
+Substack, a personal blog, ...).
+
+Each BlogFeed row is polled with a conditional GET (If-None-Match /
+If-Modified-Since from the previous answer), so an unchanged feed costs a
+single 304 and no parsing.  When the feed did change:
+
+  1. the XML is parsed off the event loop with lxml.iterparse; entries
+     dated at or before the newest entry already seen (last_entry_at) are
+     skipped without extracting anything else;
+  2. the remaining entries are upserted as external posts keyed by
+     `external_url`: one IN query finds the existing posts, new ones get a
+     free slug and are inserted, existing ones are refreshed only when the
+     entry's own updated date is newer than the post;
+  3. everything for one feed is committed in a single transaction, and the
+     new validators are stored only after that commit succeeds.
+
+Feeds are synced every FEED_SYNC_INTERVAL_MINUTES (0 disables the schedule)
+and on demand from the admin API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from lxml import etree, html as lxml_html
+from sqlalchemy import or_
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.models import BlogFeed, BlogPost
+from ..utils import slugify
+from .scraper_service import SCRAPER_HEADERS, parse_pool
+
+logger = logging.getLogger(__name__)
+
+_FEED_ROOTS = frozenset({"rss", "feed", "RDF"})
+_ENTRY_TAGS = frozenset({"item", "entry"})
+_EXCERPT_CHARS = 300
+_IMG_SRC_RE = re.compile(r"<img[^>]+src=[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+_sync_lock = asyncio.Lock()
+_scheduler: asyncio.Task | None = None
+
+
+class FeedTooLarge(Exception):
+    pass
+
+
+class FeedSnapshot(NamedTuple):
+    """What fetching a feed needs, read up front so no session is open during the request."""
+    id: int
+    url: str
+    etag: str | None
+    last_modified: str | None
+    last_entry_at: datetime | None
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def _local(tag: Any) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ""
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)  # RSS: RFC 822
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))  # Atom / dc:date: ISO 8601
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _plain_text(markup: str) -> str:
+    if "<" not in markup:
+        return " ".join(markup.split())
+    try:
+        return " ".join(lxml_html.fromstring(markup).text_content().split())
+    except (etree.ParserError, ValueError):
+        return " ".join(re.sub(r"<[^>]+>", " ", markup).split())
+
+
+def _excerpt(markup: str | None) -> str | None:
+    if not markup:
+        return None
+    text = _plain_text(markup)
+    if len(text) <= _EXCERPT_CHARS:
+        return text or None
+    return text[:_EXCERPT_CHARS].rsplit(" ", 1)[0].rstrip(",.;:") + "…"
+
+
+def normalize_entry_url(url: str) -> str:
+    """Drop tracking parameters so the same article always maps to one external_url."""
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and not (k == "source" and v.startswith("rss"))
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def _entry_link(entry: etree._Element) -> str | None:
+    guid = None
+    for child in entry:
+        name = _local(child.tag)
+        if name == "link":
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                return href
+            if not href and child.text and child.text.strip():
+                return child.text.strip()
+        elif name in ("guid", "id") and child.text and child.get("isPermaLink", "true") != "false":
+            guid = child.text.strip()
+    return guid if guid and guid.startswith(("http://", "https://")) else None
+
+
+def _entry_image(entry: etree._Element, html_body: str | None) -> str | None:
+    for child in entry:
+        name = _local(child.tag)
+        url = child.get("url")
+        if not url:
+            continue
+        if name == "thumbnail":
+            return url
+        if name in ("content", "enclosure") and (
+            child.get("medium") == "image" or (child.get("type") or "").startswith("image/")
+        ):
+            return url
+    if html_body:
+        match = _IMG_SRC_RE.search(html_body)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _parse_entry(entry: etree._Element, cutoff: datetime | None) -> dict[str, Any] | None:
+    published = updated = None
+    for child in entry:
+        name = _local(child.tag)
+        if name in ("pubDate", "published", "date", "issued"):
+            published = published or _parse_date(child.text)
+        elif name in ("updated", "modified"):
+            updated = _parse_date(child.text)
+    published = published or updated
+    if cutoff is not None and published is not None and published <= cutoff:
+        return None
+
+    link = _entry_link(entry)
+    if not link:
+        return None
+
+    title = summary = body = None
+    tags: list[str] = []
+    for child in entry:
+        name = _local(child.tag)
+        if name == "title":
+            title = _plain_text(child.text or "")
+        elif name in ("description", "summary"):
+            summary = child.text
+        elif name in ("encoded", "content") and child.get("url") is None:
+            body = child.text
+        elif name == "category":
+            term = child.get("term") or child.text
+            if term and term.strip():
+                tags.append(term.strip())
+
+    return {
+        "url": normalize_entry_url(link),
+        "title": (title or link)[:300],
+        "excerpt": _excerpt(summary or body),
+        "cover_image_url": _entry_image(entry, body or summary),
+        "tags": ", ".join(dict.fromkeys(tags)) or None,
+        "published_at": published,
+        "updated_at": updated or published,
+    }
+
+
+def parse_feed(content: bytes, cutoff: datetime | None = None) -> list[dict[str, Any]]:
+    """Entries newer than `cutoff` (all entries when None), in feed order."""
+    entries: list[dict[str, Any]] = []
+    parser = etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        resolve_entities=False,
+        no_network=True,
+        recover=True,
+    )
+    try:
+        for _event, element in parser:
+            if _local(element.tag) not in _ENTRY_TAGS:
+                continue
+            parsed = _parse_entry(element, cutoff)
+            if parsed is not None:
+                entries.append(parsed)
+            element.clear()
+    except etree.XMLSyntaxError as exc:
+        if not entries:
+            raise ValueError(f"Not a valid RSS/Atom feed: {exc}") from exc
+    root = parser.root
+    if root is None or _local(root.tag) not in _FEED_ROOTS:
+        raise ValueError("Not an RSS/Atom feed")
+    return entries
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+async def _fetch(client: httpx.AsyncClient, feed: FeedSnapshot) -> dict[str, Any]:
+    headers = {"Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8"}
+    if feed.etag:
+        headers["If-None-Match"] = str(feed.etag)
+    if feed.last_modified:
+        headers["If-Modified-Since"] = str(feed.last_modified)
+
+    try:
+        async with client.stream("GET", str(feed.url), headers=headers) as response:
+            if response.status_code != 200:
+                return {"http_status": response.status_code}
+            chunks: list[bytes] = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > settings.FEED_SYNC_MAX_BYTES:
+                    raise FeedTooLarge(f"Feed is larger than {settings.FEED_SYNC_MAX_BYTES} bytes")
+                chunks.append(chunk)
+        entries = await parse_pool.run(
+            parse_feed, b"".join(chunks), feed.last_entry_at,
+            timeout=float(settings.SCRAPER_PARSE_TIMEOUT),
+        )
+    except (httpx.HTTPError, FeedTooLarge, ValueError, TimeoutError) as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"[:500]}
+
+    return {
+        "http_status": 200,
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+        "entries": entries,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Upsert
+# ---------------------------------------------------------------------------
+
+def _allocate_slugs(db, titles: list[str]) -> list[str]:
+    bases = [slugify(title) or "post" for title in titles]
+    taken = {
+        slug for (slug,) in db.query(BlogPost.slug)
+        .filter(or_(*(BlogPost.slug.like(f"{base}%") for base in set(bases))))
+        .all()
+    }
+    slugs = []
+    for base in bases:
+        slug, n = base, 2
+        while slug in taken:
+            slug, n = f"{base}-{n}"[:100], n + 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def upsert_entries(db, feed: BlogFeed, entries: list[dict[str, Any]]) -> dict[str, int]:
+    """Insert new entries as external posts and refresh changed ones (no commit)."""
+    unique: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        unique.setdefault(entry["url"], entry)
+    if not unique:
+        return {"created": 0, "updated": 0, "unchanged": 0}
+
+    existing = {
+        post.external_url: post
+        for post in db.query(BlogPost).filter(BlogPost.external_url.in_(list(unique))).all()
+    }
+    new_entries = [e for url, e in unique.items() if url not in existing]
+    created = updated = 0
+
+    publish = feed.post_status == "published"
+    for entry, slug in zip(new_entries, _allocate_slugs(db, [e["title"] for e in new_entries])):
+        db.add(BlogPost(
+            title=entry["title"],
+            slug=slug,
+            excerpt=entry["excerpt"],
+            tags=entry["tags"],
+            cover_image_url=entry["cover_image_url"],
+            status=feed.post_status,
+            published_at=(entry["published_at"] or _utcnow()) if publish else None,
+            is_external=True,
+            external_url=entry["url"],
+            external_source=feed.source,
+        ))
+        created += 1
+
+    for url, post in existing.items():
+        entry = unique[url]
+        if entry["updated_at"] is None or (post.updated_at and entry["updated_at"] <= post.updated_at):
+            continue
+        for field in ("title", "excerpt", "cover_image_url"):
+            if entry[field]:
+                setattr(post, field, entry[field])
+        updated += 1
+
+    return {"created": created, "updated": updated, "unchanged": len(existing) - updated}
+
+
+def _apply(db, feed: BlogFeed, fetched: dict[str, Any]) -> dict[str, Any]:
+    result: dict[str, Any] = {"feed_id": feed.id, "url": feed.url, "http_status": fetched.get("http_status")}
+    setattr(feed, "last_polled_at", _utcnow())
+    setattr(feed, "last_status", fetched.get("http_status"))
+
+    if "error" in fetched or fetched.get("http_status") not in (200, 304):
+        error = fetched.get("error") or f"HTTP {fetched.get('http_status')}"
+        setattr(feed, "last_error", error)
+        db.commit()
+        return {**result, "status": "error", "error": error}
+
+    setattr(feed, "last_error", None)
+    if fetched["http_status"] == 304:
+        db.commit()
+        return {**result, "status": "not_modified"}
+
+    entries = fetched["entries"]
+    try:
+        counts = upsert_entries(db, feed, entries)
+        dates = [e["published_at"] for e in entries if e["published_at"]]
+        if dates:
+            setattr(feed, "last_entry_at", max([*dates, *([feed.last_entry_at] if feed.last_entry_at else [])]))
+        setattr(feed, "etag", fetched.get("etag"))
+        setattr(feed, "last_modified", fetched.get("last_modified"))
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.exception("Failed to store entries from feed %s", feed.url)
+        setattr(feed, "last_polled_at", _utcnow())
+        setattr(feed, "last_error", f"{type(exc).__name__}: {exc}"[:500])
+        db.commit()
+        return {**result, "status": "error", "error": feed.last_error}
+    return {**result, "status": "updated", **counts}
+
+
+# ---------------------------------------------------------------------------
+# Sync runs
+# ---------------------------------------------------------------------------
+
+def _load_snapshots(feed_ids: list[int] | None) -> list[FeedSnapshot]:
+    db = SessionLocal()
+    try:
+        query = db.query(BlogFeed.id, BlogFeed.url, BlogFeed.etag, BlogFeed.last_modified, BlogFeed.last_entry_at)
+        query = query.filter(BlogFeed.id.in_(feed_ids)) if feed_ids else query.filter(BlogFeed.is_active.is_(True))
+        return [FeedSnapshot(*row) for row in query.order_by(BlogFeed.id).all()]
+    finally:
+        db.close()
+
+
+def _apply_fetched(feed_id: int, fetched: dict[str, Any]) -> dict[str, Any] | None:
+    """Store one feed's fetch result in its own session; None if the feed was deleted meanwhile."""
+    db = SessionLocal()
+    try:
+        feed = db.get(BlogFeed, feed_id)
+        return _apply(db, feed, fetched) if feed is not None else None
+    finally:
+        db.close()
+
+
+async def sync_feeds(feed_ids: list[int] | None = None) -> list[dict[str, Any]]:
+    """Poll the given feeds (default: every active feed) and store new entries."""
+    async with _sync_lock:
+        # Only the HTTP fetches run on the event loop; reads, upserts and
+        # commits go through the threadpool, and no session is held while
+        # the feeds are downloaded and parsed.
+        snapshots = await run_in_threadpool(_load_snapshots, feed_ids)
+        if not snapshots:
+            return []
+
+        async with httpx.AsyncClient(
+            timeout=float(settings.FEED_SYNC_TIMEOUT),
+            follow_redirects=True,
+            headers={"User-Agent": SCRAPER_HEADERS["User-Agent"]},
+        ) as client:
+            fetched = await asyncio.gather(*(_fetch(client, feed) for feed in snapshots))
+
+        results = []
+        for snapshot, item in zip(snapshots, fetched):
+            result = await run_in_threadpool(_apply_fetched, snapshot.id, item)
+            if result is not None:
+                results.append(result)
+
+    logger.info("Feed sync finished: %s", [(r["feed_id"], r["status"]) for r in results])
+    return results
+
+
+async def _scheduled_syncs(interval_seconds: float) -> None:
+    await asyncio.sleep(30)
+    while True:
+        try:
+            await sync_feeds()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Scheduled feed sync failed")
+        await asyncio.sleep(interval_seconds)
+
+
+async def start_scheduler() -> None:
+    global _scheduler
+    if _scheduler is None and settings.FEED_SYNC_INTERVAL_MINUTES > 0:
+        _scheduler = asyncio.create_task(_scheduled_syncs(settings.FEED_SYNC_INTERVAL_MINUTES * 60))
+
+
+async def stop_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.cancel()
+        await asyncio.gather(_scheduler, return_exceptions=True)
+        _scheduler = None
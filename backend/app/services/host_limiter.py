@@ -0,0 +1,222 @@
+"""
+host_limiter.py
+---------------
+Per-host politeness and failure isolation for outbound scrapes.
+
+Every host the scraper talks to gets:
+
+  - a token bucket (SCRAPER_HOST_RATE requests/second, SCRAPER_HOST_BURST
+    burst) so repeated imports from one site are spaced out instead of
+    hammering it; a caller that would have to wait longer than
+    SCRAPER_HOST_MAX_WAIT is rejected with HostRateLimited;
+  - a circuit breaker that opens after SCRAPER_BREAKER_THRESHOLD consecutive
+    failures (timeouts, connection errors, access denied, 5xx).  While open,
+    acquire() returns False and the scraper skips the network entirely.
+    After SCRAPER_BREAKER_COOLDOWN seconds a single probe request is let
+    through (half-open); success closes the circuit, failure re-opens it
+    with the cooldown doubled (capped at 8x).
+
+State is in-process and kept for at most _MAX_HOSTS hosts (least recently
+used first out).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any
+from urllib.parse import urlparse
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_MAX_HOSTS = 1024
+_MAX_COOLDOWN_FACTOR = 8
+
+
+class HostRateLimited(Exception):
+    """Too many requests queued for one host; retry later."""
+
+    def __init__(self, host: str, wait: float) -> None:
+        super().__init__(f"Rate limit for {host} would require waiting {wait:.1f}s")
+        self.host = host
+        self.wait = wait
+
+
+@dataclass
+class HostState:
+    host: str
+    tokens: float
+    updated_at: float = field(default_factory=monotonic)
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    cooldown: float = 0.0
+    probe_in_flight: bool = False
+    last_error: str = ""
+    requests: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+    throttled_seconds: float = 0.0
+
+
+def host_key(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostLimiter:
+    def __init__(
+        self,
+        *,
+        rate: float,
+        burst: int,
+        max_wait: float,
+        failure_threshold: int,
+        cooldown: float,
+    ) -> None:
+        self.rate = max(rate, 0.001)
+        self.burst = max(1, burst)
+        self.max_wait = max_wait
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown = cooldown
+        self._hosts: OrderedDict[str, HostState] = OrderedDict()
+
+    def _state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(host=host, tokens=float(self.burst))
+            self._hosts[host] = state
+            if len(self._hosts) > _MAX_HOSTS:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    def _refresh(self, state: HostState, now: float) -> None:
+        state.tokens = min(self.burst, state.tokens + (now - state.updated_at) * self.rate)
+        state.updated_at = now
+        if state.state == OPEN and now - state.opened_at >= state.cooldown:
+            state.state = HALF_OPEN
+
+    async def acquire(self, host: str) -> bool:
+        """
+        Wait for a request slot to `host`.  Returns False without waiting if
+        the host's circuit is open (or a half-open probe is already running).
+        """
+        state = self._state(host)
+        now = monotonic()
+        self._refresh(state, now)
+
+        if state.state == OPEN or (state.state == HALF_OPEN and state.probe_in_flight):
+            state.short_circuited += 1
+            return False
+
+        # Reserve a token; a negative balance is the queue of waiters ahead.
+        wait = (1 - state.tokens) / self.rate if state.tokens < 1 else 0.0
+        if wait > self.max_wait:
+            raise HostRateLimited(host, wait)
+        state.tokens -= 1
+        state.requests += 1
+        probe = state.state == HALF_OPEN
+        if probe:
+            state.probe_in_flight = True
+        if wait > 0:
+            state.throttled_seconds += wait
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                # Cancelled while queued: hand back the reservation, or the
+                # half-open host would short-circuit every later request.
+                state.tokens += 1
+                state.requests -= 1
+                if probe:
+                    state.probe_in_flight = False
+                raise
+        return True
+
+    def record_success(self, host: str) -> None:
+        state = self._state(host)
+        if state.state != CLOSED:
+            logger.info("Circuit for %s closed again.", host)
+        state.state = CLOSED
+        state.consecutive_failures = 0
+        state.cooldown = 0.0
+        state.probe_in_flight = False
+
+    def record_failure(self, host: str, error: str) -> None:
+        state = self._state(host)
+        state.failures += 1
+        state.consecutive_failures += 1
+        state.last_error = error[:300]
+        was_probe = state.state == HALF_OPEN
+        state.probe_in_flight = False
+        if state.state == OPEN:
+            # A request that started before the circuit opened; keep the timer.
+            return
+
+        if was_probe or state.consecutive_failures >= self.failure_threshold:
+            state.cooldown = (
+                min(state.cooldown * 2, self.base_cooldown * _MAX_COOLDOWN_FACTOR)
+                if was_probe and state.cooldown
+                else self.base_cooldown
+            )
+            state.state = OPEN
+            state.opened_at = monotonic()
+            logger.warning(
+                "Circuit for %s opened for %.0fs after %d consecutive failures (%s).",
+                host, state.cooldown, state.consecutive_failures, state.last_error,
+            )
+
+    def release(self, host: str) -> None:
+        """Give back a half-open probe slot without recording an outcome."""
+        state = self._hosts.get(host)
+        if state is not None:
+            state.probe_in_flight = False
+
+    def reset(self, host: str) -> bool:
+        return self._hosts.pop(host, None) is not None
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Per-host breaker / bucket state for the admin API, open circuits first."""
+        now = monotonic()
+        wall_now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = []
+        for state in self._hosts.values():
+            self._refresh(state, now)
+            retry_at = None
+            if state.state == OPEN:
+                retry_at = wall_now + timedelta(seconds=state.cooldown - (now - state.opened_at))
+            rows.append({
+                "host": state.host,
+                "state": state.state,
+                "consecutive_failures": state.consecutive_failures,
+                "last_error": state.last_error or None,
+                "retry_at": retry_at,
+                "tokens": round(state.tokens, 2),
+                "requests": state.requests,
+                "failures": state.failures,
+                "short_circuited": state.short_circuited,
+                "throttled_seconds": round(state.throttled_seconds, 2),
+            })
+        order = {OPEN: 0, HALF_OPEN: 1, CLOSED: 2}
+        rows.sort(key=lambda r: (order[r["state"]], -r["failures"], r["host"]))
+        return rows
+
+
+host_limiter = HostLimiter(
+    rate=settings.SCRAPER_HOST_RATE,
+    burst=settings.SCRAPER_HOST_BURST,
+    max_wait=float(settings.SCRAPER_HOST_MAX_WAIT),
+    failure_threshold=settings.SCRAPER_BREAKER_THRESHOLD,
+    cooldown=float(settings.SCRAPER_BREAKER_COOLDOWN),
+)
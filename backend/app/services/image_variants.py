@@ -0,0 +1,171 @@
+"""
+image_variants.py
+-----------------
+Responsive derivatives and blur-up placeholders for uploaded images.
+
+The public site used to download full-size originals for thumbnails, story
+tiles and logos.  At upload time we now generate:
+
+  - one variant per MEDIA_VARIANT_WIDTHS entry narrower than the original,
+    in every MEDIA_VARIANT_FORMATS format (WebP / AVIF), never upscaled;
+  - a ~16px WebP placeholder as a base64 data URI (LQIP) that pages can
+    inline and blur while the real image loads;
+  - when MEDIA_PERCEPTUAL_HASH is on, the image's perceptual hash
+    (services/media_hashes.py) for the near-duplicate report.
+
+Decoding and re-encoding is CPU-bound and holds the GIL, so it runs on a
+bounded process pool (`variant_pool`).  Variant files are written under
+MEDIA_ROOT/variants/<key>/ and served from MEDIA_PUBLIC_URL; the asset keeps
+the list in `MediaAsset.variants` and the data URI in `placeholder`.
+
+Formats the local Pillow build cannot encode (AVIF on older wheels) are
+skipped; a failure never fails the upload, the asset just has no variants.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import logging
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image, ImageOps, features as pil_features
+
+from ..core.config import settings
+from ..utils.srcset import build_srcset  # noqa: F401 - re-exported for callers of this module
+from .media_hashes import dhash
+from .worker_pool import WorkerPool, WorkerPoolTimeout
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_SIZE = 16
+_CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+variant_pool = WorkerPool(
+    "image-variants",
+    max_workers=settings.MEDIA_VARIANT_WORKERS,
+    max_queue=settings.MEDIA_VARIANT_QUEUE,
+    processes=True,
+)
+
+
+# ---------------------------------------------------------------------------
+# Worker-side (runs in the process pool)
+# ---------------------------------------------------------------------------
+
+def _supported_formats(formats: list[str]) -> list[str]:
+    return [fmt for fmt in formats if fmt in _CONTENT_TYPES and pil_features.check(fmt)]
+
+
+def build_derivatives(
+    path: str, widths: list[int], formats: list[str], quality: int, perceptual_hash: bool = False
+) -> dict[str, Any]:
+    """Decode the image at `path` once and encode every variant plus the placeholder."""
+    with Image.open(path) as source:
+        animated = getattr(source, "is_animated", False)
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        width, height = image.size
+
+        variants: list[dict[str, Any]] = []
+        # Animated GIF/WebP would lose their animation; keep the original only.
+        targets = [] if animated else sorted({w for w in widths if 0 < w < width})
+        for target in targets:
+            resized = image.resize((target, max(1, round(height * target / width))), Image.Resampling.LANCZOS)
+            for fmt in _supported_formats(formats):
+                buffer = io.BytesIO()
+                resized.save(buffer, format=fmt.upper(), quality=quality)
+                variants.append({
+                    "width": resized.width,
+                    "height": resized.height,
+                    "format": fmt,
+                    "data": buffer.getvalue(),
+                })
+
+        tiny = image.copy()
+        tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        buffer = io.BytesIO()
+        tiny.save(buffer, format="WEBP", quality=30)
+        placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+        phash = dhash(image) if perceptual_hash else None
+
+    return {"width": width, "height": height, "variants": variants, "placeholder": placeholder, "phash": phash}
+
+
+# ---------------------------------------------------------------------------
+# Server-side
+# ---------------------------------------------------------------------------
+
+def _variants_dir(key: str) -> Path:
+    return Path(settings.MEDIA_ROOT) / "variants" / key
+
+
+def _write_variants(key: str, variants: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    directory = _variants_dir(key)
+    directory.mkdir(parents=True, exist_ok=True)
+    stored = []
+    for variant in variants:
+        name = f"{variant['width']}.{variant['format']}"
+        (directory / name).write_bytes(variant["data"])
+        stored.append({
+            "url": f"{settings.MEDIA_PUBLIC_URL.rstrip('/')}/variants/{key}/{name}",
+            "width": variant["width"],
+            "height": variant["height"],
+            "format": variant["format"],
+            "bytes": len(variant["data"]),
+        })
+    return stored
+
+
+async def generate_variants(path: str) -> dict[str, Any] | None:
+    """
+    Build and store the variants for the image file at `path` (the worker
+    opens it, so only the path crosses the process boundary).  Returns {"variants": [...],
+    "placeholder": "data:...", "phash": "..." | None} or None when the image could not be
+    processed — callers keep the upload either way.
+    """
+    try:
+        result = await variant_pool.run(
+            build_derivatives,
+            path,
+            list(settings.MEDIA_VARIANT_WIDTHS),
+            list(settings.MEDIA_VARIANT_FORMATS),
+            settings.MEDIA_VARIANT_QUALITY,
+            settings.MEDIA_PERCEPTUAL_HASH,
+            timeout=float(settings.MEDIA_VARIANT_TIMEOUT),
+        )
+    except WorkerPoolTimeout:
+        logger.warning("Image variant generation timed out")
+        return None
+    except Exception:  # noqa: BLE001 - a bad image must not fail the upload
+        logger.exception("Image variant generation failed")
+        return None
+
+    stored = await run_in_threadpool(_write_variants, uuid.uuid4().hex, result["variants"])
+    return {"variants": stored, "placeholder": result["placeholder"], "phash": result["phash"]}
+
+
+def apply_variants(asset: Any, generated: dict[str, Any] | None) -> None:
+    if generated:
+        setattr(asset, "variants", json.dumps(generated["variants"]) if generated["variants"] else None)
+        setattr(asset, "placeholder", generated["placeholder"])
+        setattr(asset, "perceptual_hash", generated["phash"])
+
+
+def delete_variants(variants_json: str | None) -> None:
+    """Remove the variant files of a deleted asset."""
+    if not variants_json:
+        return
+    prefix = f"{settings.MEDIA_PUBLIC_URL.rstrip('/')}/variants/"
+    keys = {
+        variant["url"][len(prefix):].split("/", 1)[0]
+        for variant in json.loads(variants_json)
+        if variant.get("url", "").startswith(prefix)
+    }
+    for key in keys:
+        shutil.rmtree(_variants_dir(key), ignore_errors=True)
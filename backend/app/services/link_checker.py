@@ -0,0 +1,390 @@
+"""
+link_checker.py
+---------------
+Background health checks for external URLs stored in the content tables.
+
+A sweep collects every http(s) URL from CHECKED_COLUMNS (publication links,
+live / GitHub links, cover images, logos, ...), probes each distinct URL
+once and upserts the outcome into `link_checks`:
+
+  - one pooled httpx client (keep-alive) shared by the whole sweep;
+  - at most LINK_CHECK_CONCURRENCY probes in flight overall and
+    LINK_CHECK_PER_HOST per host, so a page of Cloudinary images does not
+    turn into a burst against one CDN;
+  - HEAD first, with If-None-Match / If-Modified-Since from the previous
+    result; servers that reject HEAD get a GET whose body is never read;
+  - images must answer with an image/* content type.
+
+Statuses: ok, redirected (works, but via redirects — worth updating),
+blocked (401/403/429/999 — the host refuses automated checks, the link may
+well be fine), broken (404/410, other 4xx, not an image) and unreachable
+(5xx, timeouts, DNS / connection errors).
+
+Sweeps run every LINK_CHECK_INTERVAL_HOURS (0 disables the schedule) and can
+be triggered from the admin API; only one sweep runs at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, NamedTuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.models import (
+    Award,
+    BlogPost,
+    Certificate,
+    Client,
+    Education,
+    Experience,
+    LinkCheck,
+    PressMention,
+    Profile,
+    Project,
+    ProjectImage,
+    SeoSettings,
+    SiteSettings,
+    Skill,
+    Story,
+    Testimonial,
+)
+from .host_limiter import host_key
+from .scraper_service import SCRAPER_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# (model, column, kind) — kind "image" additionally requires an image/* response.
+CHECKED_COLUMNS: list[tuple[Any, str, str]] = [
+    (Project, "github_url", "link"),
+    (Project, "live_url", "link"),
+    (Project, "case_study_url", "link"),
+    (Project, "image_url", "image"),
+    (Project, "thumbnail_url", "image"),
+    (Project, "ui_image_url", "image"),
+    (ProjectImage, "url", "image"),
+    (Experience, "company_logo_url", "image"),
+    (Education, "institution_logo_url", "image"),
+    (Education, "institution_background_url", "image"),
+    (Skill, "icon_url", "image"),
+    (Award, "credential_url", "link"),
+    (Award, "image_url", "image"),
+    (Certificate, "credential_url", "link"),
+    (Certificate, "image_url", "image"),
+    (BlogPost, "external_url", "link"),
+    (BlogPost, "cover_image_url", "image"),
+    (BlogPost, "og_image_url", "image"),
+    (Profile, "avatar_url", "image"),
+    (Profile, "resume_url", "link"),
+    (Testimonial, "avatar_url", "image"),
+    (Client, "logo_url", "image"),
+    (Client, "website_url", "link"),
+    (Story, "image_url", "image"),
+    (Story, "thumbnail_url", "image"),
+    (PressMention, "publication_url", "link"),
+    (PressMention, "image_url", "image"),
+    (SeoSettings, "og_image_url", "image"),
+    (SiteSettings, "github_url", "link"),
+    (SiteSettings, "linkedin_url", "link"),
+    (SiteSettings, "twitter_url", "link"),
+    (SiteSettings, "instagram_url", "link"),
+]
+
+STATUSES = ("ok", "redirected", "blocked", "broken", "unreachable")
+FAILING_STATUSES = ("broken", "unreachable")
+
+# Answers that mean "we don't serve bots", not "this page is gone".
+_BLOCKED_CODES = frozenset({401, 403, 429, 999})
+# HEAD answers that are worth double-checking with a GET.
+_RETRY_WITH_GET = frozenset({400, 403, 404, 405, 406, 501})
+
+
+class PreviousCheck(NamedTuple):
+    """What a probe needs from a URL's last stored result (no ORM row, no session)."""
+    status: str
+    etag: str | None
+    last_modified: str | None
+    final_url: str | None
+
+
+_sweep_lock = asyncio.Lock()
+_scheduler: asyncio.Task | None = None
+_manual_sweep: asyncio.Task | None = None
+_last_sweep: dict[str, Any] | None = None
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ---------------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------------
+
+def collect_targets(db) -> dict[str, dict[str, Any]]:
+    """Map every distinct stored URL to its kind and the rows referencing it."""
+    targets: dict[str, dict[str, Any]] = {}
+    for model, column_name, kind in CHECKED_COLUMNS:
+        column = getattr(model, column_name)
+        rows = db.query(model.id, column).filter(column.isnot(None), column != "").all()
+        for row_id, value in rows:
+            url = str(value).strip()
+            if not url.startswith(("http://", "https://")):
+                continue
+            target = targets.setdefault(url, {"kind": kind, "sources": []})
+            if kind == "image":
+                target["kind"] = "image"
+            target["sources"].append({"table": model.__tablename__, "column": column_name, "id": row_id})
+    return targets
+
+
+# ---------------------------------------------------------------------------
+# Probing
+# ---------------------------------------------------------------------------
+
+def _classify(response: httpx.Response, kind: str) -> tuple[str, str | None]:
+    code = response.status_code
+    if code == 304:
+        return "ok", None
+    if code in _BLOCKED_CODES:
+        return "blocked", f"HTTP {code}"
+    if code >= 500:
+        return "unreachable", f"HTTP {code}"
+    if code >= 400:
+        return "broken", f"HTTP {code}"
+    if kind == "image":
+        content_type = response.headers.get("content-type", "")
+        if content_type and not content_type.lower().startswith("image/"):
+            return "broken", f"Not an image ({content_type.split(';')[0]})"
+    if response.history:
+        return "redirected", None
+    return "ok", None
+
+
+async def _probe(client: httpx.AsyncClient, url: str, kind: str, previous: PreviousCheck | None) -> dict[str, Any]:
+    headers: dict[str, str] = {}
+    if previous is not None and previous.status in ("ok", "redirected"):
+        if previous.etag:
+            headers["If-None-Match"] = str(previous.etag)
+        if previous.last_modified:
+            headers["If-Modified-Since"] = str(previous.last_modified)
+
+    started = monotonic()
+    try:
+        response = await client.head(url, headers=headers)
+        if response.status_code in _RETRY_WITH_GET:
+            # Plenty of servers mishandle HEAD; confirm without downloading the body.
+            async with client.stream("GET", url, headers=headers) as response:
+                pass
+    except httpx.TimeoutException:
+        return {"status": "unreachable", "error": "Timed out", "http_status": None}
+    except httpx.HTTPError as exc:
+        return {"status": "unreachable", "error": f"{type(exc).__name__}: {exc}"[:500], "http_status": None}
+
+    status, error = _classify(response, kind)
+    result: dict[str, Any] = {
+        "status": status,
+        "error": error,
+        "http_status": response.status_code,
+        "final_url": str(response.url) if response.history else None,
+        "response_ms": int((monotonic() - started) * 1000),
+    }
+    if response.status_code == 304 and previous is not None:
+        result["etag"], result["last_modified"] = previous.etag, previous.last_modified
+        result["final_url"] = previous.final_url
+        if previous.status == "redirected":
+            result["status"] = "redirected"
+    else:
+        result["etag"] = response.headers.get("etag")
+        result["last_modified"] = response.headers.get("last-modified")
+    return result
+
+
+async def check_urls(
+    targets: dict[str, dict[str, Any]],
+    previous: dict[str, PreviousCheck],
+) -> dict[str, dict[str, Any]]:
+    """Probe every target URL under the global and per-host concurrency caps."""
+    overall = asyncio.Semaphore(max(1, settings.LINK_CHECK_CONCURRENCY))
+    per_host: defaultdict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(max(1, settings.LINK_CHECK_PER_HOST))
+    )
+    limits = httpx.Limits(
+        max_connections=settings.LINK_CHECK_CONCURRENCY,
+        max_keepalive_connections=settings.LINK_CHECK_CONCURRENCY,
+    )
+
+    async with httpx.AsyncClient(
+        timeout=float(settings.LINK_CHECK_TIMEOUT),
+        follow_redirects=True,
+        headers={"User-Agent": SCRAPER_HEADERS["User-Agent"], "Accept": "*/*"},
+        limits=limits,
+    ) as client:
+        async def _one(url: str, kind: str) -> tuple[str, dict[str, Any]]:
+            # Host slot first, so a crowded host never holds a global slot while it waits.
+            async with per_host[host_key(url)], overall:
+                return url, await _probe(client, url, kind, previous.get(url))
+
+        results = await asyncio.gather(*(_one(url, t["kind"]) for url, t in targets.items()))
+    return dict(results)
+
+
+# ---------------------------------------------------------------------------
+# Sweeps
+# ---------------------------------------------------------------------------
+
+def _load_previous(db) -> dict[str, PreviousCheck]:
+    return {
+        row.url: PreviousCheck(row.status, row.etag, row.last_modified, row.final_url)
+        for row in db.query(
+            LinkCheck.url, LinkCheck.status, LinkCheck.etag, LinkCheck.last_modified, LinkCheck.final_url
+        )
+    }
+
+
+def _load_sweep_inputs() -> tuple[dict[str, dict[str, Any]], dict[str, PreviousCheck]]:
+    db = SessionLocal()
+    try:
+        return collect_targets(db), _load_previous(db)
+    finally:
+        db.close()
+
+
+def _store_results(targets: dict[str, dict[str, Any]], results: dict[str, dict[str, Any]]) -> int:
+    now = _utcnow()
+    db = SessionLocal()
+    try:
+        existing = {row.url: row for row in db.query(LinkCheck).all()}
+        for url, result in results.items():
+            row = existing.get(url)
+            if row is None:
+                row = LinkCheck(url=url, consecutive_failures=0)
+                db.add(row)
+            failing = result["status"] in FAILING_STATUSES
+            setattr(row, "kind", targets[url]["kind"])
+            setattr(row, "sources", json.dumps(targets[url]["sources"]))
+            setattr(row, "checked_at", now)
+            setattr(row, "consecutive_failures", (row.consecutive_failures or 0) + 1 if failing else 0)
+            setattr(row, "first_failed_at", (row.first_failed_at or now) if failing else None)
+            for field in ("status", "error", "http_status", "final_url", "response_ms", "etag", "last_modified"):
+                setattr(row, field, result.get(field))
+
+        stale = [row for url, row in existing.items() if url not in targets]
+        for row in stale:
+            db.delete(row)
+        db.commit()
+        return len(stale)
+    finally:
+        db.close()
+
+
+async def run_sweep() -> dict[str, Any]:
+    """Check every stored URL once; returns the sweep summary (also kept for the admin API)."""
+    global _last_sweep
+    async with _sweep_lock:
+        started_at = _utcnow()
+        started = monotonic()
+        # The DB work runs in the threadpool, in sessions closed before and
+        # opened after probing: a sweep can take minutes, and must neither
+        # stall the event loop nor hold a transaction open meanwhile.
+        targets, previous = await run_in_threadpool(_load_sweep_inputs)
+        results = await check_urls(targets, previous)
+        removed = await run_in_threadpool(_store_results, targets, results)
+
+        counts = {status: 0 for status in STATUSES}
+        for result in results.values():
+            counts[result["status"]] += 1
+        _last_sweep = {
+            "started_at": started_at,
+            "duration_seconds": round(monotonic() - started, 2),
+            "checked": len(results),
+            "removed": removed,
+            "by_status": counts,
+        }
+        logger.info("Link check sweep finished: %s", _last_sweep)
+        return _last_sweep
+
+
+def is_sweep_running() -> bool:
+    return _sweep_lock.locked() or (_manual_sweep is not None and not _manual_sweep.done())
+
+
+def trigger_sweep() -> bool:
+    """Start a sweep in the background; False if one is already running."""
+    global _manual_sweep
+    if is_sweep_running():
+        return False
+    _manual_sweep = asyncio.create_task(run_sweep())
+    _manual_sweep.add_done_callback(_log_manual_failure)
+    return True
+
+
+def _log_manual_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Link check sweep failed", exc_info=task.exception())
+
+
+def summary(db, broken_limit: int = 50) -> dict[str, Any]:
+    """Counts by status / kind plus the longest-failing URLs, for the admin dashboard."""
+    by_status = {status: 0 for status in STATUSES}
+    by_kind: dict[str, dict[str, int]] = {}
+    for status, kind, count in (
+        db.query(LinkCheck.status, LinkCheck.kind, func.count(LinkCheck.id))
+        .group_by(LinkCheck.status, LinkCheck.kind)
+        .all()
+    ):
+        by_status[status] = by_status.get(status, 0) + count
+        by_kind.setdefault(kind, {})[status] = count
+
+    failing = (
+        db.query(LinkCheck)
+        .filter(LinkCheck.status.in_(FAILING_STATUSES))
+        .order_by(LinkCheck.first_failed_at.asc(), LinkCheck.url)
+        .limit(broken_limit)
+        .all()
+    )
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_kind": by_kind,
+        "failing": failing,
+        "sweep_running": is_sweep_running(),
+        "last_sweep": _last_sweep,
+    }
+
+
+async def _scheduled_sweeps(interval_seconds: float) -> None:
+    # Let startup settle before the first sweep.
+    await asyncio.sleep(60)
+    while True:
+        try:
+            await run_sweep()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Scheduled link check sweep failed")
+        await asyncio.sleep(interval_seconds)
+
+
+async def start_scheduler() -> None:
+    global _scheduler
+    if _scheduler is None and settings.LINK_CHECK_INTERVAL_HOURS > 0:
+        _scheduler = asyncio.create_task(_scheduled_sweeps(settings.LINK_CHECK_INTERVAL_HOURS * 3600))
+
+
+async def stop_scheduler() -> None:
+    global _scheduler, _manual_sweep
+    for task in (_scheduler, _manual_sweep):
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    _scheduler = _manual_sweep = None
@@ -0,0 +1,307 @@
+"""
+llm_client.py
+-------------
+Shared, lifespan-managed wrapper around the Z.AI (OpenAI-compatible) client.
+
+One AsyncOpenAI instance — and therefore one pooled HTTP connection set —
+is reused by every caller instead of being rebuilt per request.  On top of
+it the wrapper adds:
+
+  - a semaphore capping concurrent completions (ZAI_MAX_CONCURRENCY);
+  - retries with jittered exponential backoff on 429, 5xx, connection
+    errors and timeouts (ZAI_MAX_RETRIES), honouring Retry-After;
+  - a per-call deadline covering queueing, every attempt and every backoff
+    sleep (defaults to ZAI_SCRAPER_TIMEOUT);
+  - token-usage and outcome counters exposed via stats().
+
+stream_chat() is the streaming counterpart of chat(): it yields content
+deltas and only retries while the stream is being opened.
+
+The SDK's own retry loop is disabled so attempts are counted and bounded
+in one place.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from time import monotonic
+from typing import Any, AsyncIterator
+
+import openai
+from openai import AsyncOpenAI
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,  # includes APITimeoutError
+)
+
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_MAX_SECONDS = 8.0
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The call could not complete before its deadline."""
+
+
+class LLMClient:
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        base_url: str,
+        model: str,
+        max_concurrency: int,
+        max_retries: int,
+        timeout: float,
+    ) -> None:
+        self.model = model
+        self.max_retries = max(0, max_retries)
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        self._in_flight = 0
+        self._calls = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._deadline_exceeded = 0
+        self._prompt_tokens = 0
+        self._completion_tokens = 0
+        self._latency_seconds = 0.0
+
+    @staticmethod
+    def _retry_after(exc: Exception) -> float | None:
+        response = getattr(exc, "response", None)
+        header = response.headers.get("retry-after") if response is not None else None
+        try:
+            return float(header) if header else None
+        except ValueError:
+            return None
+
+    def _backoff(self, attempt: int, exc: Exception) -> float:
+        hinted = self._retry_after(exc)
+        if hinted is not None:
+            return min(hinted, _BACKOFF_MAX_SECONDS)
+        # "Full jitter": uniform over [0, base * 2^attempt].
+        return random.uniform(0, min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+    def _record_usage(self, completion: Any) -> None:
+        usage = getattr(completion, "usage", None)
+        if usage is None:
+            return
+        self._prompt_tokens += int(getattr(usage, "prompt_tokens", 0) or 0)
+        self._completion_tokens += int(getattr(usage, "completion_tokens", 0) or 0)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        deadline: float | None = None,
+        **params: Any,
+    ) -> Any:
+        """
+        Create a chat completion.  `deadline` is a budget in seconds for the
+        whole call (defaults to the client timeout); extra keyword arguments
+        are passed to `chat.completions.create`.
+        """
+        budget = self.timeout if deadline is None else deadline
+        model = params.pop("model", self.model)
+        expires_at = monotonic() + budget
+        self._calls += 1
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=budget)
+        except asyncio.TimeoutError:
+            self._deadline_exceeded += 1
+            self._failed += 1
+            raise LLMDeadlineExceeded(f"No LLM slot free within {budget:.1f}s") from None
+
+        self._in_flight += 1
+        started = monotonic()
+        try:
+            attempt = 0
+            while True:
+                remaining = expires_at - monotonic()
+                if remaining <= 0:
+                    self._deadline_exceeded += 1
+                    raise LLMDeadlineExceeded(f"LLM call exceeded its {budget:.1f}s deadline")
+                try:
+                    completion = await self._client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        timeout=remaining,
+                        **params,
+                    )
+                except _RETRYABLE_ERRORS as exc:
+                    if isinstance(exc, openai.RateLimitError):
+                        self._rate_limited += 1
+                    delay = self._backoff(attempt, exc)
+                    if monotonic() + delay >= expires_at:
+                        if isinstance(exc, openai.APITimeoutError):
+                            self._deadline_exceeded += 1
+                            raise LLMDeadlineExceeded(f"LLM call exceeded its {budget:.1f}s deadline") from exc
+                        raise
+                    if attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    self._retries += 1
+                    logger.warning(
+                        "LLM call failed (%s); retry %d/%d in %.2fs",
+                        type(exc).__name__, attempt, self.max_retries, delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                self._record_usage(completion)
+                self._succeeded += 1
+                return completion
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._latency_seconds += monotonic() - started
+            self._in_flight -= 1
+            self._slots.release()
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        deadline: float | None = None,
+        **params: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+
+        Opening the stream is retried like chat(); once the first delta has
+        been yielded a failure is raised to the caller, since the partial
+        output has already been consumed.  The slot is held until the
+        generator is exhausted or closed.
+        """
+        budget = self.timeout if deadline is None else deadline
+        model = params.pop("model", self.model)
+        expires_at = monotonic() + budget
+        self._calls += 1
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=budget)
+        except asyncio.TimeoutError:
+            self._deadline_exceeded += 1
+            self._failed += 1
+            raise LLMDeadlineExceeded(f"No LLM slot free within {budget:.1f}s") from None
+
+        self._in_flight += 1
+        started = monotonic()
+        stream = None
+        try:
+            attempt = 0
+            while True:
+                remaining = expires_at - monotonic()
+                if remaining <= 0:
+                    self._deadline_exceeded += 1
+                    raise LLMDeadlineExceeded(f"LLM call exceeded its {budget:.1f}s deadline")
+                try:
+                    stream = await self._client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        stream=True,
+                        timeout=remaining,
+                        **params,
+                    )
+                    break
+                except _RETRYABLE_ERRORS as exc:
+                    if isinstance(exc, openai.RateLimitError):
+                        self._rate_limited += 1
+                    delay = self._backoff(attempt, exc)
+                    if attempt >= self.max_retries or monotonic() + delay >= expires_at:
+                        raise
+                    attempt += 1
+                    self._retries += 1
+                    logger.warning(
+                        "LLM stream failed to open (%s); retry %d/%d in %.2fs",
+                        type(exc).__name__, attempt, self.max_retries, delay,
+                    )
+                    await asyncio.sleep(delay)
+
+            async for chunk in stream:
+                if monotonic() >= expires_at:
+                    self._deadline_exceeded += 1
+                    raise LLMDeadlineExceeded(f"LLM stream exceeded its {budget:.1f}s deadline")
+                self._record_usage(chunk)
+                for choice in chunk.choices or ():
+                    delta = getattr(choice.delta, "content", None)
+                    if delta:
+                        yield delta
+            self._succeeded += 1
+        except GeneratorExit:
+            # The caller stopped reading (e.g. it already has everything it
+            # needs); that is not a failed call.
+            self._succeeded += 1
+            raise
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            if stream is not None:
+                await stream.close()
+            self._latency_seconds += monotonic() - started
+            self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        finished = self._succeeded + self._failed
+        return {
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "calls": self._calls,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "retries": self._retries,
+            "rate_limited": self._rate_limited,
+            "deadline_exceeded": self._deadline_exceeded,
+            "prompt_tokens": self._prompt_tokens,
+            "completion_tokens": self._completion_tokens,
+            "total_tokens": self._prompt_tokens + self._completion_tokens,
+            "avg_latency_seconds": round(self._latency_seconds / finished, 3) if finished else None,
+        }
+
+    async def aclose(self) -> None:
+        await self._client.close()
+
+
+_client: LLMClient | None = None
+
+
+def get_llm_client() -> LLMClient | None:
+    """Return the shared client, creating it on first use; None if ZAI_API_KEY is unset."""
+    global _client
+    if not settings.ZAI_API_KEY:
+        return None
+    if _client is None:
+        _client = LLMClient(
+            api_key=settings.ZAI_API_KEY,
+            base_url=settings.ZAI_BASE_URL,
+            model=settings.ZAI_MODEL,
+            max_concurrency=settings.ZAI_MAX_CONCURRENCY,
+            max_retries=settings.ZAI_MAX_RETRIES,
+            timeout=float(settings.ZAI_SCRAPER_TIMEOUT),
+        )
+    return _client
+
+
+async def close_llm_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,102 @@
+"""
+media_hashes.py
+---------------
+Content hashes used to spot duplicate media uploads.
+
+  - content hash: SHA-256 of the uploaded bytes.  Equal hashes are the same
+    file; the upload endpoints return the existing MediaAsset instead of
+    storing it again.
+  - perceptual hash: 64-bit difference hash (dHash) of the decoded image,
+    computed next to the responsive variants.  Re-exports, resized or
+    recompressed copies of one picture land a few bits apart, which the
+    admin near-duplicate report groups together.
+
+Grouping uses the pigeonhole trick instead of comparing every pair: split
+the 64 bits into max_distance + 1 bands; two hashes within max_distance bits
+of each other agree exactly on at least one band, so only assets sharing a
+band value are compared.
+
+Flat images (solid colours, blank placeholders) have no gradients, so their
+dHash is all zeros or all ones whatever the colour; those hashes are left
+out of near-duplicate grouping.  Byte-identical copies still share a
+content hash.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from PIL import Image
+
+HASH_BITS = 64
+# dHash of an image with no horizontal gradients: says nothing about its content.
+_FLAT_HASHES = frozenset({0, (1 << HASH_BITS) - 1})
+
+
+def dhash(image: Image.Image) -> str:
+    """16-hex-digit difference hash of a PIL image (any mode)."""
+    small = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left < right)
+    return f"{value:016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+def _bands(max_distance: int) -> list[tuple[int, int]]:
+    count = max_distance + 1
+    bounds = [round(i * HASH_BITS / count) for i in range(count + 1)]
+    return [(bounds[i], bounds[i + 1] - bounds[i]) for i in range(count) if bounds[i + 1] > bounds[i]]
+
+
+def near_duplicate_groups(
+    hashes: Iterable[tuple[int, str]], max_distance: int
+) -> list[tuple[list[int], int]]:
+    """
+    Group ids whose perceptual hashes are within `max_distance` bits (linked
+    transitively).  Returns [(ids, widest pairwise distance seen), ...] for
+    groups of two or more, largest first.  Flat-image hashes are skipped.
+    """
+    items = [(item_id, int(value, 16)) for item_id, value in hashes]
+    items = [(item_id, value) for item_id, value in items if value not in _FLAT_HASHES]
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    widest: dict[int, int] = {}
+    compared: set[tuple[int, int]] = set()
+    for offset, width in _bands(max_distance):
+        mask = (1 << width) - 1
+        buckets: dict[int, list[int]] = {}
+        for index, (_, value) in enumerate(items):
+            buckets.setdefault((value >> offset) & mask, []).append(index)
+        for members in buckets.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if (a, b) in compared:
+                        continue
+                    compared.add((a, b))
+                    distance = (items[a][1] ^ items[b][1]).bit_count()
+                    if distance <= max_distance:
+                        root_a, root_b = find(a), find(b)
+                        root = min(root_a, root_b)
+                        parent[max(root_a, root_b)] = root
+                        widest[root] = max(widest.get(root_a, 0), widest.get(root_b, 0), distance)
+
+    groups: dict[int, list[int]] = {}
+    for index, (item_id, _) in enumerate(items):
+        groups.setdefault(find(index), []).append(item_id)
+    result = [(sorted(ids), widest.get(root, 0)) for root, ids in groups.items() if len(ids) > 1]
+    result.sort(key=lambda group: (-len(group[0]), group[0][0]))
+    return result
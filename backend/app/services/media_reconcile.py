@@ -0,0 +1,200 @@
+"""
+media_reconcile.py
+------------------
+Reconcile media_assets with what is actually stored in Cloudinary.
+
+The two drift apart: a failed remote delete leaves an *orphan* (a resource
+no row points at), and an upload made in the Cloudinary console, or a row
+whose remote was removed there, leaves *missing* rows (a row whose
+public_id no longer exists).  `reconcile_inventory()` lists the remote
+inventory with the Admin API's bulk listing (500 resources per call, paged
+with next_cursor), loads the local public_ids in one query, and diffs the
+two as sets.
+
+Anything created in the last `grace_minutes` is left out of the report: a
+direct upload exists in Cloudinary before its completion call inserts the
+row, and must not be mistaken for an orphan.
+
+The report is a dry run unless fixes are asked for:
+
+  - orphans="delete"  removes orphans from Cloudinary (delete_resources, 100 per call),
+                      except those whose URL content still references;
+  - orphans="import"  creates MediaAsset rows for them;
+  - remove_missing    deletes missing rows, except those content still references.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.models import MediaAsset
+from .cloudinary_service import delete_images, list_resources
+from .image_variants import delete_variants
+from .media_tags import sync_asset_tags
+from .media_usage import urls_in_use, usages_for_assets
+
+logger = logging.getLogger(__name__)
+
+ORPHAN_ACTIONS = ("delete", "import")
+
+
+def _parse_created_at(value: Any) -> Optional[datetime]:
+    """Cloudinary's "2026-01-01T00:00:00Z" as a naive UTC datetime (the DB's convention)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _recent(created_at: Optional[datetime], cutoff: datetime) -> bool:
+    return created_at is not None and created_at > cutoff
+
+
+def diff_inventory(
+    remote: Iterable[dict[str, Any]],
+    local: Iterable[tuple[int, str, Optional[datetime]]],
+    *,
+    cutoff: datetime,
+) -> dict[str, Any]:
+    """
+    Set difference of remote resources and local (asset id, public_id,
+    created_at) rows.  Returns {"orphans": [resource, ...], "missing":
+    {public_id: [asset id, ...]}, "recent": n} with entries newer than
+    `cutoff` counted in "recent" instead.
+    """
+    remote_by_id = {resource["public_id"]: resource for resource in remote}
+    local_by_id: dict[str, list[tuple[int, Optional[datetime]]]] = {}
+    for asset_id, public_id, created_at in local:
+        local_by_id.setdefault(public_id, []).append((asset_id, created_at))
+
+    orphans: list[dict[str, Any]] = []
+    missing: dict[str, list[int]] = {}
+    recent = 0
+    for public_id in sorted(remote_by_id.keys() - local_by_id.keys()):
+        resource = remote_by_id[public_id]
+        if _recent(_parse_created_at(resource.get("created_at")), cutoff):
+            recent += 1
+        else:
+            orphans.append(resource)
+    for public_id in sorted(local_by_id.keys() - remote_by_id.keys()):
+        rows = local_by_id[public_id]
+        if any(_recent(created_at, cutoff) for _, created_at in rows):
+            recent += 1
+        else:
+            missing[public_id] = sorted(asset_id for asset_id, _ in rows)
+    return {"orphans": orphans, "missing": missing, "recent": recent}
+
+
+def _resource_urls(resource: dict[str, Any]) -> list[str]:
+    return [url for url in (resource.get("secure_url"), resource.get("url")) if url]
+
+
+def _asset_from_resource(resource: dict[str, Any]) -> MediaAsset:
+    public_id = resource["public_id"]
+    tags = resource.get("tags") or []
+    return MediaAsset(
+        title=public_id.rsplit("/", 1)[-1],
+        url=resource.get("secure_url") or resource.get("url"),
+        public_id=public_id,
+        provider="cloudinary",
+        folder=resource.get("folder") or (public_id.rsplit("/", 1)[0] if "/" in public_id else None),
+        tags=", ".join(tags) or None,
+        asset_type=resource.get("resource_type", "image"),
+        width=resource.get("width"),
+        height=resource.get("height"),
+        size_bytes=resource.get("bytes"),
+    )
+
+
+async def reconcile_inventory(
+    db: Session,
+    *,
+    prefix: Optional[str] = None,
+    orphans: Optional[str] = None,
+    remove_missing: bool = False,
+    grace_minutes: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Diff Cloudinary resources under `prefix` (CLOUDINARY_FOLDER when None,
+    the whole cloud when "") against the Cloudinary rows of media_assets,
+    and apply the requested fixes.  Raises ValueError when Cloudinary is not
+    configured or `orphans` is not one of ORPHAN_ACTIONS.
+    """
+    if orphans is not None and orphans not in ORPHAN_ACTIONS:
+        raise ValueError(f"orphans must be one of {', '.join(ORPHAN_ACTIONS)}")
+    if prefix is None:
+        prefix = f"{settings.CLOUDINARY_FOLDER.strip('/')}/"
+    if grace_minutes is None:
+        grace_minutes = settings.MEDIA_RECONCILE_GRACE_MINUTES
+    cutoff = datetime.utcnow() - timedelta(minutes=grace_minutes)
+
+    remote = await list_resources(prefix=prefix or None, tags=orphans == "import")
+    query = db.query(MediaAsset.id, MediaAsset.public_id, MediaAsset.created_at).filter(
+        MediaAsset.provider == "cloudinary", MediaAsset.public_id.isnot(None)
+    )
+    if prefix:
+        query = query.filter(MediaAsset.public_id.startswith(prefix, autoescape=True))
+    local = query.all()
+    diff = diff_inventory(remote, local, cutoff=cutoff)
+
+    report: dict[str, Any] = {
+        "prefix": prefix,
+        "remote_count": len(remote),
+        "local_count": len(local),
+        "orphans": [resource["public_id"] for resource in diff["orphans"]],
+        "missing": [{"public_id": pid, "asset_ids": ids} for pid, ids in diff["missing"].items()],
+        "recent": diff["recent"],
+        "deleted_orphans": [],
+        "imported_ids": [],
+        "removed_ids": [],
+        "in_use_ids": [],
+        "in_use_orphans": [],
+    }
+
+    if orphans == "delete" and diff["orphans"]:
+        # No row points at an orphan, but its URL may still be pasted into content.
+        referenced = urls_in_use(db, (url for resource in diff["orphans"] for url in _resource_urls(resource)))
+        report["in_use_orphans"] = [
+            resource["public_id"] for resource in diff["orphans"]
+            if referenced.intersection(_resource_urls(resource))
+        ]
+        deletable = [pid for pid in report["orphans"] if pid not in report["in_use_orphans"]]
+        outcome = await delete_images(deletable) if deletable else {}
+        report["deleted_orphans"] = [pid for pid in deletable if outcome.get(pid)]
+    elif orphans == "import" and diff["orphans"]:
+        assets = [_asset_from_resource(resource) for resource in diff["orphans"]]
+        sync_asset_tags(db, assets)
+        db.add_all(assets)
+        db.flush()
+        report["imported_ids"] = [asset.id for asset in assets]
+
+    variants: list[Optional[str]] = []
+    if remove_missing and diff["missing"]:
+        missing_ids = [asset_id for ids in diff["missing"].values() for asset_id in ids]
+        assets = db.query(MediaAsset).filter(MediaAsset.id.in_(missing_ids)).all()
+        in_use = set(usages_for_assets(db, assets))
+        for asset in assets:
+            if asset.id in in_use:
+                continue
+            variants.append(asset.variants)
+            db.delete(asset)
+            report["removed_ids"].append(asset.id)
+        report["removed_ids"].sort()
+        report["in_use_ids"] = sorted(in_use)
+
+    db.commit()
+    for variants_json in variants:
+        await run_in_threadpool(delete_variants, variants_json)
+    logger.info(
+        "Media reconcile (%s): %d remote, %d local, %d orphans, %d missing",
+        prefix or "*", len(remote), len(local), len(report["orphans"]), len(report["missing"]),
+    )
+    return report
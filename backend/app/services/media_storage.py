@@ -0,0 +1,179 @@
+"""
+media_storage.py
+----------------
+Where uploaded media originals live.
+
+`MediaAsset.provider` names the backend that holds an asset's original;
+`get_storage(provider)` returns it.  Every backend implements the same small
+interface (`MediaStorage`), and `save()` returns an upload result shaped like
+Cloudinary's (public_id, secure_url, width, height, bytes, format, ...), so the
+endpoints build a MediaAsset the same way whatever stores the file:
+
+  - "cloudinary": the existing Cloudinary account (services/cloudinary_service.py);
+  - "local":      the filesystem under MEDIA_ROOT/objects, content-addressed by
+                  SHA-256.  Uploading the same bytes twice stores one file;
+                  the result then carries "deduplicated": True.  Files are
+                  served from MEDIA_PUBLIC_URL (see utils/static_files.py)
+                  with Range support, a content ETag and immutable caching.
+
+New uploads go to MEDIA_STORAGE_PROVIDER.  Several MediaAsset rows can point
+at one local file, so callers delete a public_id only once no row uses it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Protocol
+
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image
+
+from ..core.config import settings
+from . import cloudinary_service
+
+COPY_CHUNK_SIZE = 1024 * 1024
+# Pillow format name -> file extension for stored objects.
+_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+
+class MediaStorage(Protocol):
+    name: str
+
+    async def save(
+        self,
+        file: BinaryIO,
+        *,
+        filename: str,
+        folder: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+    ) -> Dict[str, Any]:
+        ...
+
+    async def delete(self, public_id: str) -> bool:
+        """True when the object is gone (including when it never existed)."""
+        ...
+
+    async def delete_many(self, public_ids: list[str]) -> Dict[str, bool]:
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Cloudinary
+# ---------------------------------------------------------------------------
+
+class CloudinaryStorage:
+    name = "cloudinary"
+
+    async def save(self, file, *, filename, folder=None, tags=None):
+        return await cloudinary_service.upload_image(file=file, filename=filename, folder=folder, tags=tags)
+
+    async def delete(self, public_id: str) -> bool:
+        result = await cloudinary_service.delete_image(public_id)
+        return result.get("result") in ("ok", "not found")
+
+    async def delete_many(self, public_ids: list[str]) -> Dict[str, bool]:
+        return await cloudinary_service.delete_images(public_ids)
+
+
+# ---------------------------------------------------------------------------
+# Local filesystem (content-addressed)
+# ---------------------------------------------------------------------------
+
+class LocalStorage:
+    name = "local"
+
+    def __init__(self, root: str | os.PathLike[str], public_url: str) -> None:
+        self.root = Path(root) / "objects"
+        self.public_url = f"{public_url.rstrip('/')}/objects"
+
+    def _relative(self, public_id: str) -> str:
+        # <sha256>.<ext> is stored as ab/<sha256>.<ext> to keep directories small.
+        return f"{public_id[:2]}/{public_id}"
+
+    def path_for(self, public_id: str) -> Path:
+        return self.root / self._relative(public_id)
+
+    def url_for(self, public_id: str) -> str:
+        return f"{self.public_url}/{self._relative(public_id)}"
+
+    def _store(self, file: BinaryIO, folder: Optional[str]) -> Dict[str, Any]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        # Hash while copying to a temp file on the same filesystem, so the
+        # final rename is atomic and a half-written file is never visible.
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while chunk := file.read(COPY_CHUNK_SIZE):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+            with Image.open(tmp_name) as image:
+                width, height = image.size
+                image_format = image.format or ""
+            extension = _EXTENSIONS.get(image_format, "bin")
+            public_id = f"{digest.hexdigest()}.{extension}"
+            target = self.path_for(public_id)
+            deduplicated = target.exists()
+            if deduplicated:
+                os.unlink(tmp_name)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_name, target)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        url = self.url_for(public_id)
+        return {
+            "public_id": public_id,
+            "secure_url": url,
+            "url": url,
+            "resource_type": "image",
+            "format": extension,
+            "width": width,
+            "height": height,
+            "bytes": size,
+            "folder": folder,
+            "deduplicated": deduplicated,
+        }
+
+    async def save(self, file, *, filename, folder=None, tags=None):
+        return await run_in_threadpool(self._store, file, folder)
+
+    def _delete(self, public_id: str) -> bool:
+        path = self.path_for(public_id)
+        # public_ids come from our own rows, but never follow one outside root.
+        if path.resolve().parent.parent != self.root.resolve():
+            return False
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        return True
+
+    async def delete(self, public_id: str) -> bool:
+        return await run_in_threadpool(self._delete, public_id)
+
+    async def delete_many(self, public_ids: list[str]) -> Dict[str, bool]:
+        def _delete_all() -> Dict[str, bool]:
+            return {public_id: self._delete(public_id) for public_id in dict.fromkeys(public_ids)}
+
+        return await run_in_threadpool(_delete_all)
+
+
+_STORAGES: Dict[str, MediaStorage] = {
+    "cloudinary": CloudinaryStorage(),
+    "local": LocalStorage(settings.MEDIA_ROOT, settings.MEDIA_PUBLIC_URL),
+}
+
+
+def get_storage(provider: Optional[str] = None) -> Optional[MediaStorage]:
+    """The backend for `provider` (default: MEDIA_STORAGE_PROVIDER); None for
+    providers we do not manage, e.g. "external" URLs."""
+    return _STORAGES.get(provider or settings.MEDIA_STORAGE_PROVIDER)
@@ -0,0 +1,102 @@
+"""
+media_tags.py
+-------------
+Normalized tag index for the media library.
+
+`MediaAsset.tags` stays the comma-separated string the admin UI edits, but
+every write also mirrors it into media_tags / media_asset_tags (one row per
+distinct lower-cased tag).  Tag filters are then exact, indexed lookups —
+"ai" no longer matches "email" — and per-tag facet counts are a GROUP BY on
+the association table instead of string parsing in Python.
+
+Call `sync_asset_tags()` after setting `asset.tags`; `rebuild_tag_index()`
+re-derives the whole index from the strings (for rows written before the
+index existed, or by hand).
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.models import MediaAsset, MediaTag, media_asset_tags
+
+MAX_TAG_LENGTH = 40
+
+
+def normalize_tags(raw: str | Iterable[str] | None) -> list[str]:
+    """"AI, Email ,ai" -> ["ai", "email"] (order kept, duplicates dropped)."""
+    if not raw:
+        return []
+    parts = raw.split(",") if isinstance(raw, str) else raw
+    names = (part.strip().lower()[:MAX_TAG_LENGTH] for part in parts)
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def _get_or_create_tags(db: Session, names: set[str]) -> dict[str, MediaTag]:
+    if not names:
+        return {}
+    tags = {tag.name: tag for tag in db.query(MediaTag).filter(MediaTag.name.in_(names)).all()}
+    for name in names - tags.keys():
+        # A concurrent request may create the same tag; the unique index decides.
+        try:
+            with db.begin_nested():
+                tag = MediaTag(name=name)
+                db.add(tag)
+            tags[name] = tag
+        except IntegrityError:
+            tags[name] = db.query(MediaTag).filter(MediaTag.name == name).one()
+    return tags
+
+
+def sync_asset_tags(db: Session, assets: MediaAsset | Iterable[MediaAsset]) -> None:
+    """Point each asset's tag_items at the tags in its `tags` string."""
+    assets = [assets] if isinstance(assets, MediaAsset) else list(assets)
+    wanted = {id(asset): normalize_tags(asset.tags) for asset in assets}
+    tags = _get_or_create_tags(db, {name for names in wanted.values() for name in names})
+    for asset in assets:
+        asset.tag_items = [tags[name] for name in wanted[id(asset)]]
+
+
+def tag_facets(db: Session, asset_ids=None, *, prefix: str | None = None, limit: int = 50) -> list[dict]:
+    """
+    [{"tag": ..., "count": ...}], most used first, over the assets selected
+    by `asset_ids` (a subquery; all assets when None).  `prefix` keeps only
+    tags starting with it, for autocomplete.
+    """
+    count = func.count(media_asset_tags.c.asset_id)
+    query = db.query(MediaTag.name, count).join(media_asset_tags, media_asset_tags.c.tag_id == MediaTag.id)
+    if asset_ids is not None:
+        query = query.filter(media_asset_tags.c.asset_id.in_(select(asset_ids)))
+    if prefix:
+        query = query.filter(MediaTag.name.startswith(prefix.strip().lower(), autoescape=True))
+    rows = query.group_by(MediaTag.name).order_by(count.desc(), MediaTag.name).limit(limit).all()
+    return [{"tag": name, "count": total} for name, total in rows]
+
+
+def rebuild_tag_index(db: Session, *, batch_size: int = 500) -> int:
+    """Re-sync every asset and drop tags nothing uses any more. Returns assets processed."""
+    processed = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(MediaAsset)
+            .filter(MediaAsset.id > last_id)
+            .order_by(MediaAsset.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        sync_asset_tags(db, batch)
+        db.flush()
+        processed += len(batch)
+        last_id = batch[-1].id
+
+    used = select(media_asset_tags.c.tag_id)
+    db.query(MediaTag).filter(MediaTag.id.notin_(used)).delete(synchronize_session=False)
+    db.commit()
+    return processed
@@ -0,0 +1,204 @@
+"""
+media_usage.py
+--------------
+Reverse index of where stored URLs are used, so "is this media asset still
+referenced?" is one indexed lookup instead of a scan of every text column.
+
+`media_usages` holds one row per (source table, row id, column, URL) for:
+
+  - the URL columns of link_checker.CHECKED_COLUMNS (cover images, logos,
+    avatars, gallery images, ...);
+  - every http(s) URL inside RICH_TEXT_COLUMNS (blog HTML, project write-ups),
+    e.g. <img src="..."> or markdown ![](...).
+
+The index is maintained by an `after_flush` session hook (`install()`), so
+every ORM write — whichever router or background job makes it — replaces
+the rows of the objects it touched in the same transaction.  Bulk
+`query.update()` calls bypass the ORM; `rebuild_usage_index()` re-derives
+the whole table when needed, and runs at startup while the table is empty.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Any, Iterable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..db.session import SessionLocal
+from ..models.models import BlogPost, MediaAsset, MediaUsage, Project
+from .link_checker import CHECKED_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+RICH_TEXT_COLUMNS: list[tuple[Any, str]] = [
+    (BlogPost, "content"),
+    (BlogPost, "excerpt"),
+    (Project, "description"),
+    (Project, "challenges"),
+    (Project, "solutions"),
+    (Project, "impact"),
+]
+
+MAX_URL_LENGTH = 2000
+_URL_IN_TEXT = re.compile(r"""https?://[^\s"'<>()\[\]]+""")
+
+# model -> (url columns, rich-text columns)
+_TRACKED: dict[Any, tuple[list[str], list[str]]] = {}
+for _model, _column, _kind in CHECKED_COLUMNS:
+    _TRACKED.setdefault(_model, ([], []))[0].append(_column)
+for _model, _column in RICH_TEXT_COLUMNS:
+    _TRACKED.setdefault(_model, ([], []))[1].append(_column)
+
+_usages = MediaUsage.__table__
+
+
+def _clean(url: str) -> str | None:
+    url = url.strip().rstrip(".,;:!?")
+    if not url.startswith(("http://", "https://")) or len(url) > MAX_URL_LENGTH:
+        return None
+    return url
+
+
+def extract_usages(obj: Any) -> set[tuple[str, str]]:
+    """{(column, url)} referenced by one tracked content row."""
+    url_columns, text_columns = _TRACKED[type(obj)]
+    found: set[tuple[str, str]] = set()
+    for column in url_columns:
+        value = getattr(obj, column)
+        if value and (url := _clean(str(value))):
+            found.add((column, url))
+    for column in text_columns:
+        value = getattr(obj, column)
+        if value:
+            found.update((column, url) for match in _URL_IN_TEXT.findall(str(value)) if (url := _clean(match)))
+    return found
+
+
+def _rows(obj: Any) -> list[dict[str, Any]]:
+    table = obj.__tablename__
+    return [
+        {"url": url, "source_table": table, "source_id": obj.id, "source_column": column}
+        for column, url in sorted(extract_usages(obj))
+    ]
+
+
+def _tracked_change(obj: Any) -> bool:
+    url_columns, text_columns = _TRACKED[type(obj)]
+    state = inspect(obj)
+    return any(state.attrs[column].history.has_changes() for column in (*url_columns, *text_columns))
+
+
+# ---------------------------------------------------------------------------
+# Write-path maintenance
+# ---------------------------------------------------------------------------
+
+def _after_flush(session: Session, _flush_context: Any) -> None:
+    replace = [obj for obj in session.new if type(obj) in _TRACKED]
+    replace += [obj for obj in session.dirty if type(obj) in _TRACKED and _tracked_change(obj)]
+    removed = [obj for obj in session.deleted if type(obj) in _TRACKED]
+    if not (replace or removed):
+        return
+
+    connection = session.connection()
+    for obj in [*replace, *removed]:
+        connection.execute(
+            _usages.delete().where(
+                _usages.c.source_table == obj.__tablename__,
+                _usages.c.source_id == obj.id,
+            )
+        )
+    rows = [row for obj in replace for row in _rows(obj)]
+    if rows:
+        connection.execute(_usages.insert(), rows)
+
+
+def install() -> None:
+    """Keep media_usages in step with every ORM flush (idempotent)."""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+
+
+def rebuild_usage_index(db: Session, *, batch_size: int = 500) -> int:
+    """Re-derive media_usages from the content tables. Returns rows written."""
+    db.execute(_usages.delete())
+    written = 0
+    for model in _TRACKED:
+        last_id = 0
+        while True:
+            batch = db.query(model).filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not batch:
+                break
+            rows = [row for obj in batch for row in _rows(obj)]
+            if rows:
+                db.execute(_usages.insert(), rows)
+                written += len(rows)
+            last_id = batch[-1].id
+            db.expunge_all()
+    db.commit()
+    return written
+
+
+def ensure_usage_index() -> None:
+    """Build the index on first start (e.g. right after the migration); a no-op once it has rows."""
+    db = SessionLocal()
+    try:
+        if db.query(MediaUsage.id).first() is None:
+            written = rebuild_usage_index(db)
+            if written:
+                logger.info("Built media usage index: %d references", written)
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Lookups
+# ---------------------------------------------------------------------------
+
+def asset_urls(asset: MediaAsset) -> list[str]:
+    """The asset's own URL plus its responsive variant URLs."""
+    urls = [str(asset.url)]
+    if asset.variants:
+        urls.extend(variant["url"] for variant in json.loads(asset.variants))
+    return urls
+
+
+def usages_for_assets(db: Session, assets: Iterable[MediaAsset]) -> dict[int, list[dict[str, Any]]]:
+    """{asset id: [{"table", "id", "column", "url"}, ...]} for assets that are in use."""
+    # Several rows can share a URL (legacy rows, uploads without a content
+    # hash, reconcile imports); a usage counts against every one of them.
+    owners: dict[str, list[int]] = {}
+    for asset in assets:
+        for url in asset_urls(asset):
+            owners.setdefault(url, []).append(asset.id)
+    if not owners:
+        return {}
+    rows = (
+        db.query(MediaUsage)
+        .filter(MediaUsage.url.in_(list(owners)))
+        .order_by(MediaUsage.source_table, MediaUsage.source_id)
+        .all()
+    )
+    result: dict[int, list[dict[str, Any]]] = {}
+    for row in rows:
+        usage = {
+            "table": row.source_table,
+            "id": row.source_id,
+            "column": row.source_column,
+            "url": row.url,
+        }
+        for asset_id in dict.fromkeys(owners[row.url]):
+            result.setdefault(asset_id, []).append(usage)
+    return result
+
+
+def urls_in_use(db: Session, urls: Iterable[str]) -> set[str]:
+    """The subset of `urls` that content references."""
+    urls = {url for url in urls if url}
+    if not urls:
+        return set()
+    rows = db.query(MediaUsage.url).filter(MediaUsage.url.in_(list(urls))).distinct().all()
+    return {row.url for row in rows}
@@ -0,0 +1,293 @@
+"""
+scrape_jobs.py
+--------------
+Asynchronous scrape jobs for the admin "Import from URL" flow.
+
+A scrape plus Z.AI analysis can take longer than a reverse proxy is willing
+to hold a request open (ZAI_SCRAPER_TIMEOUT alone defaults to 60 s), so the
+admin can submit a job instead:
+
+  1. submit_job() persists a `scrape_jobs` row and returns immediately.
+     A second submission for the same URL + content type while the first is
+     still queued/running returns the existing job instead of a new one.
+  2. A small pool of in-process asyncio workers (SCRAPE_JOB_WORKERS) pulls
+     job ids off a queue and runs scrape_url() + analyze_with_ai().
+  3. Clients poll the job row or subscribe to change notifications via
+     wait_for_update() (used by the SSE endpoint).
+
+Job state lives in the application database, so queued / interrupted jobs
+are picked up again when the process restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.models import ScrapeJob
+from .scraper_service import ContentType, analyze_with_ai, describe_fetch_error, scrape_url
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+_queue: asyncio.Queue[str] | None = None
+_workers: list[asyncio.Task] = []
+_job_events: dict[str, asyncio.Event] = {}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def job_to_dict(job: ScrapeJob) -> dict[str, Any]:
+    """Serialise a job row into the shape returned by the admin API."""
+    data: dict[str, Any] | None = None
+    if job.result:
+        try:
+            data = json.loads(str(job.result))
+        except json.JSONDecodeError:
+            data = None
+    return {
+        "id": job.id,
+        "url": job.url,
+        "content_type": job.content_type,
+        "status": job.status,
+        "data": data,
+        "error": job.error,
+        "error_status": job.error_status,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def _notify(job_id: str) -> None:
+    """Wake every subscriber waiting on this job."""
+    event = _job_events.pop(job_id, None)
+    if event is not None:
+        event.set()
+
+
+async def wait_for_update(job_id: str, timeout: float) -> bool:
+    """
+    Block until the job changes state or `timeout` seconds elapse.
+    Returns False on timeout.
+    """
+    event = _job_events.setdefault(job_id, asyncio.Event())
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+def get_job(job_id: str) -> dict[str, Any] | None:
+    db = SessionLocal()
+    try:
+        job = db.get(ScrapeJob, job_id)
+        return job_to_dict(job) if job else None
+    finally:
+        db.close()
+
+
+def _create_job(url: str, content_type: ContentType) -> tuple[dict[str, Any], bool]:
+    db = SessionLocal()
+    try:
+        existing = (
+            db.query(ScrapeJob)
+            .filter(
+                ScrapeJob.url == url,
+                ScrapeJob.content_type == content_type,
+                ScrapeJob.status.in_(ACTIVE_STATUSES),
+            )
+            .order_by(ScrapeJob.created_at.desc())
+            .first()
+        )
+        if existing:
+            return job_to_dict(existing), False
+
+        job = ScrapeJob(
+            id=uuid.uuid4().hex,
+            url=url,
+            content_type=content_type,
+            status="queued",
+            created_at=_utcnow(),
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job_to_dict(job), True
+    finally:
+        db.close()
+
+
+async def submit_job(url: str, content_type: ContentType) -> tuple[dict[str, Any], bool]:
+    """
+    Create (or reuse) a job for `url` and enqueue it.
+
+    Returns `(job, created)`; `created` is False when an identical job was
+    already in flight and has been returned instead.
+    """
+    # The row is written in the threadpool; the queue is only touched on the loop.
+    payload, created = await run_in_threadpool(_create_job, url, content_type)
+    if not created:
+        return payload, False
+
+    if _queue is not None:
+        _queue.put_nowait(payload["id"])
+    else:
+        # Workers not running (e.g. scripts / tests); the job will be picked
+        # up on the next startup.
+        logger.warning("Scrape job %s queued but no workers are running.", payload["id"])
+    return payload, True
+
+
+def _write_job(job_id: str, fields: dict[str, Any]) -> tuple[str, str] | None:
+    db = SessionLocal()
+    try:
+        job = db.get(ScrapeJob, job_id)
+        if not job:
+            return None
+        for field, value in fields.items():
+            setattr(job, field, value)
+        db.commit()
+        return str(job.url), str(job.content_type)
+    finally:
+        db.close()
+
+
+async def _update_job(job_id: str, **fields: Any) -> tuple[str, str] | None:
+    """Apply `fields` to a job row; returns (url, content_type) or None if gone."""
+    try:
+        # The write runs in the threadpool; subscribers are woken back on the loop.
+        return await run_in_threadpool(_write_job, job_id, fields)
+    finally:
+        _notify(job_id)
+
+
+def _is_active(job_id: str) -> bool:
+    db = SessionLocal()
+    try:
+        job = db.get(ScrapeJob, job_id)
+        return job is not None and job.status in ACTIVE_STATUSES
+    finally:
+        db.close()
+
+
+async def _run_job(job_id: str) -> None:
+    if not await run_in_threadpool(_is_active, job_id):
+        return
+
+    claimed = await _update_job(job_id, status="running", started_at=_utcnow())
+    if claimed is None:
+        return
+    url, content_type = claimed
+
+    try:
+        scraped = await scrape_url(url)
+    except Exception as exc:
+        code, detail = describe_fetch_error(exc, url)
+        logger.warning("Scrape job %s failed while fetching %s: %s", job_id, url, exc)
+        await _update_job(job_id, status="failed", error=detail, error_status=code, finished_at=_utcnow())
+        return
+
+    try:
+        structured = await analyze_with_ai(scraped, content_type)  # type: ignore[arg-type]
+    except Exception as exc:
+        logger.error("Scrape job %s AI analysis failed for %s: %s", job_id, url, exc)
+        await _update_job(
+            job_id,
+            status="failed",
+            error=f"AI analysis failed: {exc}",
+            error_status=500,
+            finished_at=_utcnow(),
+        )
+        return
+
+    await _update_job(
+        job_id,
+        status="succeeded",
+        result=json.dumps(structured, default=str),
+        finished_at=_utcnow(),
+    )
+
+
+async def _worker(queue: asyncio.Queue[str]) -> None:
+    while True:
+        job_id = await queue.get()
+        try:
+            await _run_job(job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Scrape job %s crashed", job_id)
+            await _update_job(
+                job_id,
+                status="failed",
+                error="Internal error while processing the job.",
+                error_status=500,
+                finished_at=_utcnow(),
+            )
+        finally:
+            queue.task_done()
+
+
+def _recover_pending_jobs() -> list[str]:
+    """Reset jobs interrupted by a restart and return every id still pending."""
+    db = SessionLocal()
+    try:
+        pending = (
+            db.query(ScrapeJob)
+            .filter(ScrapeJob.status.in_(ACTIVE_STATUSES))
+            .order_by(ScrapeJob.created_at)
+            .all()
+        )
+        for job in pending:
+            setattr(job, "status", "queued")
+            setattr(job, "started_at", None)
+        db.commit()
+        return [str(job.id) for job in pending]
+    finally:
+        db.close()
+
+
+def stats() -> dict[str, Any]:
+    return {
+        "workers": len(_workers),
+        "queued": _queue.qsize() if _queue is not None else 0,
+    }
+
+
+async def start_workers() -> None:
+    """Start the worker pool and re-enqueue jobs left over from a previous run."""
+    global _queue
+    if _queue is not None:
+        return
+    _queue = asyncio.Queue()
+    try:
+        for job_id in await run_in_threadpool(_recover_pending_jobs):
+            _queue.put_nowait(job_id)
+    except Exception:
+        logger.exception("Failed to recover pending scrape jobs")
+
+    for _ in range(max(1, settings.SCRAPE_JOB_WORKERS)):
+        _workers.append(asyncio.create_task(_worker(_queue)))
+
+
+async def stop_workers() -> None:
+    global _queue
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
@@ -1,7 +1,7 @@
 """
 scraper_service.py
 ------------------
-Fetches a URL, extracts key metadata via BeautifulSoup, then sends the
+Fetches a URL, extracts key metadata via lxml, then sends the
 content to the Z.AI API (OpenAI-compatible) for intelligent structuring
 into one of three content-type schemas.
 
@@ -11,20 +11,40 @@ Supported content_type values:
   - "project"         → maps to ProjectBase
 """
 
+import asyncio
+import codecs
 import json
 import logging
 import re
-from typing import Any, Literal
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Literal
 from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
-from openai import AsyncOpenAI
+from lxml import etree
+from lxml import html as lxml_html
 
 from ..core.config import settings
+from ..utils import slugify
+from .host_limiter import HostRateLimited, host_key, host_limiter
+from .llm_client import LLMClient, get_llm_client
+from .summarizer import compact_keeping_terms, token_budget
+from .worker_pool import WorkerPool
 
 logger = logging.getLogger(__name__)
 
+# HTML parsing and text extraction are CPU-bound; run them off the event loop
+# so a heavy page cannot stall every other request on this worker.
+parse_pool = WorkerPool(
+    "scraper-parse",
+    max_workers=settings.SCRAPER_PARSE_WORKERS,
+    max_queue=settings.SCRAPER_PARSE_QUEUE,
+)
+
+
+async def _run_parse(fn, *args):
+    return await parse_pool.run(fn, *args, timeout=float(settings.SCRAPER_PARSE_TIMEOUT))
+
 ContentType = Literal["press_mention", "blog_article", "project"]
 SocialPlatform = Literal["twitter", "instagram", "facebook", "linkedin"]
 
@@ -72,10 +92,10 @@ async def _fetch_twitter_oembed(url: str) -> dict[str, Any]:
     Call the free Twitter/X oEmbed endpoint (no auth required).
     Returns the raw oEmbed JSON dict, or {} on failure.
     """
-    oembed_url = f"https://publish.twitter.com/oembed?url={url}&omit_script=true&dnt=true"
+    params = {"url": url, "omit_script": "true", "dnt": "true"}
     try:
         async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            resp = await client.get(oembed_url)
+            resp = await client.get(settings.SCRAPER_TWITTER_OEMBED_URL, params=params)
         if resp.status_code == 200:
             return resp.json()
     except Exception as exc:
@@ -83,13 +103,18 @@ async def _fetch_twitter_oembed(url: str) -> dict[str, Any]:
     return {}
 
 
+_TWITTER_LINK_RE = re.compile(r"twitter\.com|x\.com|t\.co")
+
+
 def _extract_tweet_text(html: str) -> str:
     """Strip tags from oEmbed HTML and return the plain tweet text."""
-    soup = BeautifulSoup(html, "lxml")
+    if not html.strip():
+        return ""
+    fragment = lxml_html.fragment_fromstring(html, create_parent="div")
     # Remove trailing attribution links (<a> with twitter.com href)
-    for a in soup.find_all("a", href=re.compile(r"twitter\.com|x\.com|t\.co")):
-        a.decompose()
-    text = re.sub(r"\s+", " ", soup.get_text(separator=" ")).strip()
+    for a in [a for a in fragment.iter("a") if _TWITTER_LINK_RE.search(a.get("href") or "")]:
+        a.drop_tree()
+    text = re.sub(r"\s+", " ", " ".join(fragment.itertext())).strip()
     return text[:320]
 
 
@@ -120,45 +145,101 @@ def _build_social_metadata(url: str, platform: str) -> dict[str, Any]:
     }
 
 
+def _build_circuit_open_metadata(url: str) -> dict[str, Any]:
+    """
+    Empty scraped-metadata dict returned while the host's circuit breaker is
+    open.  `_circuit_open` makes analyze_with_ai() skip the model, so the
+    admin gets the URL-only fallback extraction straight away.
+    """
+    domain = urlparse(url).netloc.replace("www.", "")
+    return {
+        "url":             url,
+        "title":           "",
+        "description":     "",
+        "image_url":       "",
+        "site_name":       domain,
+        "published_time":  "",
+        "author":          "",
+        "domain":          domain,
+        "content_snippet": "",
+        "keywords":        [],
+        "article_section": "",
+        "_circuit_open":   True,
+    }
+
+
+# Statuses that say the host is unhealthy or refusing us, not that the page is wrong.
+_HOST_FAILURE_STATUSES = frozenset({401, 403, 407, 429})
+
+
+def _record_host_outcome(
+    host: str, *, status_code: int | None = None, exc: BaseException | None = None,
+) -> None:
+    """Feed the result of one fetch into the host's circuit breaker."""
+    if exc is not None:
+        if isinstance(exc, httpx.HTTPStatusError):
+            status_code = exc.response.status_code
+        elif isinstance(exc, httpx.TransportError) and not isinstance(exc, httpx.UnsupportedProtocol):
+            host_limiter.record_failure(host, f"{type(exc).__name__}: {exc}")
+            return
+        else:
+            # Cancelled, bad URL, ...: says nothing about the host.
+            host_limiter.release(host)
+            return
+    if status_code is not None and (status_code >= 500 or status_code in _HOST_FAILURE_STATUSES):
+        host_limiter.record_failure(host, f"HTTP {status_code}")
+    else:
+        host_limiter.record_success(host)
+
+
+def _extract_og(html: str, url: str) -> dict[str, Any]:
+    """Pure part of _try_og_scrape(): OG / Twitter-card / ld+json fields."""
+    meta = _build_meta_index(_parse_html(html))
+    ld   = meta.ld
+    site = meta.get("og:site_name") or urlparse(url).netloc.replace("www.", "")
+    raw_title = (
+        meta.get("og:title", "twitter:title")
+        or str(ld.get("headline") or "")
+    )
+    return {
+        "title":          _clean_title(raw_title, site),
+        "description":    (
+            meta.get("og:description", "twitter:description")
+            or str(ld.get("description") or "")
+        ),
+        "image_url":      meta.get("og:image"),
+        "published_time": _extract_published_date(meta),
+        "author":         _extract_author(meta),
+    }
+
+
 async def _try_og_scrape(url: str) -> dict[str, Any]:
     """
     Quick best-effort OG metadata fetch, used to supplement platforms where
     the primary API (e.g. Twitter oEmbed) returns only minimal information.
     For X Articles the real headline lives in og:title even without JS.
-    Returns {} silently on any error.
+    Returns {} silently on any error, or when the host's circuit is open.
     """
+    host = host_key(url)
     try:
-        async with httpx.AsyncClient(
-            timeout=12.0,
-            follow_redirects=True,
-            headers=SCRAPER_HEADERS,
-            verify=False,
-        ) as client:
-            resp = await client.get(url)
-        if resp.status_code >= 400:
+        if not await host_limiter.acquire(host):
             return {}
-        soup = BeautifulSoup(resp.text, "lxml")
-        ld   = _get_ld_json(soup)
-        site = (
-            _get_meta(soup, property="og:site_name")
-            or urlparse(url).netloc.replace("www.", "")
-        )
-        raw_title = (
-            _get_meta(soup, property="og:title")
-            or _get_meta(soup, name="twitter:title")
-            or str(ld.get("headline") or "")
-        )
-        return {
-            "title":          _clean_title(raw_title, site),
-            "description":    (
-                _get_meta(soup, property="og:description")
-                or _get_meta(soup, name="twitter:description")
-                or str(ld.get("description") or "")
-            ),
-            "image_url":      _get_meta(soup, property="og:image") or "",
-            "published_time": _extract_published_date(soup, ld),
-            "author":         _extract_author(soup, ld),
-        }
+        try:
+            async with httpx.AsyncClient(
+                timeout=12.0,
+                follow_redirects=True,
+                headers=SCRAPER_HEADERS,
+                verify=False,
+            ) as client:
+                # Only the <head> matters here — stop reading as soon as it closes.
+                page = await _fetch_html(client, url, body_bytes=0, stop_on_error_status=True)
+        except BaseException as exc:
+            _record_host_outcome(host, exc=exc)
+            raise
+        _record_host_outcome(host, status_code=page.response.status_code)
+        if page.response.status_code >= 400:
+            return {}
+        return await _run_parse(_extract_og, page.html, url)
     except Exception as exc:
         logger.debug("OG scrape failed for %s: %s", url, exc)
         return {}
@@ -244,55 +325,250 @@ CATEGORY_KEYWORDS: dict[str, list[str]] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Streaming fetch
+# ---------------------------------------------------------------------------
+
+# Bytes inspected for a <meta charset> declaration before decoding starts.
+_CHARSET_SNIFF_BYTES = 4096
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.I,
+)
+_HEAD_END_RE = re.compile(r"</head\s*>", re.I)
+
+
+@dataclass
+class FetchedPage:
+    html: str
+    response: httpx.Response
+    bytes_read: int
+    truncated: bool   # True when reading stopped before the end of the body
+
+
+def _resolve_charset(response: httpx.Response, head: bytes) -> str:
+    """
+    Pick the document encoding: BOM, then the Content-Type charset, then a
+    <meta charset> / http-equiv declaration in the first few KB, else UTF-8.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+
+    candidates = [response.charset_encoding]
+    match = _META_CHARSET_RE.search(head[:_CHARSET_SNIFF_BYTES])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+async def _fetch_html(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    max_bytes: int | None = None,
+    body_bytes: int | None = None,
+    stop_on_error_status: bool = False,
+) -> FetchedPage:
+    """
+    Stream a page and decode it incrementally, stopping early instead of
+    buffering the whole response:
+
+      - never read more than `max_bytes` (SCRAPER_MAX_BYTES) of body;
+      - once `</head>` has arrived, read at most `body_bytes`
+        (SCRAPER_BODY_BYTES) more — enough for the article text that
+        _extract_main_text() keeps — then hang up.
+
+    With `stop_on_error_status`, a 4xx/5xx response is returned without
+    reading its body at all.
+    """
+    max_bytes = settings.SCRAPER_MAX_BYTES if max_bytes is None else max_bytes
+    body_bytes = settings.SCRAPER_BODY_BYTES if body_bytes is None else body_bytes
+
+    async with client.stream("GET", url) as response:
+        if response.status_code in (401, 403, 407):
+            response.raise_for_status()
+        if stop_on_error_status and response.status_code >= 400:
+            return FetchedPage(html="", response=response, bytes_read=0, truncated=True)
+
+        decoder: codecs.IncrementalDecoder | None = None
+        pending = bytearray()       # bytes held back until the charset is known
+        parts: list[str] = []
+        bytes_read = 0
+        head_closed_at: int | None = None
+        scan_carry = ""             # tail of the previous chunk, so "</head>" can straddle chunks
+        truncated = False
+
+        async for chunk in response.aiter_bytes():
+            if bytes_read + len(chunk) > max_bytes:
+                chunk = chunk[: max_bytes - bytes_read]
+                truncated = True
+            bytes_read += len(chunk)
+
+            if decoder is None:
+                pending.extend(chunk)
+                if len(pending) < _CHARSET_SNIFF_BYTES and not truncated:
+                    continue
+                decoder = codecs.getincrementaldecoder(
+                    _resolve_charset(response, bytes(pending))
+                )(errors="replace")
+                chunk, pending = bytes(pending), bytearray()
+
+            text = decoder.decode(chunk)
+            parts.append(text)
+
+            if head_closed_at is None:
+                if _HEAD_END_RE.search(scan_carry + text):
+                    head_closed_at = bytes_read
+                scan_carry = text[-16:]
+
+            if truncated:
+                break
+            if head_closed_at is not None and bytes_read - head_closed_at >= body_bytes:
+                truncated = True
+                break
+
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(
+                _resolve_charset(response, bytes(pending))
+            )(errors="replace")
+            parts.append(decoder.decode(bytes(pending)))
+        parts.append(decoder.decode(b"", final=True))
+
+    if truncated:
+        logger.debug("Stopped reading %s after %d bytes.", url, bytes_read)
+    return FetchedPage(html="".join(parts), response=response, bytes_read=bytes_read, truncated=truncated)
+
+
 # ---------------------------------------------------------------------------
 # Low-level metadata helpers
 # ---------------------------------------------------------------------------
 
-def _get_meta(soup: BeautifulSoup, *, property: str | None = None, name: str | None = None) -> str:
-    """Extract a <meta> tag's content attribute."""
-    if property:
-        tag = soup.find("meta", property=property)
-    elif name:
-        tag = soup.find("meta", attrs={"name": name})
+_XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+_LD_ARTICLE_TYPES = ("Article", "NewsArticle", "BlogPosting", "WebPage")
+
+
+def _parse_html(html: str) -> lxml_html.HtmlElement:
+    """
+    Parse a full HTML document with lxml.  An XML declaration is stripped
+    first because lxml refuses str input that carries an encoding.
+    """
+    return lxml_html.document_fromstring(_XML_DECL_RE.sub("", html, count=1))
+
+
+def _element_text(el: lxml_html.HtmlElement, separator: str = "") -> str:
+    """Join the stripped, non-empty text nodes under `el` (comments excluded)."""
+    return separator.join(t.strip() for t in el.itertext() if t and t.strip())
+
+
+def _selector_xpath(selector: str) -> etree.XPath:
+    """
+    Compile one of the simple CSS selectors used in this module — `tag`,
+    `.class`, `#id`, `[attr='v']`, `[attr*='v']` — into an XPath returning
+    matches in document order.
+    """
+    match = re.fullmatch(
+        r"""([a-zA-Z][\w-]*)?(?:\.([\w-]+)|#([\w-]+)|\[([\w-]+)(\*?)=['"]([^'"]+)['"]\])?""",
+        selector,
+    )
+    if not match:
+        raise ValueError(f"Unsupported selector: {selector}")
+    tag, cls, ident, attr, contains, value = match.groups()
+    if cls:
+        cond = f"[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+    elif ident:
+        cond = f"[@id='{ident}']"
+    elif attr:
+        cond = f"[contains(@{attr}, '{value}')]" if contains else f"[@{attr}='{value}']"
     else:
-        return ""
-    return str(tag.get("content") or "").strip() if tag else ""
+        cond = ""
+    return etree.XPath(f"//{tag or '*'}{cond}")
+
+
+_CONTENT_XPATHS = [_selector_xpath(sel) for sel in CONTENT_SELECTORS]
+_AUTHOR_XPATHS = [_selector_xpath(sel) for sel in AUTHOR_SELECTORS]
 
 
-def _get_ld_json(soup: BeautifulSoup) -> dict:
+@dataclass
+class MetaIndex:
     """
-    Extract the richest application/ld+json block available.
-    Prefers Article/NewsArticle/BlogPosting types; falls back to the first item.
+    Every <meta>, <title> and application/ld+json entry of a page, collected
+    in a single walk of the tree.  Extractors look values up here instead of
+    re-searching the document for each key.
+
+    <meta> entries are keyed by their lower-cased `property` and `name`
+    attributes; repeated keys (e.g. article:tag) keep every value in order.
     """
-    results: list[dict] = []
-    for tag in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(tag.string or "{}")
+    meta: dict[str, list[str]] = field(default_factory=dict)
+    title: str = ""
+    ld_items: list[dict] = field(default_factory=list)
+
+    def get(self, *keys: str) -> str:
+        """Return the first non-empty content among `keys`, in priority order."""
+        for key in keys:
+            for value in self.meta.get(key.lower(), ()):
+                if value:
+                    return value
+        return ""
+
+    def get_all(self, key: str) -> list[str]:
+        return [v for v in self.meta.get(key.lower(), ()) if v]
+
+    @property
+    def ld(self) -> dict:
+        """
+        The richest ld+json block available.  Prefers Article/NewsArticle/
+        BlogPosting types; falls back to the first item.
+        """
+        for item in self.ld_items:
+            if item.get("@type") in _LD_ARTICLE_TYPES:
+                return item
+        return self.ld_items[0] if self.ld_items else {}
+
+
+def _build_meta_index(root: lxml_html.HtmlElement) -> MetaIndex:
+    index = MetaIndex()
+    for el in root.iter("meta", "title", "script"):
+        if el.tag == "meta":
+            content = str(el.get("content") or "").strip()
+            for attr in ("property", "name"):
+                key = el.get(attr)
+                if key:
+                    index.meta.setdefault(key.strip().lower(), []).append(content)
+        elif el.tag == "title":
+            if not index.title:
+                index.title = (el.text or "").strip()
+        elif (el.get("type") or "").strip().lower() == "application/ld+json":
+            try:
+                data = json.loads(el.text or "{}")
+            except json.JSONDecodeError:
+                continue
             if isinstance(data, list):
-                results.extend([d for d in data if isinstance(d, dict)])
+                index.ld_items.extend(d for d in data if isinstance(d, dict))
             elif isinstance(data, dict):
-                results.append(data)
-        except json.JSONDecodeError:
-            continue
-
-    article_types = ("Article", "NewsArticle", "BlogPosting", "WebPage")
-    for item in results:
-        if item.get("@type") in article_types:
-            return item
-    return results[0] if results else {}
+                index.ld_items.append(data)
+    return index
 
 
-def _extract_main_text(soup: BeautifulSoup, max_chars: int = 5000) -> str:
+def _extract_main_text(root: lxml_html.HtmlElement, max_chars: int = 5000) -> str:
     """Remove boilerplate and return the primary page text."""
-    for tag in soup(BOILERPLATE_TAGS):
-        tag.decompose()
+    for el in list(root.iter(*BOILERPLATE_TAGS)):
+        el.drop_tree()
 
-    for selector in CONTENT_SELECTORS:
-        el = soup.select_one(selector)
-        if el:
-            return el.get_text(separator="\n", strip=True)[:max_chars]
+    for xpath in _CONTENT_XPATHS:
+        found = xpath(root)
+        if found:
+            return _element_text(found[0], "\n")[:max_chars]
 
-    return soup.body.get_text(separator="\n", strip=True)[:max_chars] if soup.body else ""
+    body = root.find("body")
+    return _element_text(body, "\n")[:max_chars] if body is not None else ""
 
 
 def _clean_title(title: str, site_name: str) -> str:
@@ -319,7 +595,7 @@ def _clean_title(title: str, site_name: str) -> str:
     return title
 
 
-def _extract_keywords(soup: BeautifulSoup, ld: dict) -> list[str]:
+def _extract_keywords(meta: MetaIndex) -> list[str]:
     """
     Return a deduplicated list of keyword strings from:
       1. <meta name="keywords">
@@ -328,20 +604,17 @@ def _extract_keywords(soup: BeautifulSoup, ld: dict) -> list[str]:
     """
     kw_set: list[str] = []
 
-    raw_kw = _get_meta(soup, name="keywords")
+    raw_kw = meta.get("keywords")
     if raw_kw:
         kw_set.extend([k.strip() for k in raw_kw.split(",") if k.strip()])
 
-    ld_kw = ld.get("keywords")
+    ld_kw = meta.ld.get("keywords")
     if isinstance(ld_kw, list):
         kw_set.extend([k for k in ld_kw if isinstance(k, str)])
     elif isinstance(ld_kw, str):
         kw_set.extend([k.strip() for k in ld_kw.split(",") if k.strip()])
 
-    for tag in soup.find_all("meta", property="article:tag"):
-        val = str(tag.get("content") or "").strip()
-        if val:
-            kw_set.append(val)
+    kw_set.extend(meta.get_all("article:tag"))
 
     # Deduplicate while preserving order
     seen: set[str] = set()
@@ -354,15 +627,15 @@ def _extract_keywords(soup: BeautifulSoup, ld: dict) -> list[str]:
     return result[:20]  # cap at 20 tags
 
 
-def _extract_author(soup: BeautifulSoup, ld: dict) -> str:
+def _extract_author(meta: MetaIndex, root: lxml_html.HtmlElement | None = None) -> str:
     """
     Try multiple sources for a human-readable author name:
       1. LD+JSON author.name
       2. <meta name="author"> / <meta property="article:author">
-      3. Common HTML byline selectors
+      3. Common HTML byline selectors (only when `root` is given)
     """
     # LD+JSON: author can be a Person object or a list
-    ld_author = ld.get("author")
+    ld_author = meta.ld.get("author")
     if isinstance(ld_author, dict):
         name = ld_author.get("name", "")
         if name:
@@ -373,20 +646,19 @@ def _extract_author(soup: BeautifulSoup, ld: dict) -> str:
         if name:
             return str(name).strip()
 
-    for source in (
-        _get_meta(soup, name="author"),
-        _get_meta(soup, property="article:author"),
-        _get_meta(soup, name="dc.creator"),
-        _get_meta(soup, name="byl"),
-    ):
+    for key in ("author", "article:author", "dc.creator", "byl"):
+        source = meta.get(key)
         if source and not source.startswith("http"):
             return source
 
+    if root is None:
+        return ""
+
     # HTML byline selectors as last resort
-    for selector in AUTHOR_SELECTORS:
-        el = soup.select_one(selector)
-        if el:
-            text = el.get_text(strip=True)
+    for xpath in _AUTHOR_XPATHS:
+        found = xpath(root)
+        if found:
+            text = _element_text(found[0])
             # Filter out long blocks that are likely not just an author name
             if text and 2 < len(text) < 80:
                 # Strip common prefixes: "By John Smith" → "John Smith"
@@ -396,18 +668,17 @@ def _extract_author(soup: BeautifulSoup, ld: dict) -> str:
     return ""
 
 
-def _extract_published_date(soup: BeautifulSoup, ld: dict) -> str:
+def _extract_published_date(meta: MetaIndex) -> str:
     """
     Try multiple sources for the article published date (ISO format).
     Returns the first non-empty value found.
     """
+    ld = meta.ld
     candidates = [
-        _get_meta(soup, property="article:published_time"),
-        _get_meta(soup, property="og:published_time"),
-        _get_meta(soup, name="date"),
-        _get_meta(soup, name="pubdate"),
-        _get_meta(soup, name="publish_date"),
-        _get_meta(soup, name="DC.date"),
+        *(meta.get(key) for key in (
+            "article:published_time", "og:published_time",
+            "date", "pubdate", "publish_date", "dc.date",
+        )),
         str(ld.get("datePublished") or ""),
         str(ld.get("dateCreated") or ""),
         str(ld.get("dateModified") or ""),
@@ -460,6 +731,77 @@ def _infer_category(title: str, description: str, keywords: list[str]) -> str:
     return "Technology"
 
 
+def _extract_page(html: str, url: str) -> dict[str, Any]:
+    """
+    Parse an HTML document once and extract every field scrape_url() returns.
+    Pure and CPU-bound — no I/O.
+    """
+    root = _parse_html(html)
+    meta = _build_meta_index(root)
+    ld = meta.ld
+    domain = urlparse(url).netloc.replace("www.", "")
+
+    # --- site / publication name -------------------------------------------
+    site_name = (
+        meta.get("og:site_name")
+        or (ld.get("publisher", {}).get("name") if isinstance(ld.get("publisher"), dict) else "")
+        or domain
+    )
+
+    # --- title (prefer og:title; strip site suffix from raw <title>) --------
+    raw_title = (
+        meta.get("og:title", "twitter:title")
+        or str(ld.get("headline") or "")
+        or meta.title
+    )
+    title = _clean_title(raw_title, site_name)
+
+    # --- description --------------------------------------------------------
+    description = (
+        meta.get("og:description", "twitter:description", "description")
+        or str(ld.get("description") or "")
+    )
+
+    # --- cover image --------------------------------------------------------
+    ld_image = ld.get("image")
+    ld_image_url = (
+        ld_image.get("url", "") if isinstance(ld_image, dict)
+        else (ld_image[0] if isinstance(ld_image, list) else str(ld_image or ""))
+    )
+    image_url = meta.get("og:image", "twitter:image") or ld_image_url
+
+    # --- date ---------------------------------------------------------------
+    published_time = _extract_published_date(meta)
+
+    # --- author -------------------------------------------------------------
+    author = _extract_author(meta, root)
+
+    # --- keywords & article section ----------------------------------------
+    keywords = _extract_keywords(meta)
+    article_section = (
+        meta.get("article:section")
+        or str(ld.get("articleSection") or "")
+    )
+
+    # --- full-text snippet for AI enrichment / excerpt fallback -------------
+    # Runs last: it strips boilerplate elements from the tree in place.
+    content_snippet = _extract_main_text(root)
+
+    return {
+        "url": url,
+        "title": title,
+        "description": description,
+        "image_url": image_url or "",
+        "site_name": site_name,
+        "published_time": published_time,
+        "author": author,
+        "domain": domain,
+        "content_snippet": content_snippet,
+        "keywords": keywords,              # list[str]
+        "article_section": article_section,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Main scrape entry point
 # ---------------------------------------------------------------------------
@@ -477,6 +819,11 @@ async def scrape_url(url: str) -> dict[str, Any]:
       - Instagram / Facebook / LinkedIn: blocked by login walls; returns an
         empty-field dict with `_social_platform` and `_social_username` keys
         so the frontend can show a specialised entry form.
+
+    Requests are paced per host (see host_limiter).  While a host's circuit
+    breaker is open no request is made and an empty-field dict flagged with
+    `_circuit_open` is returned instead; analyze_with_ai() then answers with
+    the fallback extraction immediately.
     """
     # -----------------------------------------------------------------------
     # Social-platform short-circuit
@@ -490,7 +837,7 @@ async def scrape_url(url: str) -> dict[str, Any]:
         author     = ""
         thumb      = ""
         if oembed:
-            tweet_text = _extract_tweet_text(oembed.get("html", ""))
+            tweet_text = await _run_parse(_extract_tweet_text, oembed.get("html", ""))
             author     = oembed.get("author_name", "")
             thumb      = oembed.get("thumbnail_url", "")
 
@@ -562,25 +909,34 @@ async def scrape_url(url: str) -> dict[str, Any]:
     # -----------------------------------------------------------------------
     # Normal HTML scrape
     # -----------------------------------------------------------------------
-    async with httpx.AsyncClient(
-        timeout=30.0,
-        follow_redirects=True,
-        headers=SCRAPER_HEADERS,
-        verify=False,  # some sites (e.g. Indonesian universities) have self-signed / expired certs
-    ) as client:
-        response = await client.get(url)
-
-    # For 5xx errors on the target server, still attempt to parse whatever HTML came back.
-    # Only raise for client-side errors (4xx) that indicate access denial.
-    if response.status_code in (401, 403, 407):
-        response.raise_for_status()
-    elif response.status_code >= 400:
+    host = host_key(url)
+    if not await host_limiter.acquire(host):
+        logger.info("Circuit for %s is open — skipping fetch of %s.", host, url)
+        return _build_circuit_open_metadata(url)
+
+    try:
+        async with httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            headers=SCRAPER_HEADERS,
+            verify=False,  # some sites (e.g. Indonesian universities) have self-signed / expired certs
+        ) as client:
+            # For 5xx errors on the target server, still attempt to parse whatever HTML came back.
+            # _fetch_html only raises for client-side errors (401/403/407) that indicate access denial.
+            page = await _fetch_html(client, url)
+    except BaseException as exc:
+        _record_host_outcome(host, exc=exc)
+        raise
+    response = page.response
+    _record_host_outcome(host, status_code=response.status_code)
+
+    if response.status_code >= 400:
         logger.warning(
             "Target URL %s returned HTTP %s — attempting to parse anyway.",
             url, response.status_code,
         )
 
-    html = response.text
+    html = page.html
     if not html or len(html.strip()) < 100:
         raise httpx.HTTPStatusError(
             f"HTTP {response.status_code}: empty or unusable response body",
@@ -588,91 +944,49 @@ async def scrape_url(url: str) -> dict[str, Any]:
             response=response,
         )
 
-    soup = BeautifulSoup(html, "lxml")
-    ld = _get_ld_json(soup)
-    domain = urlparse(url).netloc.replace("www.", "")
-
-    # --- site / publication name -------------------------------------------
-    site_name = (
-        _get_meta(soup, property="og:site_name")
-        or (ld.get("publisher", {}).get("name") if isinstance(ld.get("publisher"), dict) else "")
-        or domain
-    )
-
-    # --- title (prefer og:title; strip site suffix from raw <title>) --------
-    raw_title = (
-        _get_meta(soup, property="og:title")
-        or _get_meta(soup, name="twitter:title")
-        or str(ld.get("headline") or "")
-        or ((soup.title.string or "").strip() if soup.title else "")
-    )
-    title = _clean_title(raw_title, site_name)
-
-    # --- description --------------------------------------------------------
-    description = (
-        _get_meta(soup, property="og:description")
-        or _get_meta(soup, name="twitter:description")
-        or _get_meta(soup, name="description")
-        or str(ld.get("description") or "")
-    )
-
-    # --- cover image --------------------------------------------------------
-    ld_image = ld.get("image")
-    ld_image_url = (
-        ld_image.get("url", "") if isinstance(ld_image, dict)
-        else (ld_image[0] if isinstance(ld_image, list) else str(ld_image or ""))
-    )
-    image_url = (
-        _get_meta(soup, property="og:image")
-        or _get_meta(soup, name="twitter:image")
-        or ld_image_url
-    )
-
-    # --- date ---------------------------------------------------------------
-    published_time = _extract_published_date(soup, ld)
-
-    # --- author -------------------------------------------------------------
-    author = _extract_author(soup, ld)
+    return await _run_parse(_extract_page, html, url)
 
-    # --- keywords & article section ----------------------------------------
-    keywords = _extract_keywords(soup, ld)
-    article_section = (
-        _get_meta(soup, property="article:section")
-        or str(ld.get("articleSection") or "")
-    )
 
-    # --- full-text snippet for AI enrichment / excerpt fallback -------------
-    content_snippet = _extract_main_text(soup)
-
-    return {
-        "url": url,
-        "title": title,
-        "description": description,
-        "image_url": image_url or "",
-        "site_name": site_name,
-        "published_time": published_time,
-        "author": author,
-        "domain": domain,
-        "content_snippet": content_snippet,
-        "keywords": keywords,              # list[str]
-        "article_section": article_section,
-    }
+def describe_fetch_error(exc: Exception, url: str) -> tuple[int, str]:
+    """
+    Map an exception raised by scrape_url() to an (HTTP status, detail) pair
+    suitable for the admin UI.  Shared by the synchronous endpoint and the
+    background job worker so both report failures identically.
+    """
+    if isinstance(exc, httpx.TimeoutException):
+        return 504, f"The target URL timed out: {url}"
+    if isinstance(exc, HostRateLimited):
+        return 429, (
+            f"Too many recent requests to {exc.host}; try again in about "
+            f"{exc.wait:.0f} seconds."
+        )
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        if code == 403:
+            detail = f"The target site blocked the request (HTTP 403 Forbidden): {url}"
+        elif code == 401:
+            detail = f"The target site requires authentication (HTTP 401): {url}"
+        elif code in (500, 502, 503, 504):
+            detail = (
+                f"The target site is currently unavailable (HTTP {code}): {url}. "
+                f"This is a problem on their server, not ours. Try again later."
+            )
+        else:
+            detail = f"The target site returned HTTP {code}: {url}"
+        return 502, detail
+    if isinstance(exc, httpx.ConnectError):
+        return 502, f"Could not connect to the target site ({url}): {exc}"
+    if isinstance(exc, httpx.UnsupportedProtocol):
+        return 400, f"Unsupported protocol for URL {url}: {exc}"
+    if isinstance(exc, TimeoutError):
+        return 504, f"Processing the page took too long: {url}"
+    return 502, f"Failed to fetch the URL: {exc}"
 
 
 # ---------------------------------------------------------------------------
 # Z.AI analysis
 # ---------------------------------------------------------------------------
 
-def _slugify(text: str) -> str:
-    slug = text.lower().strip()
-    # Normalise unicode dashes/punctuation that aren't caught by \w
-    slug = re.sub(r"[\u2012-\u2015\u2212\u2E3A\u2E3B\uFE58\uFE63\uFF0D]", "-", slug)
-    slug = re.sub(r"[^\w\s-]", "", slug)
-    slug = re.sub(r"[\s_]+", "-", slug)
-    slug = re.sub(r"-+", "-", slug)          # collapse multiple dashes
-    return slug.strip("-")[:80]              # remove leading/trailing dashes
-
-
 SYSTEM_PROMPTS: dict[ContentType, str] = {
     "press_mention": """You are a press-coverage analyzer. Given scraped web page data, extract and return ONLY a JSON object with these exact fields:
 {
@@ -721,36 +1035,89 @@ Return ONLY the JSON object. No prose, no markdown fences.""",
 }
 
 
-async def analyze_with_ai(scraped: dict[str, Any], content_type: ContentType) -> dict[str, Any]:
-    """
-    Send scraped page data to Z.AI and return structured JSON for the given content type.
-    Falls back to a raw extraction if the API key is not configured or the call fails.
+# The fields each prompt above asks for, in order; the flags are booleans
+# and everything else is a string.
+RESPONSE_FIELDS: dict[ContentType, tuple[str, ...]] = {
+    "press_mention": (
+        "title", "publication", "publication_url", "publication_date", "excerpt", "image_url", "is_featured",
+    ),
+    "blog_article": (
+        "title", "slug", "excerpt", "category", "tags", "cover_image_url", "is_external", "external_url",
+        "external_source",
+    ),
+    "project": (
+        "title", "tagline", "description", "github_url", "live_url", "role", "challenges", "solutions", "impact",
+    ),
+}
+_BOOLEAN_FIELDS = frozenset({"is_featured", "is_external"})
 
-    Social-platform shortcut:
-    - Instagram / Facebook / LinkedIn: all fields are empty (login-walled), so
-      AI has nothing to work with. Skip the API call and return the fallback
-      immediately.  The `_social_platform` hint is preserved so the frontend
-      knows to show a specialised entry form.
-    - Twitter/X: tweet text comes back via oEmbed; AI enrichment is still
-      worthwhile for a concise excerpt, so the call proceeds normally.
-    """
+
+def _skip_analysis(scraped: dict[str, Any]) -> bool:
+    """True when this page should not be sent to the model at all."""
     social_platform = scraped.get("_social_platform")
     if social_platform in ("instagram", "facebook", "linkedin"):
         logger.info(
             "Skipping AI enrichment for %s URL — content is login-walled.", social_platform,
         )
-        return _fallback_extraction(scraped, content_type)
+        return True
+    if scraped.get("_circuit_open"):
+        logger.info("Skipping AI enrichment for %s — host circuit is open.", scraped["url"])
+        return True
+    return False
+
 
-    if not settings.ZAI_API_KEY:
+def _llm_client() -> LLMClient | None:
+    client = get_llm_client()
+    if client is None:
         logger.warning("ZAI_API_KEY not set — returning raw scraped data without AI enrichment.")
-        return _fallback_extraction(scraped, content_type)
+    return client
 
-    client = AsyncOpenAI(
-        api_key=settings.ZAI_API_KEY,
-        base_url=settings.ZAI_BASE_URL,
-        timeout=float(settings.ZAI_SCRAPER_TIMEOUT),
-    )
 
+def _analysis_client(scraped: dict[str, Any]) -> LLMClient | None:
+    """The shared LLM client, or None when AI enrichment should be skipped."""
+    if _skip_analysis(scraped):
+        return None
+    return _llm_client()
+
+
+def _response_format(content_type: ContentType | None = None, batch_size: int | None = None) -> dict[str, Any]:
+    """`response_format` keyword for a completion (empty when ZAI_RESPONSE_FORMAT is off)."""
+    mode = settings.ZAI_RESPONSE_FORMAT
+    if not mode:
+        return {}
+    if mode == "json_object" or content_type is None or batch_size is None:
+        return {"response_format": {"type": "json_object"}}
+    # Every field of the prompt, typed, so a malformed item is rejected by
+    # the API rather than by _parse_batch_response().
+    properties: dict[str, Any] = {
+        field: {"type": "boolean" if field in _BOOLEAN_FIELDS else "string"}
+        for field in RESPONSE_FIELDS[content_type]
+    }
+    properties["document"] = {"type": "integer", "minimum": 1, "maximum": batch_size}
+    document = {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+    schema = {
+        "type": "object",
+        "properties": {
+            "results": {"type": "array", "items": document, "minItems": batch_size, "maxItems": batch_size},
+        },
+        "required": ["results"],
+        "additionalProperties": False,
+    }
+    return {"response_format": {
+        "type": "json_schema",
+        "json_schema": {"name": "batch_analysis", "strict": True, "schema": schema},
+    }}
+
+
+def _build_user_message(
+    scraped: dict[str, Any], content_type: ContentType, compact: bool | None = None,
+) -> str:
+    """The page as a prompt; `compact` (default ZAI_COMPACT_CONTENT) sends key sentences only."""
     # Build a platform-context hint so the AI knows what kind of source this is.
     _platform = scraped.get("_social_platform", "")
     _is_x_article = scraped.get("_is_x_article", False)
@@ -766,7 +1133,20 @@ async def analyze_with_ai(scraped: dict[str, Any], content_type: ContentType) ->
     else:
         platform_note = ""
 
-    user_message = f"""URL: {scraped["url"]}
+    content = scraped["content_snippet"]
+    content_label = "Page content (first ~5000 chars)"
+    if compact is None:
+        compact = settings.ZAI_COMPACT_CONTENT
+    if compact and content:
+        compacted = compact_keeping_terms(
+            content,
+            token_budget(content_type),
+            context=(scraped["title"], scraped["description"]),
+        )
+        if compacted != content:
+            content, content_label = compacted, "Key sentences from the page"
+
+    return f"""URL: {scraped["url"]}
 Title: {scraped["title"]}
 Site/Publication: {scraped["site_name"]}{platform_note}
 Published: {scraped["published_time"]}
@@ -774,47 +1154,320 @@ Author: {scraped["author"]}
 Description: {scraped["description"]}
 Image: {scraped["image_url"]}
 
-Page content (first ~5000 chars):
-{scraped["content_snippet"]}"""
+{content_label}:
+{content}"""
+
+
+def _build_messages(scraped: dict[str, Any], content_type: ContentType) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPTS[content_type]},
+        {"role": "user", "content": _build_user_message(scraped, content_type)},
+    ]
+
+
+def _strip_code_fences(raw: str) -> str:
+    # Strip markdown code fences if present
+    raw = re.sub(r"^```(?:json)?\s*", "", raw.strip())
+    return re.sub(r"\s*```$", "", raw.strip())
+
+
+def _is_blank(value: Any) -> bool:
+    return value in (None, "", [], {})
+
+
+def _merge_with_fallback(ai_result: dict[str, Any], fallback: dict[str, Any]) -> dict[str, Any]:
+    # Guarantee no empty fields: AI takes priority, but any blank AI value
+    # falls back to the fast OG-tag extraction so the form is always useful.
+    result = {
+        k: (v if not _is_blank(v) else fallback.get(k, v))
+        for k, v in ai_result.items()
+    }
+    # Include any fallback keys the AI didn't return at all
+    for k, v in fallback.items():
+        if k not in result or _is_blank(result[k]):
+            result[k] = v
+    return result
+
+
+async def analyze_with_ai(scraped: dict[str, Any], content_type: ContentType) -> dict[str, Any]:
+    """
+    Send scraped page data to Z.AI and return structured JSON for the given content type.
+    Falls back to a raw extraction if the API key is not configured or the call fails.
+
+    Social-platform shortcut:
+    - Instagram / Facebook / LinkedIn: all fields are empty (login-walled), so
+      AI has nothing to work with. Skip the API call and return the fallback
+      immediately.  The `_social_platform` hint is preserved so the frontend
+      knows to show a specialised entry form.
+    - Twitter/X: tweet text comes back via oEmbed; AI enrichment is still
+      worthwhile for a concise excerpt, so the call proceeds normally.
+    """
+    client = _analysis_client(scraped)
+    if client is None:
+        return _fallback_extraction(scraped, content_type)
+    return await _analyze_one(client, scraped, content_type)
 
+
+async def _analyze_one(client: LLMClient, scraped: dict[str, Any], content_type: ContentType) -> dict[str, Any]:
     try:
-        completion = await client.chat.completions.create(
-            model=settings.ZAI_MODEL,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPTS[content_type]},
-                {"role": "user", "content": user_message},
-            ],
+        completion = await client.chat(
+            _build_messages(scraped, content_type),
             temperature=0.2,
             max_tokens=1024,
+            **_response_format(),
         )
 
-        raw = completion.choices[0].message.content or "{}"
-
-        # Strip markdown code fences if present
-        raw = re.sub(r"^```(?:json)?\s*", "", raw.strip())
-        raw = re.sub(r"\s*```$", "", raw.strip())
-
+        raw = _strip_code_fences(completion.choices[0].message.content or "{}")
         ai_result = json.loads(raw)
-
-        # Guarantee no empty fields: AI takes priority, but any blank AI value
-        # falls back to the fast OG-tag extraction so the form is always useful.
-        fallback = _fallback_extraction(scraped, content_type)
-        result = {
-            k: (v if v not in (None, "", [], {}) else fallback.get(k, v))
-            for k, v in ai_result.items()
-        }
-        # Include any fallback keys the AI didn't return at all
-        for k, v in fallback.items():
-            if k not in result or result[k] in (None, "", [], {}):
-                result[k] = v
-
-        return result
+        return _merge_with_fallback(ai_result, _fallback_extraction(scraped, content_type))
 
     except (json.JSONDecodeError, Exception) as exc:
+        # LLMClient has already retried transient failures within the deadline.
         logger.error("Z.AI analysis failed: %s — falling back to raw extraction.", exc)
         return _fallback_extraction(scraped, content_type)
 
 
+_BATCH_INSTRUCTIONS = """
+
+BATCH MODE: the user message contains {count} documents, each starting with a
+line "### Document <n>".  Apply the instructions above to every document
+independently and return ONLY a JSON object {{"results": [...]}} whose array
+holds exactly {count} objects, in document order.  Each object has the fields
+listed above plus "document": <n>.  No prose, no markdown fences."""
+
+
+def _build_batch_messages(
+    batch: list[dict[str, Any]], content_type: ContentType,
+) -> list[dict[str, str]]:
+    documents = "\n\n".join(
+        f"### Document {n}\n{_build_user_message(scraped, content_type, settings.ZAI_BATCH_COMPACT_CONTENT)}"
+        for n, scraped in enumerate(batch, start=1)
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPTS[content_type] + _BATCH_INSTRUCTIONS.format(count=len(batch))},
+        {"role": "user", "content": documents},
+    ]
+
+
+def _parse_batch_response(raw: str, count: int) -> list[dict[str, Any] | None]:
+    """
+    Map a batch completion back to its documents.  Accepts the requested
+    {"results": [...]} object or a bare array; entries that are missing or
+    malformed come back as None, and a response holding no array at all
+    raises ValueError.
+    """
+    data = json.loads(_strip_code_fences(raw))
+    if isinstance(data, dict):
+        # {"results": [...]}, or whatever key the model chose for the array.
+        data = next((v for v in data.values() if isinstance(v, list)), data)
+    if not isinstance(data, list):
+        raise ValueError("batch response is not a JSON array")
+
+    results: list[dict[str, Any] | None] = [None] * count
+    for position, item in enumerate(data):
+        if not isinstance(item, dict):
+            continue
+        item = dict(item)
+        number = item.pop("document", None)
+        index = number - 1 if isinstance(number, int) and 1 <= number <= count else position
+        if index < count and results[index] is None:
+            results[index] = item
+    return results
+
+
+async def _analyze_batch(
+    client: LLMClient, batch: list[dict[str, Any]], content_type: ContentType,
+) -> list[dict[str, Any]]:
+    if len(batch) == 1:
+        return [await _analyze_one(client, batch[0], content_type)]
+
+    fallbacks = [_fallback_extraction(scraped, content_type) for scraped in batch]
+    try:
+        completion = await client.chat(
+            _build_batch_messages(batch, content_type),
+            temperature=0.2,
+            max_tokens=min(1024 * len(batch), 8192),
+            **_response_format(content_type, len(batch)),
+        )
+        parsed = _parse_batch_response(completion.choices[0].message.content or "", len(batch))
+    except Exception as exc:
+        logger.warning(
+            "Batched Z.AI analysis of %d documents failed (%s) — retrying one by one.",
+            len(batch), exc,
+        )
+        parsed = [None] * len(batch)
+
+    missing = [i for i, item in enumerate(parsed) if item is None]
+    if missing and len(missing) < len(batch):
+        logger.warning("Batch response lacked %d of %d documents — retrying those one by one.",
+                       len(missing), len(batch))
+    retried = await asyncio.gather(*(_analyze_one(client, batch[i], content_type) for i in missing))
+    results = dict(zip(missing, retried))
+    return [
+        results[i] if i in results else _merge_with_fallback(item or {}, fallbacks[i])
+        for i, item in enumerate(parsed)
+    ]
+
+
+async def analyze_many_with_ai(
+    items: list[dict[str, Any]],
+    content_type: ContentType,
+    batch_size: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Analyze several scraped pages with as few completions as possible.
+
+    Pages that would skip AI anyway (login-walled, open circuit, no API key)
+    get their fallback extraction.  The rest are packed `batch_size` at a
+    time (default ZAI_BATCH_SIZE), each compacted unless
+    ZAI_BATCH_COMPACT_CONTENT is off, into one request that must answer with
+    one object per document; documents the model drops or mangles — or a
+    whole batch that cannot be parsed — fall back to one analyze_with_ai()
+    call each.
+    Results are returned in input order.
+    """
+    size = max(1, batch_size or settings.ZAI_BATCH_SIZE)
+    results: list[dict[str, Any] | None] = [None] * len(items)
+    # Resolved once for the whole call, so a missing key is reported once.
+    client = _llm_client() if items else None
+    pending = [i for i, scraped in enumerate(items) if client is not None and not _skip_analysis(scraped)]
+    if pending and client is not None:
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        analysed = await asyncio.gather(*(
+            _analyze_batch(client, [items[i] for i in chunk], content_type) for chunk in chunks
+        ))
+        for chunk, chunk_results in zip(chunks, analysed):
+            for i, result in zip(chunk, chunk_results):
+                results[i] = result
+    return [r if r is not None else _fallback_extraction(items[i], content_type) for i, r in enumerate(results)]
+
+
+class JSONFieldStream:
+    """
+    Incremental parser for the single JSON object the model is asked to return.
+
+    feed() accepts raw completion deltas and returns the top-level
+    `(key, value)` pairs whose values finished in that chunk, so fields can
+    be forwarded while the rest of the object is still being generated.
+    Anything before the opening brace (e.g. a markdown fence) is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key: str | None = None
+        self._key_start = -1
+        self._value_start = -1
+        self.fields: dict[str, Any] = {}
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self._buf += chunk
+        completed: list[tuple[str, Any]] = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf) and not self.done:
+            ch = buf[i]
+            if self._depth == 0 and ch != "{":
+                i += 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key is None and self._value_start < 0:
+                        self._key = json.loads(buf[self._key_start:i + 1])
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None and self._value_start < 0:
+                    self._key_start = i
+                elif self._depth == 1 and self._value_start < 0:
+                    self._value_start = i
+            elif ch in "{[":
+                if self._depth == 1 and self._key is not None and self._value_start < 0:
+                    self._value_start = i
+                self._depth += 1
+            elif ch in "}]" or (ch == "," and self._depth == 1):
+                if self._depth == 1 and self._key is not None and self._value_start >= 0:
+                    self._complete(buf[self._value_start:i], completed)
+                if ch != ",":
+                    self._depth -= 1
+                    if self._depth == 0 and ch == "}":
+                        self.done = True
+            elif ch == ":" or ch.isspace():
+                pass
+            elif self._depth == 1 and self._key is not None and self._value_start < 0:
+                # Bare literal: number, true / false / null.
+                self._value_start = i
+            i += 1
+        self._pos = i
+        return completed
+
+    def _complete(self, raw: str, completed: list[tuple[str, Any]]) -> None:
+        key = self._key
+        self._key = None
+        self._value_start = -1
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        if key is not None:
+            self.fields[key] = value
+            completed.append((key, value))
+
+
+async def analyze_with_ai_stream(
+    scraped: dict[str, Any], content_type: ContentType,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Streaming variant of analyze_with_ai() for incremental form prefill.
+
+    Yields `(event, payload)` pairs:
+      - ("fallback", {"data": ...})        the instant non-AI extraction, first;
+      - ("field", {"name": ..., "value": ...})  each AI field as soon as its
+        JSON value is complete (blank values are skipped — the fallback stands);
+      - ("done", {"data": ..., "ai": bool})     the merged result, always last.
+    Errors never escape: the stream ends with the fallback data instead.
+    """
+    fallback = _fallback_extraction(scraped, content_type)
+    yield "fallback", {"data": fallback}
+
+    client = _analysis_client(scraped)
+    if client is None:
+        yield "done", {"data": fallback, "ai": False}
+        return
+
+    parser = JSONFieldStream()
+    stream = client.stream_chat(
+        _build_messages(scraped, content_type),
+        temperature=0.2,
+        max_tokens=1024,
+        **_response_format(),
+    )
+    try:
+        async for delta in stream:
+            for name, value in parser.feed(delta):
+                if not _is_blank(value):
+                    yield "field", {"name": name, "value": value}
+            if parser.done:
+                break
+    except Exception as exc:
+        logger.error("Z.AI streaming analysis failed: %s — falling back to raw extraction.", exc)
+    finally:
+        await stream.aclose()
+
+    if not parser.fields:
+        yield "done", {"data": fallback, "ai": False}
+        return
+    yield "done", {"data": _merge_with_fallback(parser.fields, fallback), "ai": True}
+
+
 def _fallback_extraction(scraped: dict[str, Any], content_type: ContentType) -> dict[str, Any]:
     """
     Rich best-effort structured extraction without AI.
@@ -868,7 +1521,7 @@ def _fallback_extraction(scraped: dict[str, Any], content_type: ContentType) ->
         tags_str = "; ".join(keywords[:8]) if keywords else ""
         return {
             "title":            title,
-            "slug":             _slugify(title),
+            "slug":             slugify(title),
             "excerpt":          excerpt,
             "category":         category,
             "tags":             tags_str,
@@ -0,0 +1,233 @@
+"""
+summarizer.py
+-------------
+Local extractive compaction of scraped page text before it is sent to Z.AI.
+
+The model only needs a handful of salient sentences to write a headline,
+excerpt or tagline, yet the prompt used to carry the first ~5000 characters
+of body text verbatim.  compact_text() keeps the most central sentences
+within a token budget:
+
+  1. split the text into sentences (block breaks first, then . ! ?);
+  2. build a sparse TF-IDF vector per sentence;
+  3. rank sentences with TextRank (PageRank over cosine similarity), with
+     a small bonus for terms shared with the page title / description and
+     for lead sentences;
+  4. keep the best-ranked sentences until the budget is spent and return
+     them in their original order.
+
+compact_keeping_terms() is what prompts use.  It guards against the two
+ways the plain summary lost key terms on the bench_prompt_size.py fixtures.
+First, it adds back the best-ranked sentence for any title / description
+term the summary dropped.  Second, it sends the text whole when the summary
+would save less than a third of it.
+
+A snippet holds a few dozen sentences, so plain dicts are fast enough and
+no numeric library is needed.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Iterable
+
+# Rough budget of body-text tokens per content type.  Press mentions and
+# blog articles only need an excerpt; projects ask for challenges /
+# solutions / impact and get more room.
+CONTENT_TOKEN_BUDGETS: dict[str, int] = {
+    "press_mention": 250,
+    "blog_article": 350,
+    "project": 700,
+}
+DEFAULT_TOKEN_BUDGET = 400
+
+# compact_keeping_terms() sends the whole text unless the summary is at
+# most this share of it.
+MAX_COMPACT_RATIO = 2 / 3
+
+_DAMPING = 0.85
+_MAX_ITERATIONS = 50
+_TOLERANCE = 1e-6
+_MIN_SENTENCE_WORDS = 4
+
+_BLOCK_SPLIT_RE = re.compile(r"\n+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+(?=[\"'“‘(\[]?[A-Z0-9À-Ý])")
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Function words in the languages the site is written in (English and
+# Indonesian); they carry no topical signal.
+_STOPWORDS = frozenset(
+    """
+    a about after all also an and any are as at be been but by can could did do
+    does for from had has have he her his how i if in into is it its just more
+    most my no not of on one or our out she so some such than that the their
+    them then there these they this those to up was we were what when which
+    who will with would you your
+    ada adalah akan atau bagi bahwa banyak belum bisa dalam dan dari dengan di
+    dia ini itu juga ke kami kita lebih masih oleh pada para saat sebagai
+    sejak sudah tak tersebut tidak untuk yang
+    """.split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for Latin-script text)."""
+    return (len(text) + 3) // 4
+
+
+def _tokenize(text: str) -> list[str]:
+    return [
+        w for w in (m.group(0).lower() for m in _WORD_RE.finditer(text))
+        if len(w) > 2 and w not in _STOPWORDS
+    ]
+
+
+def split_sentences(text: str) -> list[str]:
+    sentences: list[str] = []
+    for block in _BLOCK_SPLIT_RE.split(text):
+        block = block.strip()
+        if block:
+            sentences.extend(s.strip() for s in _SENTENCE_SPLIT_RE.split(block) if s.strip())
+    return sentences
+
+
+def _tfidf_vectors(token_lists: list[list[str]]) -> list[dict[str, float]]:
+    n = len(token_lists)
+    df: Counter[str] = Counter()
+    for tokens in token_lists:
+        df.update(set(tokens))
+    idf = {term: math.log(1 + n / (1 + count)) for term, count in df.items()}
+
+    vectors: list[dict[str, float]] = []
+    for tokens in token_lists:
+        counts = Counter(tokens)
+        vec = {term: (1 + math.log(c)) * idf[term] for term, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        vectors.append({term: v / norm for term, v in vec.items()})
+    return vectors
+
+
+def _cosine(a: dict[str, float], b: dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b[t] for t, v in a.items() if t in b)
+
+
+def _textrank(vectors: list[dict[str, float]]) -> list[float]:
+    n = len(vectors)
+    weights = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            sim = _cosine(vectors[i], vectors[j])
+            if sim > 0:
+                weights[i][j] = weights[j][i] = sim
+    out_weight = [sum(row) for row in weights]
+
+    scores = [1.0 / n] * n
+    base = (1 - _DAMPING) / n
+    for _ in range(_MAX_ITERATIONS):
+        new = [
+            base + _DAMPING * sum(
+                scores[j] * weights[j][i] / out_weight[j]
+                for j in range(n) if weights[j][i] and out_weight[j]
+            )
+            for i in range(n)
+        ]
+        delta = sum(abs(x - y) for x, y in zip(new, scores))
+        scores = new
+        if delta < _TOLERANCE:
+            break
+    return scores
+
+
+def rank_sentences(sentences: list[str], context: Iterable[str] = ()) -> list[float]:
+    """
+    Score each sentence by TextRank centrality, boosted by overlap with the
+    `context` strings (title, description) and by position.
+    """
+    token_lists = [_tokenize(s) for s in sentences]
+    vectors = _tfidf_vectors(token_lists)
+    scores = _textrank(vectors)
+
+    context_terms = set(_tokenize(" ".join(context)))
+    ranked: list[float] = []
+    for idx, (score, tokens) in enumerate(zip(scores, token_lists)):
+        overlap = len(context_terms.intersection(tokens)) / len(context_terms) if context_terms else 0.0
+        lead = 1.0 / (1 + idx)
+        ranked.append(score * (1 + overlap + 0.5 * lead))
+    return ranked
+
+
+def compact_text(text: str, max_tokens: int, context: Iterable[str] = ()) -> str:
+    """
+    Return the highest-ranked sentences of `text` (in original order) that
+    fit in roughly `max_tokens`.  Text that already fits is returned as-is.
+    """
+    text = text.strip()
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sentences = [s for s in split_sentences(text) if len(s.split()) >= _MIN_SENTENCE_WORDS]
+    if len(sentences) < 2:
+        return text[: max_tokens * 4]
+
+    scores = rank_sentences(sentences, context)
+    chosen: list[int] = []
+    used = 0
+    for idx in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+        cost = estimate_tokens(sentences[idx]) + 1
+        if used + cost > max_tokens:
+            continue
+        chosen.append(idx)
+        used += cost
+    if not chosen:
+        # Every sentence is longer than the budget: truncate the best one.
+        return sentences[max(range(len(sentences)), key=lambda i: scores[i])][: max_tokens * 4]
+    return "\n".join(sentences[i] for i in sorted(chosen))
+
+
+def compact_keeping_terms(text: str, max_tokens: int, context: Iterable[str] = ()) -> str:
+    """
+    compact_text() that keeps every `context` term found in the text: for
+    each one the summary dropped, the best-ranked sentence holding it is
+    added back.  Returns `text` unchanged when the result would still be
+    more than MAX_COMPACT_RATIO of it.
+    """
+    text = text.strip()
+    compacted = compact_text(text, max_tokens, context)
+    if compacted == text:
+        return text
+
+    sentences = [s for s in split_sentences(text) if len(s.split()) >= _MIN_SENTENCE_WORDS]
+    token_lists = [_tokenize(s) for s in sentences]
+    present = set(_tokenize(compacted))
+    added: set[int] = set()
+    scores: list[float] | None = None
+    for term in dict.fromkeys(_tokenize(" ".join(context))):
+        holders = [i for i, tokens in enumerate(token_lists) if term in tokens]
+        if term in present or not holders:
+            continue
+        if scores is None:
+            scores = rank_sentences(sentences, context)
+        best = max(holders, key=lambda i: scores[i])
+        added.add(best)
+        present.update(token_lists[best])
+    if added:
+        lines = compacted.split("\n")
+        if set(lines) <= set(sentences):
+            # Whole sentences: keep the page order.
+            kept = set(lines) | {sentences[i] for i in added}
+            compacted = "\n".join(s for s in sentences if s in kept)
+        else:
+            # compact_text() truncated; append the additions.
+            compacted = "\n".join([compacted, *(sentences[i] for i in sorted(added))])
+
+    if estimate_tokens(compacted) > estimate_tokens(text) * MAX_COMPACT_RATIO:
+        return text
+    return compacted
+
+
+def token_budget(content_type: str) -> int:
+    return CONTENT_TOKEN_BUDGETS.get(content_type, DEFAULT_TOKEN_BUDGET)
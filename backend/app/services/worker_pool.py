@@ -0,0 +1,156 @@
+"""
+worker_pool.py
+--------------
+Bounded executor for blocking / CPU-bound work called from async code.
+
+`fastapi.concurrency.run_in_threadpool` shares one AnyIO thread limiter with
+every sync endpoint and dependency, and it has neither a deadline nor any
+visibility into how busy it is.  A WorkerPool instead:
+
+  - owns a dedicated ThreadPoolExecutor of `max_workers` threads (or, with
+    processes=True, a ProcessPoolExecutor for work that holds the GIL —
+    `fn` and its arguments must then be picklable);
+  - admits at most `max_workers + max_queue` calls at once — further callers
+    wait for a slot (backpressure) instead of piling up unbounded;
+  - applies one deadline to waiting + running and raises WorkerPoolTimeout
+    when it expires;
+  - keeps counters exposed via stats() for saturation monitoring.
+
+A call that times out keeps its slot until the worker thread actually
+finishes, so the bound stays honest even when callers give up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_pools: list["WorkerPool"] = []
+
+
+class WorkerPoolTimeout(TimeoutError):
+    """Raised when a call does not finish (or start) within its deadline."""
+
+
+class WorkerPool:
+    def __init__(self, name: str, *, max_workers: int, max_queue: int, processes: bool = False) -> None:
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.processes = processes
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+
+        self._in_flight = 0
+        self._waiting = 0
+        self._peak_in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._busy_seconds = 0.0
+        _pools.append(self)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.processes:
+                # spawn, not fork: the server process runs threads (event loop,
+                # other pools) whose locks a forked child could inherit held.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.name,
+                )
+        return self._executor
+
+    def _release(self, started: float, failed: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._busy_seconds += monotonic() - started
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+        self._slots.release()
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: float) -> T:
+        """Run `fn(*args)` on the pool, waiting at most `timeout` seconds overall."""
+        deadline = monotonic() + timeout
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            raise WorkerPoolTimeout(f"{self.name}: no free worker within {timeout:.1f}s") from None
+        finally:
+            self._waiting -= 1
+
+        started = monotonic()
+        with self._lock:
+            self._in_flight += 1
+            self._submitted += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), fn, *args)
+        except Exception:
+            self._release(started, failed=True)
+            raise
+        future.add_done_callback(
+            lambda f: self._release(started, failed=f.cancelled() or f.exception() is not None)
+        )
+
+        try:
+            # shield: a timed-out call must not cancel the future, otherwise the
+            # slot would be released while the thread is still busy.
+            return await asyncio.wait_for(asyncio.shield(future), timeout=max(0.0, deadline - monotonic()))
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            logger.warning("%s: call to %s exceeded %.1fs", self.name, getattr(fn, "__name__", fn), timeout)
+            raise WorkerPoolTimeout(f"{self.name}: work did not finish within {timeout:.1f}s") from None
+
+    def stats(self) -> dict[str, Any]:
+        running = min(self._in_flight, self.max_workers)
+        return {
+            "name": self.name,
+            "kind": "process" if self.processes else "thread",
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": self._in_flight - running,
+            "waiting_for_slot": self._waiting,
+            "peak_in_flight": self._peak_in_flight,
+            "utilization": round(running / self.max_workers, 3),
+            "saturated": self._waiting > 0,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+            "busy_seconds": round(self._busy_seconds, 3),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def shutdown_pools() -> None:
+    """Stop every pool's executor (called from the application lifespan)."""
+    for pool in _pools:
+        pool.shutdown()
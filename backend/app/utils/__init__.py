@@ -1,3 +1,5 @@
 from .sanitizer import sanitize_html, sanitize_text
+from .slugs import slugify
+from .srcset import build_srcset
 
-__all__ = ["sanitize_html", "sanitize_text"]
\ No newline at end of file
+__all__ = ["build_srcset", "sanitize_html", "sanitize_text", "slugify"]
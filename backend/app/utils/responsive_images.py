@@ -0,0 +1,156 @@
+"""
+Opt-in rewriting of stored Cloudinary image URLs in public API responses.
+
+Content rows keep the original upload URL (full resolution).  When a client
+asks for it — `?images=responsive` or `X-Responsive-Images: 1` — or
+RESPONSIVE_IMAGES_DEFAULT is on, ResponsiveImagesMiddleware rewrites every
+known image field of a public GET JSON response into a delivery URL sized for
+that field (`f_auto,q_auto,c_limit,w_<width>`) and adds a sibling
+`<field>_srcset` with 0.5x / 1x / 2x widths.  Cloudinary generates the
+derivatives on first request; nothing is re-uploaded.
+
+Only plain upload URLs of our cloud are touched: URLs that already carry a
+transformation, other hosts, and admin endpoints (which must show the stored
+value for editing) pass through unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.config import settings
+
+# Display width (CSS px at 1x) per response field.
+FIELD_WIDTHS: dict[str, int] = {
+    "image_url": 1280,
+    "ui_image_url": 1280,
+    "cover_image_url": 1200,
+    "og_image_url": 1200,
+    "institution_background_url": 1600,
+    "thumbnail_url": 480,
+    "avatar_url": 160,
+    "logo_url": 200,
+    "company_logo_url": 200,
+    "institution_logo_url": 200,
+    "icon_url": 64,
+}
+SRCSET_SCALES = (0.5, 1, 2)
+OPT_IN_HEADER = "x-responsive-images"
+
+_UPLOAD_URL = re.compile(r"^(https?://res\.cloudinary\.com/([^/]+)/image/upload/)(.+)$")
+# Cloudinary's transformation parameters.  A path segment is a transformation
+# only if every comma-separated component is one of these followed by "_"
+# (w_400, c_fill,g_face, t_thumb, $w_100, ...), so folders such as ai_art/ or
+# ui_kit/ are not mistaken for one.
+_TRANSFORMATION_PARAMS = (
+    "a", "ac", "af", "ar", "b", "bo", "br", "c", "co", "cs", "d", "dl", "dn", "dpr", "du", "e",
+    "eo", "f", "fl", "fn", "fps", "g", "h", "if", "ki", "l", "o", "p", "pg", "q", "r", "so", "sp",
+    "t", "u", "vc", "vs", "w", "x", "y", "z",
+)
+_COMPONENT = rf"(?:(?:{'|'.join(_TRANSFORMATION_PARAMS)})_[^,/]+|\$\w+_[^,/]+)"
+_TRANSFORMATION = re.compile(rf"^{_COMPONENT}(?:,{_COMPONENT})*$")
+
+
+def _has_transformation(rest: str) -> bool:
+    """True if the path after /upload/ starts with a transformation followed by a version or more path."""
+    segment, _, remainder = rest.partition("/")
+    return bool(remainder) and _TRANSFORMATION.match(segment) is not None
+
+
+def transform_url(url: str, width: int) -> str | None:
+    """Delivery URL for `url` at `width` px, or None if it is not ours to rewrite."""
+    match = _UPLOAD_URL.match(url)
+    if not match:
+        return None
+    prefix, cloud, rest = match.groups()
+    if settings.CLOUDINARY_CLOUD_NAME and cloud != settings.CLOUDINARY_CLOUD_NAME:
+        return None
+    if _has_transformation(rest):
+        return None
+    return f"{prefix}f_auto,q_auto,c_limit,w_{width}/{rest}"
+
+
+def rewrite_images(payload: Any) -> Any:
+    """Rewrite FIELD_WIDTHS fields anywhere in a decoded JSON payload, in place."""
+    if isinstance(payload, list):
+        for item in payload:
+            rewrite_images(item)
+    elif isinstance(payload, dict):
+        for key in list(payload):
+            value = payload[key]
+            width = FIELD_WIDTHS.get(key)
+            if width and isinstance(value, str):
+                rewritten = transform_url(value, width)
+                if rewritten:
+                    payload[key] = rewritten
+                    payload[f"{key}_srcset"] = ", ".join(
+                        f"{transform_url(value, round(width * scale))} {round(width * scale)}w"
+                        for scale in SRCSET_SCALES
+                    )
+            elif isinstance(value, (dict, list)):
+                rewrite_images(value)
+    return payload
+
+
+def _opted_in(scope: Scope) -> bool:
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    if "images" in query:
+        return query["images"][-1] == "responsive"
+    for name, value in scope.get("headers", []):
+        if name == OPT_IN_HEADER.encode():
+            return value.decode("latin-1").strip().lower() in ("1", "true", "responsive")
+    return settings.RESPONSIVE_IMAGES_DEFAULT
+
+
+class ResponsiveImagesMiddleware:
+    """Pure ASGI, so responses that are not rewritten are streamed untouched."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not path.startswith(settings.API_V1_STR)
+            or path.startswith(f"{settings.API_V1_STR}/admin")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        opted_in = _opted_in(scope)
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def _send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.add_vary_header("X-Responsive-Images")
+                is_json = headers.get("content-type", "").startswith("application/json")
+                if not (opted_in and is_json and message["status"] == 200):
+                    await send(message)
+                    return
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body"):
+                return
+            payload = rewrite_images(json.loads(b"".join(chunks) or b"null"))
+            body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+            headers = MutableHeaders(scope=start)
+            headers["content-length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, _send)
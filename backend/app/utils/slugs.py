@@ -0,0 +1,12 @@
+import re
+
+
+def slugify(text: str) -> str:
+    """URL-friendly slug: lowercase, words joined by single dashes, at most 80 chars."""
+    slug = text.lower().strip()
+    # Normalise unicode dashes/punctuation that aren't caught by \w
+    slug = re.sub(r"[\u2012-\u2015\u2212\u2E3A\u2E3B\uFE58\uFE63\uFF0D]", "-", slug)
+    slug = re.sub(r"[^\w\s-]", "", slug)
+    slug = re.sub(r"[\s_]+", "-", slug)
+    slug = re.sub(r"-+", "-", slug)          # collapse multiple dashes
+    return slug.strip("-")[:80]              # remove leading/trailing dashes
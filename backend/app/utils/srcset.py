@@ -0,0 +1,16 @@
+from typing import Any
+
+
+def build_srcset(variants: list[dict[str, Any]], original_url: str | None = None,
+                 original_width: int | None = None) -> dict[str, str]:
+    """{"avif": "url 320w, ...", "webp": ...}; the original closes every set when its width is known."""
+    by_format: dict[str, list[tuple[int, str]]] = {}
+    for variant in variants:
+        by_format.setdefault(variant["format"], []).append((variant["width"], variant["url"]))
+    srcset = {}
+    for fmt, entries in by_format.items():
+        entries.sort()
+        if original_url and original_width and original_width > entries[-1][0]:
+            entries.append((original_width, original_url))
+        srcset[fmt] = ", ".join(f"{url} {width}w" for width, url in entries)
+    return srcset
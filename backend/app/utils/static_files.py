@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_SHA256_NAME = re.compile(r"^([0-9a-f]{64})\.\w+$")
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles for media that never changes under a given URL (content-
+    addressed objects, per-upload variant directories).
+
+    Responses are FileResponses, so Range requests and sendfile/pathsend
+    come from Starlette; on top of that every file is marked immutable, and
+    content-addressed files (<sha256>.<ext>) get the hash as a strong ETag
+    instead of the mtime/size one, so it survives copies between hosts.
+    """
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        headers = {"cache-control": IMMUTABLE_CACHE_CONTROL}
+        match = _SHA256_NAME.match(os.path.basename(full_path))
+        if match:
+            headers["etag"] = f'"{match.group(1)}"'
+
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Callable
+
+from fastapi import HTTPException, UploadFile
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def looks_like_image(data: bytes) -> bool:
+    """Quick magic-byte check to reduce content-type spoofing."""
+    if len(data) < 12:
+        return False
+    if data.startswith(b"\xFF\xD8\xFF"):
+        return True  # JPEG
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return True  # PNG
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return True  # GIF
+    if data.startswith(b"RIFF") and data[8:12] == b"WEBP":
+        return True  # WEBP
+    return False
+
+
+async def read_capped_upload(
+    file: UploadFile,
+    *,
+    max_bytes: int,
+    check_head: Callable[[bytes], bool] | None = None,
+    too_large_detail: str = "File is too large.",
+    invalid_detail: str = "Invalid file.",
+    hasher: Any = None,
+    copy_to: BinaryIO | None = None,
+) -> BinaryIO:
+    """
+    Validate an upload in chunks and return its spooled file, rewound.
+
+    Starlette already spools multipart files (in memory up to 1MB, on disk
+    beyond), so the body is never copied into a bytes object here: the
+    first chunk is checked with `check_head`, the size cap is enforced while
+    reading, and the caller gets the same file object to stream onwards.
+    A hashlib object passed as `hasher` is fed every chunk on the way, and
+    a file passed as `copy_to` gets a copy of the body from the same pass.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=400, detail=too_large_detail)
+
+    await file.seek(0)
+    total = 0
+    first = True
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        if first:
+            if check_head is not None and not check_head(chunk):
+                raise HTTPException(status_code=400, detail=invalid_detail)
+            first = False
+        total += len(chunk)
+        if hasher is not None:
+            hasher.update(chunk)
+        if copy_to is not None:
+            copy_to.write(chunk)
+        if total > max_bytes:
+            raise HTTPException(status_code=400, detail=too_large_detail)
+    if first and check_head is not None:
+        raise HTTPException(status_code=400, detail=invalid_detail)
+
+    if copy_to is not None:
+        copy_to.flush()
+    await file.seek(0)
+    return file.file
@@ -0,0 +1,172 @@
+"""
+Benchmark: contact-form email through the outbox, against a local SMTP stand-in.
+
+The stand-in sleeps --handshake seconds per new connection (TCP + TLS +
+login on a real server).  Compared:
+
+  inline     the old contact handler: send_email() per message, awaited in
+             the request, one connection + login each;
+  outbox     POST /contact queues the email in the request's transaction;
+             the background sender delivers the queue over one connection.
+
+Then the failure contract is checked through POST /testimonials/submit:
+a refused recipient fails after one attempt, transient 451s are retried,
+a server that drops the connection every 3 messages is reconnected to, and
+everything else is sent exactly once.
+
+Usage (from backend/):
+    python benchmarks/bench_email_outbox.py [--messages 100] [--handshake 0.05]
+
+Exits with status 1 if a check fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from smtp_standin import SMTPStandIn  # noqa: E402
+
+
+def _configure(port: int) -> None:
+    db_dir = tempfile.mkdtemp(prefix="bench-outbox-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{db_dir}/bench.db",
+        "ENVIRONMENT": "staging",
+        "SECRET_KEY": os.environ.get("SECRET_KEY") or "bench-" + "x" * 40,
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(port),
+        "SMTP_USE_TLS": "false",
+        "SMTP_USER": "bench",
+        "SMTP_PASSWORD": "bench",
+        "FROM_EMAIL": "site@example.com",
+        "TO_EMAIL": "owner@example.com",
+        "EMAIL_OUTBOX_POLL_SECONDS": "1",
+        "EMAIL_OUTBOX_BACKOFF_SECONDS": "0",
+        "RATE_LIMIT_CONTACT_PER_WINDOW": "100000",
+        "LINK_CHECK_INTERVAL_HOURS": "0",
+        "FEED_SYNC_INTERVAL_MINUTES": "0",
+        "MEDIA_ROOT": os.path.join(db_dir, "media"),
+    })
+
+
+def _wait_for_outbox(timeout: float = 30.0) -> dict[str, int]:
+    from sqlalchemy import func
+
+    from app.db.session import SessionLocal
+    from app.models.models import EmailOutbox
+
+    deadline = time.monotonic() + timeout
+    while True:
+        db = SessionLocal()
+        try:
+            counts = dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status).all())
+        finally:
+            db.close()
+        if not counts.get("pending") and not counts.get("sending") or time.monotonic() > deadline:
+            return counts
+        time.sleep(0.02)
+
+
+def _inline(standin: SMTPStandIn, count: int) -> float:
+    from app.services.email_service import send_contact_email
+
+    async def _run() -> None:
+        for i in range(count):
+            await send_contact_email(f"Visitor {i}", f"v{i}@example.com", "Hello there")
+
+    standin.reset()
+    start = time.perf_counter()
+    asyncio.run(_run())
+    elapsed = time.perf_counter() - start
+    print(f"{'inline send_email':<20}{elapsed * 1000 / count:>14.1f}{elapsed * 1000:>14.0f}{standin.connections:>8}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--handshake", type=float, default=0.05, help="seconds per new SMTP connection")
+    args = parser.parse_args()
+
+    standin = SMTPStandIn(handshake_latency=args.handshake).start()
+    _configure(standin.port)
+
+    from fastapi.testclient import TestClient
+
+    from app.db.session import SessionLocal
+    from app.main import app
+    from app.models.models import EmailOutbox
+
+    try:
+        print(f"{'method':<20}{'request ms':>14}{'all sent ms':>14}{'conns':>8}")
+        inline = _inline(standin, args.messages)
+
+        with TestClient(app) as client:
+            standin.reset()
+            start = time.perf_counter()
+            for i in range(args.messages):
+                response = client.post(
+                    "/api/v1/contact/", json={"name": f"Visitor {i}", "email": f"v{i}@example.com", "message": "Hi"}
+                )
+                assert response.status_code == 200, response.text
+            requests_done = time.perf_counter() - start
+            counts = _wait_for_outbox()
+            sent_all = time.perf_counter() - start
+            print(
+                f"{'outbox':<20}{requests_done * 1000 / args.messages:>14.1f}"
+                f"{sent_all * 1000:>14.0f}{standin.connections:>8}"
+            )
+            print(f"\nSpeed-up to all delivered: {inline / sent_all:.1f}x for {args.messages} messages "
+                  f"at {args.handshake * 1000:.0f} ms per connection")
+            outbox_ok = counts.get("sent") == args.messages and len(standin.messages) == args.messages
+            reused = standin.connections == 1 and standin.logins == 1
+
+            # Failure contract
+            standin.reset()
+            standin.refused = {"bounce@example.com"}
+            standin.fail_data = 2
+            standin.max_per_session = 3
+            submitters = ["bounce@example.com"] + [f"fan{i}@example.com" for i in range(5)]
+            for email in submitters:
+                client.post("/api/v1/testimonials/submit", json={
+                    "name": "Fan", "role": "Engineer", "content": "Great work, would hire again.",
+                    "submitter_email": email,
+                })
+            counts = _wait_for_outbox()
+
+        db = SessionLocal()
+        rows = db.query(EmailOutbox).filter(EmailOutbox.id > args.messages).all()
+        db.close()
+        bounced = [row for row in rows if row.to_email == "bounce@example.com"]
+        delivered = [m["To"] for m in standin.messages]
+        expected = len(submitters) * 2 - 1  # thank-you + owner notification each, minus the bounce
+        checks = {
+            "outbox: every message sent once": outbox_ok,
+            "outbox: one connection, one login": reused,
+            "bounce failed after 1 attempt": len(bounced) == 1 and bounced[0].status == "failed"
+            and bounced[0].attempts == 1,
+            "451s retried": sum(row.attempts for row in rows if row.status == "sent") == expected + 2,
+            "reconnected after session limit": standin.connections >= expected // 3,
+            "HTML + plain-text parts": all(m.get_content_type() == "multipart/alternative" for m in standin.messages),
+            "all others sent exactly once": counts.get("sent") == args.messages + expected
+            and Counter(delivered) == Counter({"owner@example.com": len(submitters), **{e: 1 for e in submitters[1:]}}),
+        }
+    finally:
+        standin.stop()
+
+    for name, passed in checks.items():
+        print(f"  {'ok ' if passed else 'FAIL'} {name}")
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: email template rendering under a burst of submissions.
+
+Two rows, each a fresh interpreter (so the in-process template cache does
+not carry over):
+
+  cold, no cache      preload() parses and compiles every template
+  cold, bytecode      preload() after a restart, with the on-disk bytecode
+                      cache from the first row
+
+followed by --burst renders of the testimonial thank-you and contact emails
+(p50 / p99 / max per pair) from the preloaded environment.
+
+Usage (from backend/):
+    python benchmarks/bench_email_templates.py [--burst 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+_CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+from app.services import email_templates
+from app.services.email_service import contact_email, testimonial_thank_you_email
+imported = time.perf_counter()
+email_templates.preload()
+first = time.perf_counter()
+samples = []
+for i in range(int(sys.argv[1])):
+    t0 = time.perf_counter()
+    testimonial_thank_you_email(f"Visitor <{i}>")
+    contact_email(f"Visitor {i}", f"v{i}@example.com", "Hello & thanks " * 20)
+    samples.append(time.perf_counter() - t0)
+samples.sort()
+print(json.dumps({
+    "preload_ms": (first - imported) * 1000,
+    "p50_us": samples[len(samples) // 2] * 1e6,
+    "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+    "max_us": samples[-1] * 1e6,
+}))
+"""
+
+
+def _run(burst: int, cache_dir: str) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite://",
+        "ENVIRONMENT": "production",
+        "SECRET_KEY": os.environ.get("SECRET_KEY") or "bench-" + "x" * 40,
+        "EMAIL_TEMPLATE_CACHE_DIR": cache_dir,
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(burst)], cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=5000, help="renders per burst (each = two emails)")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="bench-jinja-")
+    cold = _run(args.burst, cache_dir)
+    warm = _run(args.burst, cache_dir)
+
+    print(f"{'':<20}{'preload ms':>12}{'p50 us':>10}{'p99 us':>10}{'max us':>10}")
+    for label, row in (("cold, no cache", cold), ("cold, bytecode", warm)):
+        print(
+            f"{label:<20}{row['preload_ms']:>12.1f}{row['p50_us']:>10.1f}"
+            f"{row['p99_us']:>10.1f}{row['max_us']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
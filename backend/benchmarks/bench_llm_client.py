@@ -0,0 +1,230 @@
+"""
+Checks for the shared LLM client (app/services/llm_client.py) against the
+local OpenAI-compatible stand-in (llm_standin.py).
+
+  retry on 5xx        500 then 503, then success: three requests, two retries
+  retry on 429        counted as rate-limited, then success
+  retries bounded     max_retries=1 against repeated 500s: the error surfaces
+                      after two requests
+  not retried         a 400 fails on the first request
+  Retry-After         a 429 with Retry-After: 1 waits at least one second
+                      before the next attempt (full-jitter backoff alone would
+                      wait at most 0.5s)
+  Retry-After cap     a Retry-After beyond the deadline is not slept on
+  semaphore           --calls concurrent completions with max_concurrency=2
+                      never put more than two requests on the wire, and take
+                      about --calls / 2 round trips
+  deadline            a slow response and a queue wait both end in
+                      LLMDeadlineExceeded within the budget
+  usage stats         prompt / completion tokens and outcome counters add up,
+                      for chat() and stream_chat()
+
+Usage (from backend/):
+    python benchmarks/bench_llm_client.py [--calls 8] [--latency 0.2]
+
+Exits with status 1 if a check fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from llm_standin import LLMStandIn  # noqa: E402
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("ENVIRONMENT", "staging")
+os.environ.setdefault("SECRET_KEY", "bench-" + "x" * 40)
+
+import openai  # noqa: E402
+
+from app.services.llm_client import LLMClient, LLMDeadlineExceeded  # noqa: E402
+
+_MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+def _client(standin: LLMStandIn, **overrides: Any) -> LLMClient:
+    options: dict[str, Any] = {
+        "api_key": "standin",
+        "base_url": standin.base_url,
+        "model": "standin",
+        "max_concurrency": 4,
+        "max_retries": 3,
+        "timeout": 10.0,
+        **overrides,
+    }
+    return LLMClient(**options)
+
+
+async def _raises(call: Awaitable[Any], error: type[BaseException]) -> bool:
+    try:
+        await call
+    except error:
+        return True
+    return False
+
+
+async def _run_checks(standin: LLMStandIn, calls: int, latency: float) -> dict[str, bool]:
+    checks: dict[str, bool] = {}
+
+    async def check(name: str, body: Callable[[], Awaitable[bool]]) -> None:
+        standin.reset()
+        try:
+            checks[name] = await body()
+        except Exception as exc:
+            print(f"  {name}: {type(exc).__name__}: {exc}")
+            checks[name] = False
+
+    async def retry_5xx() -> bool:
+        client = _client(standin)
+        standin.failures = [(500, None), (503, None)]
+        completion = await client.chat(_MESSAGES)
+        stats = client.stats()
+        await client.aclose()
+        return (
+            completion.choices[0].message.content == standin.content
+            and len(standin.requests) == 3
+            and stats["retries"] == 2 and stats["succeeded"] == 1 and stats["failed"] == 0
+        )
+
+    async def retry_429() -> bool:
+        client = _client(standin)
+        standin.failures = [(429, 0)]
+        await client.chat(_MESSAGES)
+        stats = client.stats()
+        await client.aclose()
+        return len(standin.requests) == 2 and stats["rate_limited"] == 1 and stats["retries"] == 1
+
+    async def retries_bounded() -> bool:
+        client = _client(standin, max_retries=1)
+        standin.failures = [(500, 0)] * 3
+        raised = await _raises(client.chat(_MESSAGES), openai.InternalServerError)
+        stats = client.stats()
+        await client.aclose()
+        return raised and len(standin.requests) == 2 and stats["failed"] == 1
+
+    async def not_retried() -> bool:
+        client = _client(standin)
+        standin.failures = [(400, None)]
+        raised = await _raises(client.chat(_MESSAGES), openai.BadRequestError)
+        stats = client.stats()
+        await client.aclose()
+        return raised and len(standin.requests) == 1 and stats["retries"] == 0
+
+    async def retry_after() -> bool:
+        client = _client(standin)
+        standin.failures = [(429, 1)]
+        await client.chat(_MESSAGES)
+        await client.aclose()
+        gap = standin.arrivals[1] - standin.arrivals[0]
+        return 1.0 <= gap < 1.5
+
+    async def retry_after_cap() -> bool:
+        client = _client(standin)
+        standin.failures = [(429, 30)]
+        start = time.monotonic()
+        raised = await _raises(client.chat(_MESSAGES, deadline=2.0), openai.RateLimitError)
+        elapsed = time.monotonic() - start
+        await client.aclose()
+        return raised and elapsed < 1.0 and len(standin.requests) == 1
+
+    async def semaphore() -> bool:
+        client = _client(standin, max_concurrency=2)
+        standin.latency = latency
+        start = time.monotonic()
+        await asyncio.gather(*(client.chat(_MESSAGES) for _ in range(calls)))
+        elapsed = time.monotonic() - start
+        stats = client.stats()
+        await client.aclose()
+        rounds = -(-calls // 2)
+        print(f"  {calls} calls, max_concurrency=2, {latency * 1000:.0f} ms each: {elapsed * 1000:.0f} ms "
+              f"(max {standin.max_in_flight} in flight)")
+        return (
+            standin.max_in_flight == 2
+            and rounds * latency <= elapsed < (rounds + 2) * latency
+            and stats["in_flight"] == 0 and stats["succeeded"] == calls
+        )
+
+    async def deadline_slow_response() -> bool:
+        client = _client(standin)
+        standin.latency = 1.0
+        start = time.monotonic()
+        raised = await _raises(client.chat(_MESSAGES, deadline=0.3), LLMDeadlineExceeded)
+        elapsed = time.monotonic() - start
+        stats = client.stats()
+        await client.aclose()
+        return raised and elapsed < 0.6 and stats["deadline_exceeded"] == 1 and stats["failed"] == 1
+
+    async def deadline_queue_wait() -> bool:
+        client = _client(standin, max_concurrency=1)
+        standin.latency = 0.6
+        first = asyncio.create_task(client.chat(_MESSAGES))
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        raised = await _raises(client.chat(_MESSAGES, deadline=0.2), LLMDeadlineExceeded)
+        elapsed = time.monotonic() - start
+        await first
+        stats = client.stats()
+        await client.aclose()
+        return (
+            raised and elapsed < 0.4 and len(standin.requests) == 1
+            and stats["deadline_exceeded"] == 1 and stats["succeeded"] == 1
+        )
+
+    async def usage_stats() -> bool:
+        client = _client(standin)
+        standin.failures = [(500, 0)]
+        for _ in range(3):
+            await client.chat(_MESSAGES)
+        deltas = [delta async for delta in client.stream_chat(_MESSAGES)]
+        stats = client.stats()
+        await client.aclose()
+        prompt, completion = standin.usage
+        return (
+            "".join(deltas) == standin.content
+            and stats["calls"] == 4 and stats["succeeded"] == 4 and stats["failed"] == 0
+            and stats["retries"] == 1 and stats["in_flight"] == 0
+            and stats["prompt_tokens"] == 4 * prompt and stats["completion_tokens"] == 4 * completion
+            and stats["total_tokens"] == 4 * (prompt + completion)
+            and stats["avg_latency_seconds"] is not None
+        )
+
+    await check("retry on 5xx", retry_5xx)
+    await check("retry on 429", retry_429)
+    await check("retries bounded by max_retries", retries_bounded)
+    await check("4xx not retried", not_retried)
+    await check("Retry-After honoured", retry_after)
+    await check("Retry-After past the deadline not slept on", retry_after_cap)
+    await check("semaphore caps concurrency", semaphore)
+    await check("deadline: slow response", deadline_slow_response)
+    await check("deadline: waiting for a slot", deadline_queue_wait)
+    await check("usage stats", usage_stats)
+    return checks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=8, help="concurrent calls for the semaphore check")
+    parser.add_argument("--latency", type=float, default=0.2, help="stand-in response time for the semaphore check")
+    args = parser.parse_args()
+
+    standin = LLMStandIn().start()
+    try:
+        checks = asyncio.run(_run_checks(standin, args.calls, args.latency))
+    finally:
+        standin.stop()
+
+    for name, passed in checks.items():
+        print(f"  {'ok ' if passed else 'FAIL'} {name}")
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
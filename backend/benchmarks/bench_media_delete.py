@@ -0,0 +1,159 @@
+"""
+Benchmark: bulk media deletion against a local Cloudinary stand-in.
+
+Compares the old per-asset loop (one destroy call per asset, awaited
+sequentially) with delete_images() (delete_resources, 100 public_ids per
+call), then drives POST /admin/media/bulk-delete end to end and checks the
+partial-failure contract: ids that do not exist and assets whose remote
+delete failed end up in `failed_ids` and keep their rows; everything else is
+in `deleted_ids`.
+
+The stand-in adds --latency seconds to every API call, so the call count is
+what dominates, as it does against the real API.
+
+Usage (from backend/):
+    python benchmarks/bench_media_delete.py [--assets 250] [--latency 0.03]
+
+Exits with status 1 if the endpoint's response does not match.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench-media-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_DB_DIR}/bench.db",
+    "ENVIRONMENT": "staging",
+    "SECRET_KEY": os.environ.get("SECRET_KEY") or "bench-" + "x" * 40,
+    "CLOUDINARY_CLOUD_NAME": "bench",
+    "CLOUDINARY_API_KEY": "bench",
+    "CLOUDINARY_API_SECRET": "bench",
+    "LINK_CHECK_INTERVAL_HOURS": "0",
+    "FEED_SYNC_INTERVAL_MINUTES": "0",
+})
+
+import cloudinary  # noqa: E402
+
+from cloudinary_standin import CloudinaryStandIn  # noqa: E402
+
+
+def _ids(prefix: str, count: int) -> list[str]:
+    return [f"portfolio/{prefix}_{i}" for i in range(count)]
+
+
+async def _per_asset_destroy(public_ids: list[str]) -> None:
+    from app.services.cloudinary_service import delete_image
+
+    for public_id in public_ids:
+        await delete_image(public_id)
+
+
+async def _batched(public_ids: list[str]) -> dict[str, bool]:
+    from app.services.cloudinary_service import delete_images
+
+    return await delete_images(public_ids)
+
+
+def _time(standin: CloudinaryStandIn, label: str, public_ids: list[str], coro_fn) -> float:
+    standin.seed(public_ids)
+    standin.reset_calls()
+    start = time.perf_counter()
+    asyncio.run(coro_fn(public_ids))
+    elapsed = time.perf_counter() - start
+    calls = sum(standin.calls.values())
+    left = len(set(public_ids) & set(standin.resources))
+    print(f"{label:<22}{elapsed * 1000:>10.0f}{calls:>8}{left:>8}")
+    return elapsed
+
+
+def _check_endpoint(standin: CloudinaryStandIn) -> bool:
+    from fastapi.testclient import TestClient
+
+    from app.auth import get_current_admin_user
+    from app.database import MediaAsset, SessionLocal
+    from app.main import app
+
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    ok_ids = _ids("ok", 150)
+    broken_ids = _ids("broken", 120)  # second delete_resources batch will fail
+    standin.seed(ok_ids + broken_ids)
+    standin.failing_ids = {broken_ids[-1]}
+
+    with TestClient(app) as client:
+        db = SessionLocal()
+        assets = [
+            MediaAsset(url=f"https://res.example/{pid}.png", public_id=pid, provider="cloudinary")
+            for pid in ok_ids + broken_ids
+        ]
+        local = MediaAsset(url="https://example.com/local.png", provider="external")
+        db.add_all([*assets, local])
+        db.commit()
+        row_ids = {a.id: a.public_id for a in assets}
+        local_id = local.id
+        db.close()
+
+        missing_id = 999_999
+        request_ids = [*row_ids, local_id, missing_id]
+        standin.reset_calls()
+        start = time.perf_counter()
+        response = client.post("/api/v1/admin/media/bulk-delete", json={"ids": request_ids})
+        elapsed = time.perf_counter() - start
+        body = response.json()
+
+        db = SessionLocal()
+        remaining = {a.id for a in db.query(MediaAsset).all()}
+        db.close()
+
+    # Batches are cut from the request order: 100 ok, 50 ok + 50 broken, 70 broken (fails).
+    unique_remote = ok_ids + broken_ids
+    failed_remote = set(unique_remote[200:])
+    expected_failed = sorted([i for i, pid in row_ids.items() if pid in failed_remote] + [missing_id])
+    expected_deleted = sorted([i for i, pid in row_ids.items() if pid not in failed_remote] + [local_id])
+
+    print(
+        f"\nPOST /admin/media/bulk-delete: {len(request_ids)} ids in {elapsed * 1000:.0f} ms, "
+        f"{standin.calls.get('delete_resources', 0)} delete_resources calls, "
+        f"{standin.calls.get('destroy', 0)} destroy calls"
+    )
+    checks = {
+        "status 200": response.status_code == 200,
+        "deleted_ids": sorted(body.get("deleted_ids", [])) == expected_deleted,
+        "failed_ids": sorted(body.get("failed_ids", [])) == expected_failed,
+        "failed rows kept": remaining == set(expected_failed) - {missing_id},
+        "one call per 100": standin.calls.get("delete_resources", 0) == 3,
+    }
+    for name, passed in checks.items():
+        print(f"  {'ok ' if passed else 'FAIL'} {name}")
+    return all(checks.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=250)
+    parser.add_argument("--latency", type=float, default=0.03, help="seconds added to every stand-in call")
+    args = parser.parse_args()
+
+    standin = CloudinaryStandIn(latency=args.latency).start()
+    cloudinary.config(upload_prefix=standin.base_url)
+    try:
+        print(f"{'method':<22}{'wall ms':>10}{'calls':>8}{'left':>8}")
+        before = _time(standin, "per-asset destroy", _ids("seq", args.assets), _per_asset_destroy)
+        after = _time(standin, "delete_resources", _ids("batch", args.assets), _batched)
+        print(f"\nSpeed-up: {before / after:.1f}x for {args.assets} assets at {args.latency * 1000:.0f} ms/call")
+        passed = _check_endpoint(standin)
+    finally:
+        standin.stop()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
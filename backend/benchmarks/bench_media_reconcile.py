@@ -0,0 +1,150 @@
+"""
+Benchmark: Cloudinary inventory reconciliation against a local stand-in.
+
+Seeds the stand-in and media_assets so that they overlap except for a set of
+orphans (remote only), missing rows (local only, one of them still used by a
+project) and one recent orphan inside the grace period, then drives
+POST /admin/media/reconcile three times:
+
+  1. dry run         the report lists exactly the seeded differences;
+  2. orphans=delete  orphans are gone remotely, except the recent one and one
+                     whose URL a blog post still uses;
+     remove_missing  missing rows are deleted, the referenced one is kept;
+  3. dry run         only the in-use row and the in-use orphan remain.
+
+Listing calls are counted: the inventory should cost ceil(N / 500) calls,
+against N per-resource lookups.
+
+Usage (from backend/):
+    python benchmarks/bench_media_reconcile.py [--assets 1200] [--latency 0.03]
+
+Exits with status 1 if a report does not match.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench-reconcile-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_DB_DIR}/bench.db",
+    "ENVIRONMENT": "staging",
+    "SECRET_KEY": os.environ.get("SECRET_KEY") or "bench-" + "x" * 40,
+    "CLOUDINARY_CLOUD_NAME": "bench",
+    "CLOUDINARY_API_KEY": "bench",
+    "CLOUDINARY_API_SECRET": "bench",
+    "CLOUDINARY_FOLDER": "portfolio",
+    "LINK_CHECK_INTERVAL_HOURS": "0",
+    "FEED_SYNC_INTERVAL_MINUTES": "0",
+    "MEDIA_ROOT": os.path.join(_DB_DIR, "media"),
+})
+
+import cloudinary  # noqa: E402
+
+from cloudinary_standin import CloudinaryStandIn  # noqa: E402
+
+
+def _ids(prefix: str, count: int) -> list[str]:
+    return [f"portfolio/{prefix}_{i}" for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=1200, help="resources present on both sides")
+    parser.add_argument("--latency", type=float, default=0.03, help="seconds added to every stand-in call")
+    args = parser.parse_args()
+
+    from datetime import datetime
+
+    from fastapi.testclient import TestClient
+
+    from app.auth import get_current_admin_user
+    from app.database import BlogPost, MediaAsset, Project, SessionLocal
+    from app.main import app
+
+    standin = CloudinaryStandIn(latency=args.latency).start()
+    cloudinary.config(upload_prefix=standin.base_url)
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+
+    shared = _ids("shared", args.assets)
+    orphans = _ids("orphan", 25)
+    recent_orphan = "portfolio/just_uploaded"
+    missing = _ids("missing", 10)
+    used_orphan = orphans[0]
+    standin.seed(shared + orphans + [recent_orphan, "elsewhere/not_ours"])
+    standin.resources[recent_orphan]["created_at"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    try:
+        with TestClient(app) as client:
+            db = SessionLocal()
+            assets = [
+                MediaAsset(url=standin.resources[pid]["secure_url"], public_id=pid, provider="cloudinary",
+                           created_at=datetime(2026, 1, 1))
+                for pid in shared
+            ] + [
+                MediaAsset(url=f"https://res.cloudinary.com/bench/image/upload/{pid}.png", public_id=pid,
+                           provider="cloudinary", created_at=datetime(2026, 1, 1))
+                for pid in missing
+            ]
+            db.add_all(assets)
+            db.commit()
+            missing_rows = {a.public_id: a.id for a in assets if a.public_id in missing}
+            in_use_id = missing_rows[missing[0]]
+            db.add(Project(title="Uses a missing image", description="d", image_url=assets[-len(missing)].url))
+            db.add(BlogPost(title="Uses an orphan", slug="uses-an-orphan", content="c",
+                            cover_image_url=standin.resources[used_orphan]["secure_url"]))
+            db.commit()
+            db.close()
+
+            standin.reset_calls()
+            start = time.perf_counter()
+            dry = client.post("/api/v1/admin/media/reconcile", json={}).json()
+            elapsed = time.perf_counter() - start
+            list_calls = standin.calls.get("resources", 0)
+
+            fixed = client.post(
+                "/api/v1/admin/media/reconcile", json={"orphans": "delete", "remove_missing": True}
+            ).json()
+            after = client.post("/api/v1/admin/media/reconcile", json={}).json()
+
+        remote_total = len(shared) + len(orphans) + 1
+        expected_pages = math.ceil(remote_total / 500)
+        print(
+            f"Inventory of {remote_total} resources listed in {list_calls} calls "
+            f"({elapsed * 1000:.0f} ms at {args.latency * 1000:.0f} ms/call); "
+            f"per-resource lookups would take {remote_total} calls (~{remote_total * args.latency:.1f} s)"
+        )
+        checks = {
+            "dry run: orphans": dry.get("orphans") == sorted(orphans),
+            "dry run: missing": sorted(m["public_id"] for m in dry.get("missing", [])) == sorted(missing),
+            "dry run: recent skipped": dry.get("recent") == 1,
+            "dry run: other folders ignored": "elsewhere/not_ours" not in dry.get("orphans", []),
+            f"listing pages == {expected_pages}": list_calls == expected_pages,
+            "fix: orphans deleted": fixed.get("deleted_orphans") == sorted(set(orphans) - {used_orphan})
+            and set(orphans) & set(standin.resources) == {used_orphan},
+            "fix: referenced orphan kept": fixed.get("in_use_orphans") == [used_orphan],
+            "fix: recent orphan kept": recent_orphan in standin.resources,
+            "fix: missing rows removed": sorted(fixed.get("removed_ids", []))
+            == sorted(set(missing_rows.values()) - {in_use_id}),
+            "fix: in-use row kept": fixed.get("in_use_ids") == [in_use_id],
+            "after: only in-use row and orphan left": after.get("orphans") == [used_orphan]
+            and [m["asset_ids"] for m in after.get("missing", [])] == [[in_use_id]],
+        }
+    finally:
+        standin.stop()
+
+    for name, passed in checks.items():
+        print(f"  {'ok ' if passed else 'FAIL'} {name}")
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Micro-benchmark: parse + metadata extraction over the saved HTML fixtures.
+
+Compares the single-pass lxml extractor used by scrape_url() against the
+previous BeautifulSoup implementation (one soup.find() per meta key), and
+reports any field where the two disagree.
+
+Usage (from backend/):
+    python benchmarks/bench_metadata.py [--repeat 20]
+
+The BeautifulSoup baseline is skipped when beautifulsoup4 is not installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from app.services.scraper_service import (  # noqa: E402
+    AUTHOR_SELECTORS,
+    BOILERPLATE_TAGS,
+    CONTENT_SELECTORS,
+    _clean_title,
+    _extract_page,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+COMPARED_FIELDS = (
+    "title", "description", "image_url", "site_name", "published_time",
+    "author", "keywords", "article_section",
+)
+
+
+# ---------------------------------------------------------------------------
+# Legacy BeautifulSoup extractor (baseline only)
+# ---------------------------------------------------------------------------
+
+def _legacy_extract(html: str, url: str) -> dict:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+
+    def get_meta(*, property=None, name=None):
+        tag = soup.find("meta", property=property) if property else soup.find("meta", attrs={"name": name})
+        return str(tag.get("content") or "").strip() if tag else ""
+
+    items: list[dict] = []
+    for tag in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(tag.string or "{}")
+        except json.JSONDecodeError:
+            continue
+        items.extend(d for d in data if isinstance(d, dict)) if isinstance(data, list) else items.append(data)
+    ld = next((i for i in items if i.get("@type") in ("Article", "NewsArticle", "BlogPosting", "WebPage")),
+              items[0] if items else {})
+
+    domain = urlparse(url).netloc.replace("www.", "")
+    site = get_meta(property="og:site_name") or (
+        ld.get("publisher", {}).get("name") if isinstance(ld.get("publisher"), dict) else "") or domain
+    raw_title = (get_meta(property="og:title") or get_meta(name="twitter:title")
+                 or str(ld.get("headline") or "") or ((soup.title.string or "").strip() if soup.title else ""))
+    description = (get_meta(property="og:description") or get_meta(name="twitter:description")
+                   or get_meta(name="description") or str(ld.get("description") or ""))
+    ld_image = ld.get("image")
+    ld_image_url = (ld_image.get("url", "") if isinstance(ld_image, dict)
+                    else (ld_image[0] if isinstance(ld_image, list) else str(ld_image or "")))
+    image_url = get_meta(property="og:image") or get_meta(name="twitter:image") or ld_image_url
+
+    published = ""
+    for cand in (get_meta(property="article:published_time"), get_meta(property="og:published_time"),
+                 get_meta(name="date"), get_meta(name="pubdate"), get_meta(name="publish_date"),
+                 get_meta(name="DC.date"), str(ld.get("datePublished") or ""),
+                 str(ld.get("dateCreated") or ""), str(ld.get("dateModified") or "")):
+        m = re.search(r"\d{4}-\d{2}-\d{2}", cand or "")
+        if m:
+            published = m.group(0)
+            break
+
+    author = ""
+    ld_author = ld.get("author")
+    if isinstance(ld_author, dict):
+        author = str(ld_author.get("name", "")).strip()
+    elif isinstance(ld_author, list) and ld_author:
+        first = ld_author[0]
+        author = str(first.get("name", "") if isinstance(first, dict) else first).strip()
+    if not author:
+        for src in (get_meta(name="author"), get_meta(property="article:author"),
+                    get_meta(name="dc.creator"), get_meta(name="byl")):
+            if src and not src.startswith("http"):
+                author = src
+                break
+    if not author:
+        for sel in AUTHOR_SELECTORS:
+            el = soup.select_one(sel)
+            if el:
+                text = el.get_text(strip=True)
+                if text and 2 < len(text) < 80:
+                    author = re.sub(r"^(?:by|oleh|ditulis oleh)\s+", "", text, flags=re.I).strip()
+                    if author:
+                        break
+
+    keywords: list[str] = []
+    raw_kw = get_meta(name="keywords")
+    keywords.extend(k.strip() for k in raw_kw.split(",") if k.strip())
+    ld_kw = ld.get("keywords")
+    if isinstance(ld_kw, list):
+        keywords.extend(k for k in ld_kw if isinstance(k, str))
+    elif isinstance(ld_kw, str):
+        keywords.extend(k.strip() for k in ld_kw.split(",") if k.strip())
+    keywords.extend(str(t.get("content") or "").strip() for t in soup.find_all("meta", property="article:tag"))
+    seen: set[str] = set()
+    keywords = [k for k in keywords if k and not (k.lower() in seen or seen.add(k.lower()))][:20]
+
+    section = get_meta(property="article:section") or str(ld.get("articleSection") or "")
+
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    snippet = ""
+    for sel in CONTENT_SELECTORS:
+        el = soup.select_one(sel)
+        if el:
+            snippet = el.get_text(separator="\n", strip=True)[:5000]
+            break
+    else:
+        snippet = soup.body.get_text(separator="\n", strip=True)[:5000] if soup.body else ""
+
+    return {
+        "title": _clean_title(raw_title, site), "description": description, "image_url": image_url,
+        "site_name": site, "published_time": published, "author": author, "keywords": keywords,
+        "article_section": section, "content_snippet": snippet,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _time(fn, html: str, url: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html, url)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        import bs4  # noqa: F401
+        has_bs4 = True
+    except ImportError:
+        has_bs4 = False
+        print("beautifulsoup4 not installed — skipping the legacy baseline.\n")
+
+    print(f"{'fixture':<24}{'KB':>8}{'lxml ms':>10}{'bs4 ms':>10}{'speedup':>9}")
+    for path in sorted(FIXTURES_DIR.glob("*.html")):
+        raw = path.read_bytes()
+        html = raw.decode("utf-8", errors="replace")
+        url = f"https://example.com/{path.stem}"
+
+        new_ms = _time(_extract_page, html, url, args.repeat)
+        old_ms = _time(_legacy_extract, html, url, args.repeat) if has_bs4 else float("nan")
+        speedup = f"{old_ms / new_ms:.1f}x" if has_bs4 else "-"
+        print(f"{path.name:<24}{len(raw) / 1024:>8.0f}{new_ms:>10.2f}{old_ms:>10.2f}{speedup:>9}")
+
+        if has_bs4:
+            new, old = _extract_page(html, url), _legacy_extract(html, url)
+            for key in COMPARED_FIELDS:
+                if new[key] != old[key]:
+                    print(f"    field mismatch {key!r}: lxml={new[key]!r} bs4={old[key]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: Z.AI prompt size with and without extractive content compaction.
+
+For every saved fixture and content type, builds the analysis prompt twice —
+with the raw ~5000-char content snippet and with the compacted one — and
+reports characters, estimated tokens, the reduction and the time spent
+ranking sentences.  `key terms` is the share of the fixture's expected key
+terms (benchmarks/fixtures/expected.json) still present in the body text.
+
+With --live (requires ZAI_API_KEY, or point ZAI_BASE_URL at a stand-in),
+each fixture is also analysed for real in both modes and the returned fields
+are checked against the expected values.
+
+Usage (from backend/):
+    python benchmarks/bench_prompt_size.py [--repeat 20] [--live]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from app.core.config import settings  # noqa: E402
+from app.services.llm_client import close_llm_client  # noqa: E402
+from app.services.scraper_service import _build_messages, _extract_page, analyze_with_ai  # noqa: E402
+from app.services.summarizer import compact_keeping_terms, estimate_tokens, token_budget  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+CONTENT_TYPES = ("press_mention", "blog_article", "project")
+
+
+def _load_fixtures() -> list[tuple[str, dict, dict]]:
+    expected = json.loads((FIXTURES_DIR / "expected.json").read_text(encoding="utf-8"))
+    fixtures = []
+    for path in sorted(FIXTURES_DIR.glob("*.html")):
+        spec = expected.get(path.stem, {})
+        url = spec.get("url", f"https://example.com/{path.stem}")
+        html = path.read_bytes().decode("utf-8", errors="replace")
+        fixtures.append((path.stem, _extract_page(html, url), spec))
+    return fixtures
+
+
+def _prompt(scraped: dict, content_type: str, compact: bool) -> str:
+    settings.ZAI_COMPACT_CONTENT = compact
+    return _build_messages(scraped, content_type)[1]["content"]  # type: ignore[arg-type]
+
+
+def _key_term_recall(text: str, terms: list[str]) -> float:
+    if not terms:
+        return float("nan")
+    lowered = text.lower()
+    return sum(term.lower() in lowered for term in terms) / len(terms)
+
+
+def _field_accuracy(result: dict, fields: dict) -> float:
+    if not fields:
+        return float("nan")
+    hits = sum(
+        str(result.get(k, "")).strip().lower() == str(v).strip().lower()
+        for k, v in fields.items()
+    )
+    return hits / len(fields)
+
+
+async def _live_accuracy(fixtures: list[tuple[str, dict, dict]]) -> None:
+    print(f"\n{'fixture':<16}{'type':<15}{'full acc':>10}{'compact acc':>13}")
+    try:
+        for name, scraped, spec in fixtures:
+            if "content_type" not in spec:
+                continue
+            scores = []
+            for compact in (False, True):
+                settings.ZAI_COMPACT_CONTENT = compact
+                result = await analyze_with_ai(scraped, spec["content_type"])
+                scores.append(_field_accuracy(result, spec.get("fields", {})))
+            print(f"{name:<16}{spec['content_type']:<15}{scores[0]:>10.0%}{scores[1]:>13.0%}")
+    finally:
+        await close_llm_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--live", action="store_true", help="also call Z.AI and score the returned fields")
+    args = parser.parse_args()
+
+    fixtures = _load_fixtures()
+    original = settings.ZAI_COMPACT_CONTENT
+
+    print(f"{'fixture':<16}{'type':<15}{'full tok':>9}{'compact':>9}{'saved':>8}{'rank ms':>9}{'key terms':>12}")
+    totals = [0, 0]
+    for name, scraped, spec in fixtures:
+        for content_type in CONTENT_TYPES:
+            full = _prompt(scraped, content_type, compact=False)
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                compact = _prompt(scraped, content_type, compact=True)
+                samples.append(time.perf_counter() - start)
+            full_tok, compact_tok = estimate_tokens(full), estimate_tokens(compact)
+            totals[0] += full_tok
+            totals[1] += compact_tok
+            terms = spec.get("key_terms", [])
+            body = compact_keeping_terms(
+                scraped["content_snippet"],
+                token_budget(content_type),
+                context=(scraped["title"], scraped["description"]),
+            )
+            recall = (
+                f"{_key_term_recall(scraped['content_snippet'], terms):.0%}"
+                f"→{_key_term_recall(body, terms):.0%}"
+            ) if terms else "-"
+            print(
+                f"{name:<16}{content_type:<15}{full_tok:>9}{compact_tok:>9}"
+                f"{1 - compact_tok / full_tok:>8.0%}{statistics.median(samples) * 1000:>9.2f}{recall:>12}"
+            )
+    print(f"\nTotal estimated prompt tokens: {totals[0]} → {totals[1]} ({1 - totals[1] / totals[0]:.0%} smaller)")
+
+    if args.live:
+        if not settings.ZAI_API_KEY:
+            print("\n--live needs ZAI_API_KEY; skipping field accuracy.")
+        else:
+            asyncio.run(_live_accuracy(fixtures))
+
+    settings.ZAI_COMPACT_CONTENT = original
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Checks for the responsive Cloudinary URL rewriting (app/utils/responsive_images.py).
+
+transform_url() must rewrite plain upload URLs of our cloud, with or without
+a version segment and inside folders whose names look like transformation
+parameters (ai_art/, ui_kit/), and leave alone URLs that already carry a
+transformation, URLs of other clouds and other hosts.
+
+Usage (from backend/):
+    python benchmarks/bench_responsive_images.py
+
+Exits with status 1 if a check fails.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("ENVIRONMENT", "staging")
+os.environ.setdefault("SECRET_KEY", "bench-" + "x" * 40)
+os.environ["CLOUDINARY_CLOUD_NAME"] = "demo"
+
+from app.utils.responsive_images import transform_url  # noqa: E402
+
+_BASE = "https://res.cloudinary.com/demo/image/upload/"
+_SIZED = _BASE + "f_auto,q_auto,c_limit,w_400/"
+
+# (name, url, expected rewrite or None for "left unchanged")
+CASES = [
+    ("versioned", _BASE + "v1712/portfolio/cover.jpg", _SIZED + "v1712/portfolio/cover.jpg"),
+    ("no version", _BASE + "portfolio/cover.jpg", _SIZED + "portfolio/cover.jpg"),
+    ("file at the root", _BASE + "cover.jpg", _SIZED + "cover.jpg"),
+    ("folder ai_art", _BASE + "ai_art/cover.jpg", _SIZED + "ai_art/cover.jpg"),
+    ("folder ui_kit", _BASE + "ui_kit/screens/home.png", _SIZED + "ui_kit/screens/home.png"),
+    ("file named w_cover", _BASE + "w_cover.jpg", _SIZED + "w_cover.jpg"),
+    ("sized", _BASE + "w_400/v1712/cover.jpg", None),
+    ("chained", _BASE + "c_fill,g_face,h_200,w_200/r_max/cover.jpg", None),
+    ("named transformation", _BASE + "t_thumb/portfolio/cover.jpg", None),
+    ("dpr and aspect ratio", _BASE + "ar_16:9,c_fill,dpr_2.0/v1/cover.jpg", None),
+    ("user variable", _BASE + "$w_100,w_$w/cover.jpg", None),
+    ("other cloud", "https://res.cloudinary.com/other/image/upload/v1/cover.jpg", None),
+    ("other host", "https://images.example.com/image/upload/v1/cover.jpg", None),
+]
+
+
+def main() -> None:
+    checks = {}
+    for name, url, expected in CASES:
+        rewritten = transform_url(url, 400)
+        if rewritten != expected:
+            print(f"  {name}: {url} -> {rewritten}")
+        checks[name] = rewritten == expected
+
+    for name, passed in checks.items():
+        print(f"  {'ok ' if passed else 'FAIL'} {name}")
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
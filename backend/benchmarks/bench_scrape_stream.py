@@ -0,0 +1,271 @@
+"""
+Checks for streaming analysis: JSONFieldStream and POST /admin/scrape/stream.
+
+Parser: every case in fixtures/stream_cases.json (split chunks, escapes,
+braces inside strings, code fences, truncated streams) is fed three ways —
+as recorded, one character at a time, and in one piece — and must emit
+exactly its expected fields, in order, each once, and report `done` only for
+a complete object.
+
+Endpoint: the app runs against the local LLM stand-in (llm_standin.py), which
+streams a blog_article completion in small chunks --chunk-delay seconds
+apart, and a local page server that serves fixtures/blog_post.html.  The
+app is served by uvicorn so events are timed as a browser would see them.
+
+  full stream      fallback first, one `field` event per non-blank AI value
+                   in generation order, then `done` with ai=true and blank AI
+                   values filled from the fallback; the first field arrives
+                   well before `done`
+  truncated        the stream is cut mid-object: the finished fields are
+                   kept, the rest comes from the fallback
+  LLM down         5xx on every attempt: no `field` events, `done` carries
+                   the fallback with ai=false
+  fetch error      an unreachable page yields a single `error` event
+
+Usage (from backend/):
+    python benchmarks/bench_scrape_stream.py [--chunk-delay 0.02]
+
+Exits with status 1 if a check fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from llm_standin import LLMStandIn  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# What the model "generates" for the blog_article prompt.  `tags` is left
+# blank so the merge with the fallback is visible in the `done` payload.
+_COMPLETION = {
+    "title": "Designing Trust in Blockchain Systems",
+    "slug": "designing-trust-in-blockchain-systems",
+    "excerpt": "Why governance, not code, decides whether users trust a chain.",
+    "category": "Engineering",
+    "tags": "",
+    "cover_image_url": "",
+    "is_external": True,
+    "external_url": "{url}",
+    "external_source": "Medium",
+}
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+def _feed(pieces: list[str]) -> tuple[list[tuple[str, Any]], Any]:
+    from app.services.scraper_service import JSONFieldStream
+
+    parser = JSONFieldStream()
+    emitted: list[tuple[str, Any]] = []
+    for piece in pieces:
+        emitted.extend(parser.feed(piece))
+    return emitted, parser
+
+
+def _parser_checks() -> dict[str, bool]:
+    cases = json.loads((FIXTURES / "stream_cases.json").read_text(encoding="utf-8"))["cases"]
+    checks = {}
+    for case in cases:
+        text = "".join(case["chunks"])
+        expected = list(case["fields"].items())
+        passed = True
+        for mode, pieces in (("recorded", case["chunks"]), ("per char", list(text)), ("whole", [text])):
+            emitted, parser = _feed(pieces)
+            ok = emitted == expected and parser.fields == case["fields"] and parser.done == case["done"]
+            if not ok:
+                print(f"  {case['name']} ({mode}): emitted {emitted}, done={parser.done}")
+            passed = passed and ok
+        checks[f"parser: {case['name']}"] = passed
+    return checks
+
+
+# ---------------------------------------------------------------------------
+# Endpoint
+# ---------------------------------------------------------------------------
+
+def _start_pages() -> ThreadingHTTPServer:
+    page = (FIXTURES / "blog_post.html").read_bytes()
+
+    class Pages(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Pages)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _configure(standin: LLMStandIn) -> None:
+    db_dir = tempfile.mkdtemp(prefix="bench-stream-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{db_dir}/bench.db",
+        "ENVIRONMENT": "staging",
+        "SECRET_KEY": os.environ.get("SECRET_KEY") or "bench-" + "x" * 40,
+        "ZAI_API_KEY": "standin",
+        "ZAI_BASE_URL": standin.base_url,
+        "ZAI_MAX_RETRIES": "1",
+        # Every request goes to one local host.
+        "SCRAPER_HOST_RATE": "100000",
+        "SCRAPER_HOST_BURST": "100000",
+        "LINK_CHECK_INTERVAL_HOURS": "0",
+        "FEED_SYNC_INTERVAL_MINUTES": "0",
+        "EMAIL_OUTBOX_POLL_SECONDS": "0",
+        "MEDIA_ROOT": os.path.join(db_dir, "media"),
+    })
+
+
+def _serve(app: Any) -> tuple[Any, threading.Thread, str]:
+    # A real server rather than TestClient, which buffers the whole response
+    # and would hide whether fields are actually streamed.
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _stream(client: Any, url: str) -> list[tuple[str, dict[str, Any], float]]:
+    """POST /admin/scrape/stream; returns (event, data, seconds since the request) per event."""
+    events = []
+    event = ""
+    start = time.perf_counter()
+    with client.stream(
+        "POST", "/api/v1/admin/scrape/stream", json={"url": url, "content_type": "blog_article"}
+    ) as response:
+        assert response.status_code == 200, response.read()
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[len("data: "):]), time.perf_counter() - start))
+    return events
+
+
+def _endpoint_checks(standin: LLMStandIn, base: str, chunk_delay: float) -> dict[str, bool]:
+    import httpx
+
+    from app.auth import get_current_admin_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    url = f"{base}/post"
+    completion = {k: v.replace("{url}", url) if isinstance(v, str) else v for k, v in _COMPLETION.items()}
+    text = json.dumps(completion)
+    non_blank = [k for k, v in completion.items() if v not in ("", None)]
+    checks = {}
+
+    server, thread, app_url = _serve(app)
+    client = httpx.Client(base_url=app_url, timeout=30)
+    try:
+        standin.reset()
+        standin.content = text
+        standin.chunks = [text[i:i + 12] for i in range(0, len(text), 12)]
+        standin.chunk_delay = chunk_delay
+        events = _stream(client, url)
+        names = [e for e, _, _ in events]
+        fields = [(data["name"], data["value"]) for e, data, _ in events if e == "field"]
+        fallback, done = events[0][1]["data"], events[-1][1]
+        # Timed from the fallback event, i.e. from when the analysis starts.
+        first_field = next(t for e, _, t in events if e == "field") - events[0][2]
+        finished = events[-1][2] - events[0][2]
+        print(f"  full stream: first field after {first_field * 1000:.0f} ms, done after {finished * 1000:.0f} ms "
+              f"({len(standin.chunks)} chunks, {chunk_delay * 1000:.0f} ms apart)")
+        checks["endpoint: full stream"] = (
+            names[0] == "fallback" and names[-1] == "done" and names.count("done") == 1
+            and fields == [(k, completion[k]) for k in non_blank]
+            and done["ai"] is True
+            and all(done["data"][k] == completion[k] for k in non_blank)
+            and done["data"]["tags"] == fallback["tags"] and fallback["tags"] != ""
+            and first_field < finished / 2
+        )
+
+        standin.reset()
+        cut = text.index('"category"')
+        standin.chunks = [text[:cut], text[cut:]]
+        standin.truncate_after = 1
+        events = _stream(client, url)
+        done = events[-1][1]
+        kept = ["title", "slug", "excerpt"]
+        checks["endpoint: truncated stream"] = (
+            [data["name"] for e, data, _ in events if e == "field"] == kept
+            and done["ai"] is True
+            and all(done["data"][k] == completion[k] for k in kept)
+            and done["data"]["external_source"] == events[0][1]["data"]["external_source"]
+        )
+
+        standin.reset()
+        standin.failures = [(500, 0)] * 2
+        events = _stream(client, url)
+        checks["endpoint: LLM down"] = (
+            [e for e, _, _ in events] == ["fallback", "done"]
+            and events[-1][1]["ai"] is False and events[-1][1]["data"] == events[0][1]["data"]
+            and len(standin.requests) == 2
+        )
+
+        events = _stream(client, f"http://127.0.0.1:{_closed_port()}/post")
+        checks["endpoint: fetch error"] = [e for e, _, _ in events] == ["error"] and events[0][1]["status"] == 502
+    finally:
+        client.close()
+        server.should_exit = True
+        thread.join()
+    return checks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    args = parser.parse_args()
+
+    standin = LLMStandIn().start()
+    pages = _start_pages()
+    _configure(standin)
+    try:
+        checks = _parser_checks()
+        checks.update(_endpoint_checks(standin, f"http://127.0.0.1:{pages.server_port}", args.chunk_delay))
+    finally:
+        standin.stop()
+        pages.shutdown()
+
+    for name, passed in checks.items():
+        print(f"  {'ok ' if passed else 'FAIL'} {name}")
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Local stand-in for the parts of the Cloudinary Upload and Admin APIs the
+backend calls, for benchmarks and offline checks.
+
+Point the SDK at it with cloudinary.config(upload_prefix=standin.base_url)
+(the SDK builds both Upload and Admin API URLs from upload_prefix).
+
+Served endpoints (cloud name and resource type are not checked):
+
+  POST   /v1_1/<cloud>/image/upload            store a resource, return its metadata (signed like
+                                               the real API with `api_secret`)
+  GET    /v1_1/<cloud>/resources/image/upload/<public_id>   metadata of one resource
+  GET    /v1_1/<cloud>/resources/image/upload  list resources: prefix, max_results (<= 500),
+                                               next_cursor; sorted by public_id
+  POST   /v1_1/<cloud>/image/destroy           {"result": "ok" | "not found"}
+  DELETE /v1_1/<cloud>/resources/image/upload  delete_resources (JSON body), at most 100 public_ids
+
+Every request sleeps `latency` seconds first, so call counts translate into
+wall time the way they do against the real API.  Public ids listed in
+`failing_ids` make the call that touches them fail with HTTP 500.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+MAX_DELETE_IDS = 100
+MAX_LIST_RESULTS = 500
+
+
+class CloudinaryStandIn:
+    def __init__(self, *, latency: float = 0.0, api_secret: str = "bench") -> None:
+        self.latency = latency
+        self.api_secret = api_secret
+        self.resources: dict[str, dict[str, Any]] = {}
+        self.failing_ids: set[str] = set()
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "CloudinaryStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def seed(self, public_ids: list[str]) -> None:
+        with self._lock:
+            for public_id in public_ids:
+                self.resources[public_id] = self._metadata(public_id, 1024)
+
+    def reset_calls(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+    def _metadata(self, public_id: str, size: int, fmt: str = "png") -> dict[str, Any]:
+        version = 1_700_000_000 + self._counter
+        signature = hashlib.sha1(f"public_id={public_id}&version={version}{self.api_secret}".encode()).hexdigest()
+        return {
+            "public_id": public_id,
+            "version": version,
+            "signature": signature,
+            "resource_type": "image",
+            "type": "upload",
+            "format": fmt,
+            "bytes": size,
+            "width": 1,
+            "height": 1,
+            "folder": public_id.rsplit("/", 1)[0] if "/" in public_id else "",
+            "secure_url": f"{self.base_url}/image/upload/v{version}/{public_id}.{fmt}",
+            "url": f"{self.base_url}/image/upload/v{version}/{public_id}.{fmt}",
+            "created_at": "2026-01-01T00:00:00Z",
+        }
+
+    # -- request handling ----------------------------------------------------
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _upload(self, fields: dict[str, list[str]], size: int) -> tuple[int, dict[str, Any]]:
+        with self._lock:
+            self._counter += 1
+            folder = fields.get("folder", [""])[0]
+            public_id = f"{folder}/upload_{self._counter}".lstrip("/")
+            self.resources[public_id] = self._metadata(public_id, size)
+            return 200, self.resources[public_id]
+
+    def _destroy(self, fields: dict[str, list[str]]) -> tuple[int, dict[str, Any]]:
+        public_id = fields.get("public_id", [""])[0]
+        if public_id in self.failing_ids:
+            return 500, {"error": {"message": f"Could not delete {public_id}"}}
+        with self._lock:
+            found = self.resources.pop(public_id, None) is not None
+        return 200, {"result": "ok" if found else "not found"}
+
+    def _list(self, params: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        max_results = int(params.get("max_results") or 10)
+        if max_results > MAX_LIST_RESULTS:
+            return 400, {"error": {"message": f"max_results must be at most {MAX_LIST_RESULTS}"}}
+        prefix = params.get("prefix") or ""
+        start = int(params.get("next_cursor") or 0)
+        with self._lock:
+            ids = sorted(pid for pid in self.resources if pid.startswith(prefix))
+            page = [self.resources[pid] for pid in ids[start:start + max_results]]
+        payload: dict[str, Any] = {"resources": page}
+        if start + max_results < len(ids):
+            payload["next_cursor"] = str(start + max_results)
+        return 200, payload
+
+    def _delete_resources(self, public_ids: list[str]) -> tuple[int, dict[str, Any]]:
+        if len(public_ids) > MAX_DELETE_IDS:
+            return 400, {"error": {"message": f"Too many public_ids (max {MAX_DELETE_IDS})"}}
+        if self.failing_ids.intersection(public_ids):
+            return 500, {"error": {"message": "Internal error"}}
+        deleted = {}
+        with self._lock:
+            for public_id in public_ids:
+                deleted[public_id] = "deleted" if self.resources.pop(public_id, None) else "not_found"
+        return 200, {"deleted": deleted, "partial": False}
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, payload: dict[str, Any]) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body_fields(self) -> tuple[dict[str, list[str]], int]:
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                content_type = self.headers.get("Content-Type", "")
+                fields: dict[str, list[str]] = {}
+                if content_type.startswith("multipart/form-data"):
+                    boundary = content_type.split("boundary=", 1)[1].encode()
+                    for part in raw.split(b"--" + boundary):
+                        head, _, value = part.partition(b"\r\n\r\n")
+                        if b'name="' not in head or b"filename=" in head:
+                            continue
+                        name = head.split(b'name="', 1)[1].split(b'"', 1)[0].decode()
+                        fields.setdefault(name, []).append(value.rstrip(b"\r\n").decode(errors="replace"))
+                else:
+                    fields = parse_qs(raw.decode())
+                return fields, len(raw)
+
+            def do_POST(self) -> None:
+                time.sleep(standin.latency)
+                path = urlparse(self.path).path
+                fields, size = self._body_fields()
+                if path.endswith("/image/upload"):
+                    standin._count("upload")
+                    self._reply(*standin._upload(fields, size))
+                elif path.endswith("/image/destroy"):
+                    standin._count("destroy")
+                    self._reply(*standin._destroy(fields))
+                else:
+                    self._reply(404, {"error": {"message": "Not found"}})
+
+            def do_GET(self) -> None:
+                time.sleep(standin.latency)
+                parsed = urlparse(self.path)
+                path = parsed.path
+                marker = "/resources/image/upload/"
+                if path.endswith("/resources/image/upload"):
+                    standin._count("resources")
+                    raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                    params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                    if raw:
+                        params.update(json.loads(raw))
+                    self._reply(*standin._list(params))
+                elif marker in path:
+                    standin._count("resource")
+                    resource = standin.resources.get(path.split(marker, 1)[1])
+                    if resource is None:
+                        self._reply(404, {"error": {"message": "Resource not found"}})
+                    else:
+                        self._reply(200, resource)
+                else:
+                    self._reply(404, {"error": {"message": "Not found"}})
+
+            def do_DELETE(self) -> None:
+                time.sleep(standin.latency)
+                parsed = urlparse(self.path)
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if parsed.path.endswith("/resources/image/upload"):
+                    standin._count("delete_resources")
+                    # The SDK sends a JSON body; older versions used the query string.
+                    public_ids = json.loads(raw).get("public_ids") if raw else None
+                    if public_ids is None:
+                        public_ids = parse_qs(parsed.query).get("public_ids[]", [])
+                    self._reply(*standin._delete_resources(public_ids))
+                else:
+                    self._reply(404, {"error": {"message": "Not found"}})
+
+        return Handler
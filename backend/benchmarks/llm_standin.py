@@ -0,0 +1,199 @@
+"""
+Local stand-in for an OpenAI-compatible chat-completions API (Z.AI), for
+benchmarks and offline checks of the LLM client and the streaming scraper.
+
+Point the backend at it with ZAI_BASE_URL=standin.base_url (any API key).
+
+Served endpoint (model and messages are not checked):
+
+  POST .../chat/completions   a chat.completion with `content` and `usage`;
+                              with "stream": true, Server-Sent Events
+                              chat.completion.chunk deltas (`chunks`, or
+                              `content` cut into 16-character pieces), usage
+                              on the last chunk, then "data: [DONE]"
+
+Every request sleeps `latency` seconds first, and the stand-in records when
+each request arrived and the most requests it served at once.
+
+Failure knobs:
+  failures        (status, retry_after) pairs answered — in order, one per
+                  request — before requests succeed again; retry_after is
+                  sent as the Retry-After header when not None
+  truncate_after  stream only this many chunks, then drop the connection
+                  without "[DONE]"
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+_ERROR_TYPES = {400: "invalid_request_error", 429: "rate_limit_error"}
+
+
+class LLMStandIn:
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        content: str = '{"title": "Stand-in"}',
+        usage: tuple[int, int] = (11, 7),
+    ) -> None:
+        self.latency = latency
+        self.content = content
+        self.chunks: list[str] | None = None
+        self.chunk_delay = 0.0
+        self.truncate_after: int | None = None
+        self.usage = usage
+        self.failures: list[tuple[int, float | None]] = []
+        self.requests: list[dict[str, Any]] = []
+        self.arrivals: list[float] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "LLMStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.failures.clear()
+            self.requests.clear()
+            self.arrivals.clear()
+            self.max_in_flight = 0
+        self.latency = 0.0
+        self.chunks = None
+        self.chunk_delay = 0.0
+        self.truncate_after = None
+
+    # -- request handling ----------------------------------------------------
+
+    def _arrive(self, payload: dict[str, Any]) -> tuple[int, float | None] | None:
+        with self._lock:
+            self.requests.append(payload)
+            self.arrivals.append(time.monotonic())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.failures.pop(0) if self.failures else None
+
+    def _leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _usage(self) -> dict[str, int]:
+        prompt, completion = self.usage
+        return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+    def _completion(self, model: str) -> dict[str, Any]:
+        return {
+            "id": "standin",
+            "object": "chat.completion",
+            "created": 0,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": self.content},
+            }],
+            "usage": self._usage(),
+        }
+
+    def _stream_chunks(self, model: str) -> list[dict[str, Any]]:
+        pieces = self.chunks
+        if pieces is None:
+            pieces = [self.content[i:i + 16] for i in range(0, len(self.content), 16)]
+        chunks = [
+            {
+                "id": "standin",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            for piece in pieces
+        ]
+        chunks.append({
+            "id": "standin",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": self._usage(),
+        })
+        return chunks
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, model: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                chunks = standin._stream_chunks(model)
+                limit = standin.truncate_after
+                for index, chunk in enumerate(chunks):
+                    if limit is not None and index >= limit:
+                        return
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                    time.sleep(standin.chunk_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def do_POST(self) -> None:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                failure = standin._arrive(payload)
+                try:
+                    time.sleep(standin.latency)
+                    if not self.path.rstrip("/").endswith("/chat/completions"):
+                        self._reply(404, {"error": {"message": "Not found"}})
+                    elif failure is not None:
+                        status, retry_after = failure
+                        headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else None
+                        error = {"message": f"Stand-in error {status}", "type": _ERROR_TYPES.get(status, "server_error")}
+                        self._reply(status, {"error": error}, headers)
+                    elif payload.get("stream"):
+                        self._stream(payload.get("model", "standin"))
+                    else:
+                        self._reply(200, standin._completion(payload.get("model", "standin")))
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (deadline, or stopped reading a stream).
+                    pass
+                finally:
+                    standin._leave()
+
+        return Handler
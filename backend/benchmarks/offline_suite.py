@@ -0,0 +1,332 @@
+"""
+Offline scraper benchmark and regression suite.
+
+Replays the recorded fixtures in benchmarks/fixtures/offline/ through the
+real pipeline without touching the internet.  A local stand-in HTTP server
+serves:
+
+  - every page in cases.json at its recorded path (status code and
+    Content-Type charset included), so scrape_url() fetches over real HTTP;
+  - Twitter/X oEmbed responses (oembed/<case>.json) via
+    SCRAPER_TWITTER_OEMBED_URL;
+  - OpenAI-compatible chat completions (llm/<case>.json) via ZAI_BASE_URL,
+    matched on the "URL:" line of the prompt.
+
+For each case it reports the wall time of scrape_url(), the page requests it
+made per run, the time and peak allocations of the HTML extraction alone,
+and how many expected fields of scrape_url(), _fallback_extraction() and
+analyze_with_ai() matched.
+"{host}" and "{url}" in expected values stand for the stand-in's host and
+the case URL.
+
+Usage (from backend/):
+    python benchmarks/offline_suite.py [--repeat 5] [--case NAME]
+                                       [--save-baseline FILE] [--baseline FILE]
+                                       [--tolerance 0.5]
+
+Exits with status 1 if any expectation fails, or — with --baseline — if a
+case's parse time or allocations grew by more than --tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+SUITE_DIR = Path(__file__).parent / "fixtures" / "offline"
+
+# Parse-time growth below this many milliseconds is treated as noise.
+_NOISE_FLOOR_MS = 0.5
+
+
+# ---------------------------------------------------------------------------
+# Stand-in server
+# ---------------------------------------------------------------------------
+
+def _load_cases() -> list[dict[str, Any]]:
+    return json.loads((SUITE_DIR / "cases.json").read_text(encoding="utf-8"))["cases"]
+
+
+def _case_for(text: str, cases: list[dict[str, Any]]) -> dict[str, Any] | None:
+    # Longest path first so "/a/b-saved" is not shadowed by "/a/b".
+    for case in sorted(cases, key=lambda c: len(c["path"]), reverse=True):
+        if case["path"] in text:
+            return case
+    return None
+
+
+def _make_handler(cases: list[dict[str, Any]], hits: dict[str, int]) -> type[BaseHTTPRequestHandler]:
+    class StandIn(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            parsed = urlparse(self.path)
+            if parsed.path == "/oembed":
+                case = _case_for(parse_qs(parsed.query).get("url", [""])[0], cases)
+                source = SUITE_DIR / "oembed" / f"{case['name']}.json" if case else None
+                if source is None or not source.exists():
+                    self._send(404, b"{}", "application/json")
+                    return
+                self._send(200, source.read_bytes(), "application/json")
+                return
+
+            case = next((c for c in cases if c["path"] == parsed.path), None)
+            if case is None:
+                self._send(404, b"not found", "text/plain")
+                return
+            hits[case["name"]] = hits.get(case["name"], 0) + 1
+            self._send(
+                case.get("status", 200),
+                (SUITE_DIR / "pages" / case["page"]).read_bytes(),
+                case.get("content_type_header", "text/html"),
+            )
+
+        def do_POST(self) -> None:
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompt = "\n".join(str(m.get("content", "")) for m in payload.get("messages", []))
+            url_line = next((line for line in prompt.splitlines() if line.startswith("URL: ")), "")
+            case = _case_for(url_line, cases)
+            source = SUITE_DIR / "llm" / f"{case['name']}.json" if case else None
+            content = source.read_text(encoding="utf-8") if source and source.exists() else "{}"
+            body = json.dumps({
+                "id": "offline",
+                "object": "chat.completion",
+                "created": 0,
+                "model": payload.get("model", "offline"),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }],
+                "usage": {
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": (len(prompt) + len(content)) // 4,
+                },
+            }).encode()
+            self._send(200, body, "application/json")
+
+    return StandIn
+
+
+def _start_stand_in(cases: list[dict[str, Any]], hits: dict[str, int]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(cases, hits))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _expand(value: Any, host: str, url: str) -> Any:
+    if isinstance(value, str):
+        return value.replace("{host}", host).replace("{url}", url)
+    return value
+
+
+def _check(label: str, actual: dict[str, Any], expected: dict[str, Any], host: str, url: str,
+           failures: list[str]) -> tuple[int, int]:
+    passed = 0
+    for key, want in expected.items():
+        want = _expand(want, host, url)
+        got = actual.get(key)
+        if got == want:
+            passed += 1
+        else:
+            failures.append(f"{label}.{key}: expected {want!r}, got {got!r}")
+    return passed, len(expected)
+
+
+def _measure_parse(case: dict[str, Any], url: str, repeat: int) -> tuple[float, float]:
+    """Median ms and peak KiB of allocations for _extract_page() on the raw page."""
+    import httpx
+
+    from app.services.scraper_service import _extract_page, _resolve_charset
+
+    raw = (SUITE_DIR / "pages" / case["page"]).read_bytes()
+    response = httpx.Response(200, headers={"content-type": case.get("content_type_header", "text/html")})
+    html = raw.decode(_resolve_charset(response, raw[:4096]), errors="replace")
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _extract_page(html, url)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    _extract_page(html, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples) * 1000, peak / 1024
+
+
+async def _run_case(case: dict[str, Any], base: str, host: str, repeat: int) -> dict[str, Any]:
+    from app.services.scraper_service import _fallback_extraction, analyze_with_ai, scrape_url
+
+    url = base + case["path"]
+    failures: list[str] = []
+    wall = []
+    scraped: dict[str, Any] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraped = await scrape_url(url)
+        wall.append(time.perf_counter() - start)
+
+    result: dict[str, Any] = {
+        "name": case["name"],
+        "wall_ms": statistics.median(wall) * 1000,
+        "scrape": _check("scrape", scraped, case.get("scrape", {}), host, url, failures),
+        "fallback": _check(
+            "fallback", _fallback_extraction(scraped, case["content_type"]),
+            case.get("fallback", {}), host, url, failures,
+        ),
+        "ai": (0, 0),
+        "parse_ms": None,
+        "alloc_kb": None,
+    }
+    if "ai" in case:
+        analysed = await analyze_with_ai(scraped, case["content_type"])
+        result["ai"] = _check("ai", analysed, case["ai"], host, url, failures)
+    if not scraped.get("_social_platform"):
+        result["parse_ms"], result["alloc_kb"] = _measure_parse(case, url, repeat)
+    result["failures"] = failures
+    return result
+
+
+def _compare_baseline(results: list[dict[str, Any]], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for row in results:
+        old = baseline.get(row["name"])
+        if not old or row["parse_ms"] is None or old.get("parse_ms") is None:
+            continue
+        if row["parse_ms"] > old["parse_ms"] * (1 + tolerance) and row["parse_ms"] - old["parse_ms"] > _NOISE_FLOOR_MS:
+            regressions.append(f"{row['name']}: parse {old['parse_ms']:.2f} → {row['parse_ms']:.2f} ms")
+        if row["alloc_kb"] > old["alloc_kb"] * (1 + tolerance):
+            regressions.append(f"{row['name']}: peak alloc {old['alloc_kb']:.0f} → {row['alloc_kb']:.0f} KiB")
+        for field in ("scrape", "fallback", "ai"):
+            if row[field][0] < old.get(field, [0])[0]:
+                regressions.append(f"{row['name']}: {field} accuracy {old[field][0]} → {row[field][0]}")
+    return regressions
+
+
+async def _run_all(cases: list[dict[str, Any]], base: str, host: str, repeat: int) -> list[dict[str, Any]]:
+    from app.services.llm_client import close_llm_client
+
+    try:
+        return [await _run_case(case, base, host, repeat) for case in cases]
+    finally:
+        await close_llm_client()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--case", action="append", help="only run the named case (repeatable)")
+    parser.add_argument("--save-baseline", type=Path, help="write per-case timings/accuracy to FILE")
+    parser.add_argument("--baseline", type=Path, help="compare against a file written by --save-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative growth (default 0.5)")
+    args = parser.parse_args()
+
+    cases = _load_cases()
+    if args.case:
+        cases = [c for c in cases if c["name"] in args.case]
+
+    hits: dict[str, int] = {}
+    server = _start_stand_in(cases, hits)
+    host = f"127.0.0.1:{server.server_port}"
+    base = f"http://{host}"
+
+    # Point every outbound dependency at the stand-in before the app reads
+    # its settings, and lift the per-host limiter: every case shares one host
+    # and some deliberately answer 5xx.
+    os.environ.update({
+        "ZAI_API_KEY": "offline",
+        "ZAI_BASE_URL": f"{base}/v1",
+        "ZAI_MAX_RETRIES": "0",
+        "SCRAPER_TWITTER_OEMBED_URL": f"{base}/oembed",
+        "SCRAPER_HOST_RATE": "100000",
+        "SCRAPER_HOST_BURST": "100000",
+        "SCRAPER_BREAKER_THRESHOLD": "100000",
+    })
+
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(_run_all(cases, base, host, args.repeat))
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - started
+
+    def ratio(pair: tuple[int, int]) -> str:
+        return f"{pair[0]}/{pair[1]}" if pair[1] else "-"
+
+    print(
+        f"{'case':<28}{'wall ms':>9}{'reqs':>6}{'parse ms':>10}{'peak KiB':>10}"
+        f"{'scrape':>8}{'fallback':>10}{'ai':>6}"
+    )
+    totals = {"scrape": [0, 0], "fallback": [0, 0], "ai": [0, 0]}
+    for row in results:
+        parse = f"{row['parse_ms']:.2f}" if row["parse_ms"] is not None else "-"
+        alloc = f"{row['alloc_kb']:.0f}" if row["alloc_kb"] is not None else "-"
+        print(
+            f"{row['name']:<28}{row['wall_ms']:>9.2f}{hits.get(row['name'], 0) / args.repeat:>6.0f}"
+            f"{parse:>10}{alloc:>10}"
+            f"{ratio(row['scrape']):>8}{ratio(row['fallback']):>10}{ratio(row['ai']):>6}"
+        )
+        for field in totals:
+            totals[field][0] += row[field][0]
+            totals[field][1] += row[field][1]
+
+    failures = [f"  {row['name']}: {f}" for row in results for f in row["failures"]]
+    print(
+        f"\n{len(results)} cases in {elapsed:.1f}s — fields matched: "
+        + ", ".join(f"{k} {v[0]}/{v[1]}" for k, v in totals.items())
+    )
+    if failures:
+        print("\nExpectation failures:")
+        print("\n".join(failures))
+
+    regressions: list[str] = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = _compare_baseline(results, baseline, args.tolerance)
+        print("\nRegressions vs baseline:" if regressions else "\nNo regressions vs baseline.")
+        print("\n".join(f"  {r}" for r in regressions))
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(
+            {row["name"]: {k: row[k] for k in ("parse_ms", "alloc_kb", "wall_ms", "scrape", "fallback", "ai")}
+             for row in results},
+            indent=2,
+        ) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
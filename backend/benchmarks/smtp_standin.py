@@ -0,0 +1,146 @@
+"""
+Local stand-in SMTP server for benchmarks and offline checks of outgoing mail.
+
+Point the backend at it with SMTP_HOST=127.0.0.1, SMTP_PORT=<standin.port>
+and SMTP_USE_TLS=false.  It speaks enough of ESMTP for aiosmtplib: EHLO/HELO,
+AUTH PLAIN and LOGIN (any credentials), MAIL, RCPT, DATA, RSET, NOOP, QUIT.
+
+Every new connection sleeps `handshake_latency` seconds before the greeting,
+standing in for the TCP + TLS handshake and login a real server costs.
+
+Failure knobs:
+  refused            recipients answered with 550 (a permanent refusal)
+  fail_data          the next N DATA commands are answered with 451 (transient)
+  max_per_session    close the connection after this many messages, as
+                     providers that limit messages per session do
+"""
+
+from __future__ import annotations
+
+import base64
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+from email.message import Message
+
+
+class SMTPStandIn:
+    def __init__(self, *, handshake_latency: float = 0.0) -> None:
+        self.handshake_latency = handshake_latency
+        self.messages: list[Message] = []
+        self.refused: set[str] = set()
+        self.fail_data = 0
+        self.max_per_session: int | None = None
+        self.connections = 0
+        self.logins = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "SMTPStandIn":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.messages.clear()
+            self.connections = 0
+            self.logins = 0
+
+    def _take_data_failure(self) -> bool:
+        with self._lock:
+            if self.fail_data > 0:
+                self.fail_data -= 1
+                return True
+            return False
+
+    def _make_handler(self):
+        standin = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(f"{line}\r\n".encode())
+                self.wfile.flush()
+
+            def readline(self) -> str:
+                return self.rfile.readline().decode("utf-8", "replace").rstrip("\r\n")
+
+            def handle(self) -> None:
+                with standin._lock:
+                    standin.connections += 1
+                time.sleep(standin.handshake_latency)
+                self.reply("220 standin ESMTP ready")
+                recipients: list[str] = []
+                sent = 0
+                while True:
+                    line = self.readline()
+                    if not line and self.rfile.closed:
+                        return
+                    verb, _, arg = line.partition(" ")
+                    verb = verb.upper()
+                    if verb == "EHLO":
+                        self.reply("250-standin")
+                        self.reply("250-AUTH PLAIN LOGIN")
+                        self.reply("250-8BITMIME")
+                        self.reply("250 SIZE 10485760")
+                    elif verb == "HELO":
+                        self.reply("250 standin")
+                    elif verb == "AUTH":
+                        mechanism = arg.split(" ", 1)[0].upper()
+                        if mechanism == "LOGIN":
+                            for prompt in ("VXNlcm5hbWU6", "UGFzc3dvcmQ6"):
+                                self.reply(f"334 {prompt}")
+                                base64.b64decode(self.readline() or "")
+                        with standin._lock:
+                            standin.logins += 1
+                        self.reply("235 2.7.0 Authentication successful")
+                    elif verb == "MAIL":
+                        recipients = []
+                        self.reply("250 OK")
+                    elif verb == "RCPT":
+                        address = arg.split(":", 1)[-1].strip().strip("<>")
+                        if address in standin.refused:
+                            self.reply("550 5.1.1 No such user")
+                        else:
+                            recipients.append(address)
+                            self.reply("250 OK")
+                    elif verb == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        lines: list[bytes] = []
+                        while True:
+                            raw = self.rfile.readline()
+                            if raw in (b".\r\n", b".\n", b""):
+                                break
+                            lines.append(raw[1:] if raw.startswith(b"..") else raw)
+                        if standin._take_data_failure():
+                            self.reply("451 4.3.0 Try again later")
+                            continue
+                        with standin._lock:
+                            standin.messages.append(message_from_bytes(b"".join(lines)))
+                        sent += 1
+                        self.reply("250 OK queued")
+                        if standin.max_per_session and sent >= standin.max_per_session:
+                            return
+                    elif verb == "RSET":
+                        recipients = []
+                        self.reply("250 OK")
+                    elif verb == "NOOP":
+                        self.reply("250 OK")
+                    elif verb == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    elif not line:
+                        return
+                    else:
+                        self.reply("502 Command not implemented")
+
+        return Handler